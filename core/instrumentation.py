@@ -0,0 +1,123 @@
+import logging
+from contextlib import ExitStack
+from contextvars import ContextVar
+from time import perf_counter
+
+from django.conf import settings
+from django.db import connections
+from django.template.backends.django import DjangoTemplates
+
+logger = logging.getLogger(__name__)
+
+# Metrics of the request being handled by RequestInstrumentationMiddleware, if any.
+current_metrics = ContextVar("current_metrics", default=None)
+
+
+class RequestMetrics:
+    """
+    Query count, database time and template render time of one request.
+    queries: Number of executions and total time of each distinct SQL statement, to report the top offenders.
+    """
+
+    def __init__(self):
+        self.query_count = 0
+        self.db_time = 0.0
+        self.template_time = 0.0
+        self.queries = {}
+
+    def __call__(self, execute, sql, params, many, context):
+        """
+        connection.execute_wrapper() hook timing every query run on the connection.
+        """
+        start = perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duration = perf_counter() - start
+            self.query_count += 1
+            self.db_time += duration
+            count, total = self.queries.get(sql, (0, 0.0))
+            self.queries[sql] = (count + 1, total + duration)
+
+    def top_queries(self, limit):
+        ranked = sorted(self.queries.items(), key=lambda item: item[1][1], reverse=True)[:limit]
+        return [{"sql": sql, "count": count, "time_ms": round(total * 1000, 2)} for sql, (count, total) in ranked]
+
+
+class RequestInstrumentationMiddleware:
+    """
+    Logs the query count, total database time, template render time and view time of every request as structured
+    fields of the JSON logs. Requests slower than SLOW_REQUEST_THRESHOLD_MS are logged as warnings along with the
+    SLOW_REQUEST_TOP_QUERIES statements that took the most database time.
+    Queries run while a StreamingHttpResponse is consumed, after the view returns, are not counted.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        metrics = RequestMetrics()
+        token = current_metrics.set(metrics)
+        start = perf_counter()
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(metrics))
+                response = self.get_response(request)
+        finally:
+            current_metrics.reset(token)
+
+        self.log(request, response, metrics, perf_counter() - start)
+        return response
+
+    def log(self, request, response, metrics, view_time):
+        match = request.resolver_match
+        fields = {
+            "method": request.method,
+            "path": request.path,
+            "status": response.status_code,
+            "view": match._func_path if match else None,
+            "query_count": metrics.query_count,
+            "db_time_ms": round(metrics.db_time * 1000, 2),
+            "template_time_ms": round(metrics.template_time * 1000, 2),
+            "view_time_ms": round(view_time * 1000, 2),
+        }
+
+        if view_time * 1000 >= settings.SLOW_REQUEST_THRESHOLD_MS:
+            fields["top_queries"] = metrics.top_queries(settings.SLOW_REQUEST_TOP_QUERIES)
+            logger.warning(f"Slow request: {request.method} {request.path}", extra=fields)
+        else:
+            logger.info(f"{request.method} {request.path}", extra=fields)
+
+
+class InstrumentedTemplate:
+    """
+    Wraps a template of the Django backend to add its render time to the current request's metrics.
+    """
+
+    def __init__(self, template):
+        self.template = template
+
+    def __getattr__(self, name):
+        return getattr(self.template, name)
+
+    def render(self, context=None, request=None):
+        start = perf_counter()
+        try:
+            return self.template.render(context, request)
+        finally:
+            metrics = current_metrics.get()
+            if metrics is not None:
+                metrics.template_time += perf_counter() - start
+
+
+class InstrumentedDjangoTemplates(DjangoTemplates):
+    """
+    The Django template backend, with the render time of each template recorded by RequestInstrumentationMiddleware.
+    """
+
+    def from_string(self, template_code):
+        return InstrumentedTemplate(super().from_string(template_code))
+
+    def get_template(self, template_name):
+        return InstrumentedTemplate(super().get_template(template_name))
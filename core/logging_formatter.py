@@ -1,13 +1,32 @@
-from datetime import datetime
+import time
 
 from pythonjsonlogger import jsonlogger
 
 
 class CustomJsonFormatter(jsonlogger.JsonFormatter):
+    """
+    JSON formatter adding the UTC timestamp and the upper case level of each record.
+    The timestamp is taken from record.created, so it is the time the record was logged even when it is formatted
+    later by a QueueListener. The formatted date and time is cached per second; only the microseconds are
+    formatted for each record.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._cached_second = None
+        self._cached_prefix = ""
+
+    def format_timestamp(self, created):
+        second = int(created)
+        if second != self._cached_second:
+            self._cached_prefix = time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(second))
+            self._cached_second = second
+        return f"{self._cached_prefix}.{int((created - second) * 1_000_000):06d}Z"
+
     def add_fields(self, log_record, record, message_dict):
         super().add_fields(log_record, record, message_dict)
         if not log_record.get("timestamp"):
-            log_record["timestamp"] = datetime.utcnow().strftime("%Y-%m-%dT%H:%M:%S.%fZ")
+            log_record["timestamp"] = self.format_timestamp(record.created)
         if log_record.get("level"):
             log_record["level"] = log_record["level"].upper()
         else:
@@ -0,0 +1,64 @@
+import atexit
+import copy
+import logging
+import os
+import queue
+from logging.handlers import QueueHandler, QueueListener
+
+
+class QueueStreamHandler(QueueHandler):
+    """
+    Non-blocking replacement of logging.StreamHandler.
+    emit() only puts the record on a queue. A QueueListener thread formats the records and writes them to the stream,
+    so neither JSON formatting nor a slow stdout sit on the request path.
+    The listener is started by the first record emitted in a process, so a handler configured before the server forks
+    its workers gets one thread per worker rather than a dead one inherited from the parent. It is stopped by close(),
+    which logging calls at exit, or by atexit otherwise, after writing the records still queued.
+    The formatter set on this handler is used by the listener thread.
+    """
+
+    def __init__(self, stream=None):
+        super().__init__(queue.SimpleQueue())
+        self.stream_handler = logging.StreamHandler(stream)
+        self.listener = None
+        self.pid = None
+
+    def emit(self, record):
+        if self.pid != os.getpid():
+            self.start()
+        super().emit(record)
+
+    def start(self):
+        """
+        Starts the listener of the current process, on a new queue if the handler was inherited through fork().
+        """
+        if self.pid is not None:
+            self.queue = queue.SimpleQueue()
+        self.pid = os.getpid()
+        self.listener = QueueListener(self.queue, self.stream_handler, respect_handler_level=False)
+        self.listener.start()
+        atexit.register(self.stop)
+
+    def stop(self):
+        if self.listener is not None and self.pid == os.getpid() and self.listener._thread is not None:
+            self.listener.stop()
+
+    def setFormatter(self, fmt):
+        self.stream_handler.setFormatter(fmt)
+
+    def prepare(self, record):
+        """
+        Resolves the message arguments and the traceback in the logging thread, where they are still valid,
+        and leaves the formatting to the listener.
+        """
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def close(self):
+        self.stop()
+        super().close()
@@ -0,0 +1,97 @@
+import random
+from contextvars import ContextVar
+
+from django.conf import settings
+
+# Cookie set on the responses of requests that wrote to the primary, see ReplicaRoutingMiddleware.
+PIN_COOKIE = "pin_primary"
+
+# Routing of the request being handled by ReplicaRoutingMiddleware, if any.
+current_routing = ContextVar("current_routing", default=None)
+
+# Apps whose reads may go to a replica. Sessions and librarians always read the primary, so a login is
+# never lost to replication lag.
+REPLICATED_APPS = {"library"}
+
+
+class RequestRouting:
+    """
+    Database routing state of one request.
+    replica: The replica alias the reads of the request go to, or None to read the primary.
+    wrote: Whether the request wrote to the primary.
+    """
+
+    def __init__(self):
+        self.replica = None
+        self.wrote = False
+
+
+def current_replica():
+    """
+    The replica the reads of the current request go to, or None when they go to the primary.
+    """
+    routing = current_routing.get()
+    return routing.replica if routing is not None else None
+
+
+class ReplicaRouter:
+    """
+    Sends the reads of the library app to the replica chosen for the current request, and everything else,
+    including every write, to the primary. Migrations only run on the primary, the replicas get them through
+    replication.
+    """
+
+    def db_for_read(self, model, **hints):
+        replica = current_replica()
+        if replica and model._meta.app_label in REPLICATED_APPS:
+            return replica
+        return "default"
+
+    def db_for_write(self, model, **hints):
+        routing = current_routing.get()
+        if routing is not None:
+            routing.wrote = True
+        return "default"
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # The replicas hold the same rows as the primary.
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db not in settings.REPLICA_DATABASES
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Reads GET and HEAD requests of the views marked read_from_replica (the dashboard, list views and reports) from
+    a random replica of REPLICA_DATABASES. Every other request reads the primary.
+    A request that writes sets the PIN_COOKIE for REPLICA_PIN_SECONDS, during which the client's requests read the
+    primary, so the page shown after a change (e.g. the redirect after lending) includes it.
+    Queries run while a StreamingHttpResponse is consumed, after the view returns, read the primary unless the view
+    picks the database with router.db_for_read() beforehand, as ExportView does.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        routing = RequestRouting()
+        token = current_routing.set(routing)
+        try:
+            response = self.get_response(request)
+        finally:
+            current_routing.reset(token)
+
+        if routing.wrote and settings.REPLICA_DATABASES:
+            response.set_cookie(PIN_COOKIE, "1", max_age=settings.REPLICA_PIN_SECONDS, httponly=True, samesite="Lax")
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        view_class = getattr(view_func, "view_class", None)
+        if (
+            settings.REPLICA_DATABASES
+            and request.method in ("GET", "HEAD")
+            and getattr(view_class, "read_from_replica", False)
+            and PIN_COOKIE not in request.COOKIES
+        ):
+            current_routing.get().replica = random.choice(settings.REPLICA_DATABASES)
@@ -42,7 +42,7 @@ DJANGO_APPS = [
     "django.contrib.contenttypes",
     "django.contrib.sessions",
     "django.contrib.messages",
-    "django.contrib.staticfiles",
+    "core.staticfiles.StaticFilesConfig",
 ]
 
 THIRD_PARTY_APPS = []
@@ -55,6 +55,8 @@ LOCAL_APPS = [
 INSTALLED_APPS = DJANGO_APPS + THIRD_PARTY_APPS + LOCAL_APPS
 
 MIDDLEWARE = [
+    "core.instrumentation.RequestInstrumentationMiddleware",
+    "core.routers.ReplicaRoutingMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "whitenoise.middleware.WhiteNoiseMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
@@ -69,7 +71,7 @@ ROOT_URLCONF = "core.urls"
 
 TEMPLATES = [
     {
-        "BACKEND": "django.template.backends.django.DjangoTemplates",
+        "BACKEND": "core.instrumentation.InstrumentedDjangoTemplates",
         "DIRS": [os.path.join(BASE_DIR, "templates")],
         "APP_DIRS": True,
         "OPTIONS": {
@@ -90,16 +92,38 @@ WSGI_APPLICATION = "core.wsgi.application"
 # Database
 # https://docs.djangoproject.com/en/5.0/ref/settings/#databases
 
-DATABASES = {
-    "default": {
-        "ENGINE": "django.db.backends.postgresql",
-        "NAME": env("POSTGRES_DB"),
-        "USER": env("POSTGRES_USER"),
-        "PASSWORD": env("POSTGRES_PASSWORD"),
-        "HOST": env("POSTGRES_HOST"),
-        "PORT": env("POSTGRES_PORT"),
+# SQLITE_DATABASES replaces PostgreSQL with SQLite files for local testing: the first file is the primary,
+# the others stand in for read replicas (copy the primary file over them to "replicate").
+SQLITE_DATABASES = env.list("SQLITE_DATABASES", default=[])
+
+if SQLITE_DATABASES:
+    DATABASES = {"default": {"ENGINE": "django.db.backends.sqlite3", "NAME": BASE_DIR / SQLITE_DATABASES[0]}}
+    REPLICAS = [{"ENGINE": "django.db.backends.sqlite3", "NAME": BASE_DIR / name} for name in SQLITE_DATABASES[1:]]
+else:
+    DATABASES = {
+        "default": {
+            "ENGINE": "django.db.backends.postgresql",
+            "NAME": env("POSTGRES_DB"),
+            "USER": env("POSTGRES_USER"),
+            "PASSWORD": env("POSTGRES_PASSWORD"),
+            "HOST": env("POSTGRES_HOST"),
+            "PORT": env("POSTGRES_PORT"),
+        }
     }
-}
+    # Read replicas of the primary, reached with the same credentials.
+    REPLICAS = [{**DATABASES["default"], "HOST": host} for host in env.list("POSTGRES_REPLICA_HOSTS", default=[])]
+
+# The replicas are the "replica_<n>" aliases. Reads of the views marked read_from_replica go to one of them,
+# see core.routers. Tests read the primary through them.
+for number, replica in enumerate(REPLICAS, start=1):
+    DATABASES[f"replica_{number}"] = {**replica, "TEST": {"MIRROR": "default"}}
+REPLICA_DATABASES = [f"replica_{number}" for number in range(1, len(REPLICAS) + 1)]
+
+DATABASE_ROUTERS = ["core.routers.ReplicaRouter"]
+
+# After a request that writes, the client reads from the primary for this many seconds, so the page it is
+# redirected to shows its own changes even if the replicas lag behind.
+REPLICA_PIN_SECONDS = env.int("REPLICA_PIN_SECONDS", default=10)
 
 # Password validation
 # https://docs.djangoproject.com/en/5.0/ref/settings/#auth-password-validators
@@ -136,11 +160,15 @@ USE_TZ = False
 # https://docs.djangoproject.com/en/5.0/howto/static-files/
 
 STATIC_URL = "/static/"
+STATICFILES_DIRS = [os.path.join(BASE_DIR, "static")]
+STATIC_ROOT = os.path.join(BASE_DIR, "staticfiles")
 
-if DEBUG:
-    STATICFILES_DIRS = [os.path.join(BASE_DIR, "static")]
-else:
-    STATIC_ROOT = os.path.join(BASE_DIR, "static")
+# collectstatic fingerprints and precompresses the assets, see core.staticfiles.StaticFilesStorage.
+STORAGES = {
+    "default": {"BACKEND": "django.core.files.storage.FileSystemStorage"},
+    "staticfiles": {"BACKEND": "core.staticfiles.StaticFilesStorage"},
+}
+WHITENOISE_KEEP_ONLY_HASHED_FILES = True
 
 
 # Default primary key field type
@@ -150,8 +178,72 @@ DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
 AUTH_USER_MODEL = "users.Librarian"
 
+# Primary keys of new rows: "prefixed" ("<tablename>-<uuid4>") or "uuid7" (compact, time-ordered).
+# Run `manage.py compact_primary_keys` before switching an existing database to "uuid7".
+PRIMARY_KEY_FORMAT = env("PRIMARY_KEY_FORMAT", default="prefixed")
+
+# Type of the primary key columns of users.models.COMPACT_KEY_MODELS: "varchar" or "uuid" (PostgreSQL only).
+# Set it to "uuid" along with PRIMARY_KEY_FORMAT=uuid7, then run `manage.py convert_primary_keys_to_uuid`.
+PRIMARY_KEY_COLUMN_TYPE = env("PRIMARY_KEY_COLUMN_TYPE", default="varchar")
+
+# Leaves out the tests tagged "benchmark" unless `manage.py test --tag benchmark` is run, see core.test_runner.
+TEST_RUNNER = "core.test_runner.TestRunner"
+
 LOGIN_URL = "login"
 
+# The logged in librarian is loaded from the cache, see users.backends.CachedModelBackend.
+AUTHENTICATION_BACKENDS = ["users.backends.CachedModelBackend"]
+AUTH_USER_CACHE_TIMEOUT = env.int("AUTH_USER_CACHE_TIMEOUT", default=300)
+
+# Sessions are read from the cache and written through to the database ("cached_db", the default), stored in the
+# database only ("db"), or kept in a signed cookie ("signed_cookies", no server-side storage).
+SESSION_ENGINES = {
+    "cached_db": "django.contrib.sessions.backends.cached_db",
+    "db": "django.contrib.sessions.backends.db",
+    "signed_cookies": "django.contrib.sessions.backends.signed_cookies",
+}
+SESSION_ENGINE = SESSION_ENGINES[env("SESSION_BACKEND", default="cached_db")]
+
+# Email, for the overdue reminders. EMAIL_BACKEND is "smtp" (EMAIL_HOST, EMAIL_PORT, EMAIL_HOST_USER,
+# EMAIL_HOST_PASSWORD, EMAIL_USE_TLS), "console" (printed, the default) or "locmem" (kept in memory).
+EMAIL_BACKENDS = {
+    "smtp": "django.core.mail.backends.smtp.EmailBackend",
+    "console": "django.core.mail.backends.console.EmailBackend",
+    "locmem": "django.core.mail.backends.locmem.EmailBackend",
+}
+EMAIL_BACKEND = EMAIL_BACKENDS[env("EMAIL_BACKEND", default="console")]
+EMAIL_HOST = env("EMAIL_HOST", default="localhost")
+EMAIL_PORT = env.int("EMAIL_PORT", default=587)
+EMAIL_HOST_USER = env("EMAIL_HOST_USER", default="")
+EMAIL_HOST_PASSWORD = env("EMAIL_HOST_PASSWORD", default="")
+EMAIL_USE_TLS = env.bool("EMAIL_USE_TLS", default=True)
+DEFAULT_FROM_EMAIL = env("DEFAULT_FROM_EMAIL", default="library@localhost")
+
+# Keyset pagination of the list pages
+LIBRARY_PAGE_SIZE = env.int("LIBRARY_PAGE_SIZE", default=50)
+LIBRARY_MAX_PAGE_SIZE = env.int("LIBRARY_MAX_PAGE_SIZE", default=500)
+# Rows read and rendered at a time when a list page is streamed with ?stream=1
+LIBRARY_STREAM_CHUNK_SIZE = env.int("LIBRARY_STREAM_CHUNK_SIZE", default=500)
+
+# Cache of the list pages. CACHE_BACKEND is "locmem", "file" (CACHE_LOCATION is a directory) or
+# "redis" (CACHE_LOCATION is a redis:// URL of any Redis-compatible server; needs the redis package).
+CACHE_BACKENDS = {
+    "locmem": "django.core.cache.backends.locmem.LocMemCache",
+    "file": "django.core.cache.backends.filebased.FileBasedCache",
+    "redis": "django.core.cache.backends.redis.RedisCache",
+}
+CACHES = {
+    "default": {
+        "BACKEND": CACHE_BACKENDS[env("CACHE_BACKEND", default="locmem")],
+        "LOCATION": env("CACHE_LOCATION", default=""),
+    }
+}
+LIBRARY_CACHE_TIMEOUT = env.int("LIBRARY_CACHE_TIMEOUT", default=300)
+
+# Requests slower than this are logged as warnings with the statements that took the most database time.
+SLOW_REQUEST_THRESHOLD_MS = env.int("SLOW_REQUEST_THRESHOLD_MS", default=1000)
+SLOW_REQUEST_TOP_QUERIES = env.int("SLOW_REQUEST_TOP_QUERIES", default=5)
+
 LOGGING = {
     "version": 1,
     "disable_existing_loggers": False,
@@ -161,9 +253,10 @@ LOGGING = {
         },
     },
     "handlers": {
+        # Records are queued and written to stdout by a background thread, see core.logging_handlers.
         "console": {
             "level": "DEBUG",
-            "class": "logging.StreamHandler",
+            "class": "core.logging_handlers.QueueStreamHandler",
             "formatter": "json",
         }
     },
@@ -0,0 +1,60 @@
+import os
+
+from django.conf import settings
+from django.contrib.staticfiles.apps import StaticFilesConfig as BaseStaticFilesConfig
+from whitenoise.storage import CompressedManifestStaticFilesStorage
+
+VENDORS_DIR = os.path.join(settings.BASE_DIR, "static", "assets", "vendors")
+
+# Vendor bundles of static/assets/vendors loaded by the templates. The others came with the admin template the
+# pages are built on and are not collected: they are never served and some reference files they don't ship.
+USED_VENDORS = {
+    "chart.js",
+    "css",
+    "datatables.net",
+    "datatables.net-bs4",
+    "js",
+    "mdi",
+    "select2",
+    "select2-bootstrap-theme",
+    "simple-line-icons",
+    "ti-icons",
+}
+
+
+class StaticFilesConfig(BaseStaticFilesConfig):
+    """
+    The staticfiles app, with collectstatic skipping the unused vendor bundles and the SCSS sources.
+    """
+
+    ignore_patterns = BaseStaticFilesConfig.ignore_patterns + [
+        "*.scss",
+        *(f"assets/vendors/{name}/*" for name in sorted(os.listdir(VENDORS_DIR)) if name not in USED_VENDORS),
+    ]
+
+
+class StaticFilesStorage(CompressedManifestStaticFilesStorage):
+    """
+    collectstatic adds a content hash to the name of every file, e.g. main.3f2a9c1b4d5e.css, and writes gzip and,
+    with the Brotli package installed, brotli versions next to it. WhiteNoise serves hashed files with far-future
+    "immutable" cache headers, so browsers never revalidate them, and picks the smallest encoding the browser accepts.
+    Until collectstatic has written the manifest (tests, a fresh checkout) the URLs use the unhashed names.
+    References to files that aren't shipped, like the source maps of some vendor CSS, are left as they are instead
+    of failing collectstatic.
+    """
+
+    def url_converter(self, name, hashed_files, template=None):
+        convert = super().url_converter(name, hashed_files, template)
+
+        def convert_shipped(matchobj):
+            try:
+                return convert(matchobj)
+            except ValueError:
+                return matchobj.group(0)
+
+        return convert_shipped
+
+    def stored_name(self, name):
+        if not self.hashed_files:
+            return name
+        return super().stored_name(name)
@@ -1,8 +1,11 @@
 from django.contrib import admin
 
-from .models import Book, BorrowedBook, Member, Transaction
+from .models import Book, BorrowedBook, DailyRevenue, DataVersion, LibraryStats, Member, Transaction
 
 admin.site.register(Book)
 admin.site.register(BorrowedBook)
 admin.site.register(Member)
 admin.site.register(Transaction)
+admin.site.register(LibraryStats)
+admin.site.register(DailyRevenue)
+admin.site.register(DataVersion)
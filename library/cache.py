@@ -0,0 +1,155 @@
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.middleware.csrf import get_token
+from django.views.decorators.cache import cache_control
+from django.views.decorators.http import condition
+
+from core.routers import current_replica
+
+from .context_processors import greeting
+from .models import DataVersion
+from .pagination import DEFAULT_ORDERING, paginate
+
+
+def version_key(model):
+    return f"library:version:{model._meta.label_lower}"
+
+
+def get_versions(models):
+    """
+    Returns the current cache version of each model, in order.
+    A missing version (never set, or evicted) starts at the current time in nanoseconds rather than at 1,
+    so that it can never match a version that entries still in the cache were stored under.
+    """
+    keys = [version_key(model) for model in models]
+    versions = cache.get_many(keys)
+    for key in keys:
+        if key not in versions:
+            cache.add(key, time.time_ns(), timeout=None)
+            versions[key] = cache.get(key)
+    return [versions[key] for key in keys]
+
+
+def bump_version(*models):
+    """
+    Invalidates every cache entry stored under the version of one of the models, and bumps their DataVersion in
+    the current transaction so that other processes see the write too.
+    The cache version is bumped right away and again once the current transaction commits, so a page read from the
+    database before the commit can't stay cached under the new version.
+    """
+
+    def bump():
+        for model in models:
+            try:
+                cache.incr(version_key(model))
+            except ValueError:
+                cache.add(version_key(model), time.time_ns(), timeout=None)
+
+    DataVersion.bump(*models)
+    bump()
+    transaction.on_commit(bump)
+
+
+def invalidate(*models):
+    """
+    Invalidates the cached pages of models after writes made with update() or bulk_create(). Saving or deleting
+    one object invalidates them through the post_save and post_delete signals (see library.signals), but these
+    bulk writes send no signal, so the code making them calls this instead.
+    """
+    bump_version(*models)
+
+
+def cache_key(name, models, *parts):
+    """
+    Builds the key of a cache entry that depends on the rows of models, e.g. a page of a list view.
+    parts: Anything else the entry depends on, such as the search query or the cursor.
+    """
+    versions = ".".join(str(version) for version in get_versions(models))
+    digest = hashlib.md5(repr(parts).encode(), usedforsecurity=False).hexdigest()
+    return f"library:{name}:{versions}:{digest}"
+
+
+def read_timeout():
+    """
+    How long to cache something read from the database: LIBRARY_CACHE_TIMEOUT, or only REPLICA_PIN_SECONDS when it
+    was read from a replica, as it may miss the latest writes.
+    """
+    if current_replica() is not None:
+        return min(settings.LIBRARY_CACHE_TIMEOUT, settings.REPLICA_PIN_SECONDS)
+    return settings.LIBRARY_CACHE_TIMEOUT
+
+
+def data_version(models):
+    """
+    The DataVersion of each model, read by primary key from the database the request reads, so they change with any
+    write, whichever process made it, and reflect what a lagging replica has applied so far.
+    """
+    labels = [model._meta.label_lower for model in models]
+    return sorted(DataVersion.objects.filter(pk__in=labels).values_list("id", "version"))
+
+
+def cached_page(request, name, models, queryset, query="", ordering=DEFAULT_ORDERING, extra=()):
+    """
+    Returns the KeysetPage of a list view from the cache, paginating the queryset on a miss.
+    The page is stored under the versions of models, so a write to any of them invalidates it. On a GET decorated
+    with conditional_page, it is also stored under the data_version() of models, which catches the writes of other
+    processes (e.g. the cron jobs) that can't bump the versions of a per-process cache.
+    page.cache_key and page.cache_timeout can be passed to {% cache %} to also cache the rendered rows.
+    extra: Anything else the queryset depends on, e.g. today's date for the overdue books.
+    """
+    cursor = request.GET.get("cursor") if request.method == "GET" else None
+    key = cache_key(
+        name, models, query, cursor, request.GET.get("per_page"), getattr(request, "data_version", None), *extra
+    )
+    timeout = read_timeout()
+
+    page = cache.get(key)
+    if page is None:
+        page = paginate(request, queryset, ordering=ordering)
+        cache.set(key, page, timeout)
+
+    page.cache_key = key
+    page.cache_timeout = timeout
+    return page
+
+
+def conditional_page(name, models, extra=lambda request: ()):
+    """
+    View decorator answering the GET of a list view with 304 Not Modified when the browser already has the page.
+    The ETag is built from the versions of models, like the cache key of the page, and from their data_version(),
+    so checking it costs one primary key lookup and a write to any of the models changes it, even one made by
+    another process, and a page read from a lagging replica changes once the replica catches up. It also covers the
+    rest of the page: the ?query=, ?cursor=, ?per_page= and ?stream= parameters, the librarian, the CSRF token of the
+    forms and the greeting.
+    Cache-Control makes the browser revalidate the page on every visit and keeps shared caches from storing it.
+    extra: Function of the request returning anything else the page depends on, e.g. today's date.
+    """
+
+    def etag(request, *args, **kwargs):
+        # Sets the CSRF cookie now if the request has none, so the ETag matches the next request's.
+        get_token(request)
+        # Reused by cached_page(), so the page rendered matches the ETag sent with it.
+        request.data_version = data_version(models)
+        key = cache_key(
+            f"{name}-etag",
+            models,
+            request.data_version,
+            request.GET.get("query", ""),
+            request.GET.get("cursor"),
+            request.GET.get("per_page"),
+            request.GET.get("stream"),
+            [getattr(request.user, field, None) for field in ("pk", "first_name", "last_name", "email")],
+            request.META.get("CSRF_COOKIE"),
+            greeting(request),
+            *extra(request),
+        )
+        return hashlib.md5(key.encode(), usedforsecurity=False).hexdigest()
+
+    def decorator(view):
+        return cache_control(private=True, no_cache=True)(condition(etag_func=etag)(view))
+
+    return decorator
@@ -0,0 +1,203 @@
+import datetime
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.utils.dateparse import parse_date
+
+from .cache import cache_key, read_timeout
+from .models import Book, BorrowedBook, Member
+from .pagination import DEFAULT_ORDERING
+from .search import search_books
+
+
+def parse_int(value, name):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        raise ValidationError(f"{name} must be an integer.")
+
+
+def boolean_filter(field, value):
+    """
+    "true" or "false".
+    """
+    choices = {"true": True, "false": False}
+    if value not in choices:
+        raise ValidationError(f"{field} filter must be true or false.")
+    return {field: choices[value]}
+
+
+def date_range_filter(field, value):
+    """
+    "start,end", either of which may be left out, both included.
+    """
+
+    def to_date(date):
+        try:
+            date = parse_date(date)
+        except ValueError:
+            date = None
+        if date is None:
+            raise ValidationError(f"{field} filter must be a start,end date range.")
+        return date
+
+    start, _comma, end = value.partition(",")
+    lookups = {}
+    if start:
+        lookups[f"{field}__gte"] = to_date(start)
+    if end:
+        lookups[f"{field}__lt"] = to_date(end) + datetime.timedelta(days=1)
+    if not lookups:
+        raise ValidationError(f"{field} filter must be a start,end date range.")
+    return lookups
+
+
+def exact_filter(field, value):
+    return {field: value}
+
+
+class Column:
+    """
+    A column of a DataTable.
+    name: The columns[i][data] name the client uses, and the key of the column in each row.
+    field: The field the column shows, following relations with "__".
+    orderable: Whether the table can be sorted on the column, i.e. whether an index covers (field, id).
+    filter: One of the *_filter functions above, to filter the column with its columns[i][search][value].
+    filter_field: The field filtered on, if not field (e.g. the member id for the member name).
+    """
+
+    def __init__(self, name, field, orderable=False, filter=None, filter_field=None):
+        self.name = name
+        self.field = field
+        self.orderable = orderable
+        self.filter = filter
+        self.filter_field = filter_field or field
+
+    def value(self, obj):
+        for attribute in self.field.split("__"):
+            obj = getattr(obj, attribute)
+        return obj
+
+
+class DataTable:
+    """
+    Server-side processing of a DataTables table (https://datatables.net/manual/server-side): the sorting, the
+    per-column filters, the global search and the paging requested by the table are all done by the database, so
+    the browser only ever receives one page.
+    name: Names the cache entries of the row counts.
+    model: The model shown, one row per object.
+    columns: The Columns the client may request.
+    models: The models the rows depend on. The row counts are cached under their versions, see library.cache.
+    select_related: The relations followed by the columns, read in the same query.
+    search: Function filtering a queryset on the global search value.
+    """
+
+    def __init__(self, name, model, columns, models, select_related=(), search=None):
+        self.name = name
+        self.model = model
+        self.columns = {column.name: column for column in columns}
+        self.models = models
+        self.select_related = select_related
+        self.search = search
+
+    def queryset(self):
+        fields = [column.field for column in self.columns.values()]
+        return self.model.objects.select_related(*self.select_related).only(*fields)
+
+    def response(self, params):
+        """
+        The response to the request params (e.g. request.GET) of the table:
+        {"draw": ..., "recordsTotal": ..., "recordsFiltered": ..., "data": [{"DT_RowId": pk, <column>: value}]}
+        Raises ValidationError if the params are invalid.
+        Pages are selected with an OFFSET, as the protocol asks for rows by position, so deep pages cost more.
+        """
+        draw = parse_int(params.get("draw", 0), "draw")
+        start = max(parse_int(params.get("start", 0), "start"), 0)
+        length = parse_int(params.get("length", settings.LIBRARY_PAGE_SIZE), "length")
+        if not 0 < length <= settings.LIBRARY_MAX_PAGE_SIZE:
+            length = settings.LIBRARY_MAX_PAGE_SIZE
+
+        columns = self.requested_columns(params)
+        filters = self.filters(params, columns)
+        search = params.get("search[value]", "").strip()
+        ordering = self.ordering(params, columns)
+
+        total = self.count(self.queryset())
+        queryset = self.queryset().filter(**filters)
+        if search and self.search:
+            queryset = self.search(queryset, search)
+        filtered = self.count(queryset, sorted(filters.items()), search) if filters or search else total
+
+        rows = queryset.order_by(*ordering)[start : start + length]
+        data = [
+            {"DT_RowId": obj.pk, **{name: column.value(obj) for name, column in self.columns.items()}} for obj in rows
+        ]
+        return {"draw": draw, "recordsTotal": total, "recordsFiltered": filtered, "data": data}
+
+    def requested_columns(self, params):
+        """
+        The Columns of the columns[i][data] params, in order.
+        """
+        columns = []
+        while f"columns[{len(columns)}][data]" in params and len(columns) < len(self.columns):
+            name = params[f"columns[{len(columns)}][data]"]
+            if name not in self.columns:
+                raise ValidationError(f"Unknown column {name}.")
+            columns.append(self.columns[name])
+        return columns
+
+    def filters(self, params, columns):
+        filters = {}
+        for index, column in enumerate(columns):
+            value = params.get(f"columns[{index}][search][value]", "").strip()
+            if not value:
+                continue
+            if column.filter is None:
+                raise ValidationError(f"{column.name} can't be filtered.")
+            filters.update(column.filter(column.filter_field, value))
+        return filters
+
+    def ordering(self, params, columns):
+        """
+        The order_by() of the order[j][column] and order[j][dir] params, with the primary key as a tie breaker.
+        """
+        ordering = []
+        index = 0
+        while f"order[{index}][column]" in params and index < len(columns):
+            column = parse_int(params[f"order[{index}][column]"], "order column")
+            if not 0 <= column < len(columns) or not columns[column].orderable:
+                raise ValidationError("The table can't be sorted on this column.")
+            prefix = "-" if params.get(f"order[{index}][dir]") == "desc" else ""
+            ordering.append(f"{prefix}{columns[column].field}")
+            index += 1
+
+        if not ordering:
+            return DEFAULT_ORDERING
+        return [*ordering, "-id" if ordering[0].startswith("-") else "id"]
+
+    def count(self, queryset, *parts):
+        """
+        The number of rows of the queryset, cached until one of the models changes.
+        parts: The filters and search the queryset depends on.
+        """
+        key = cache_key(f"{self.name}-count", self.models, *parts)
+        return cache.get_or_set(key, queryset.count, read_timeout())
+
+
+LOANS_TABLE = DataTable(
+    "loans-table",
+    BorrowedBook,
+    [
+        Column("book", "book__title"),
+        Column("member", "member__name", filter=exact_filter, filter_field="member_id"),
+        Column("return_date", "return_date", orderable=True, filter=date_range_filter),
+        Column("fine", "fine", orderable=True),
+        Column("returned", "returned", filter=boolean_filter),
+        Column("overdue", "overdue", filter=boolean_filter),
+        Column("created_at", "created_at", orderable=True, filter=date_range_filter),
+    ],
+    (BorrowedBook, Member, Book),
+    select_related=("member", "book"),
+    search=lambda queryset, query: search_books(queryset, query, book_path="book__"),
+)
@@ -0,0 +1,97 @@
+import csv
+import datetime
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+
+from .models import BorrowedBook, Member, Transaction
+
+
+class Export:
+    """
+    A streamed export of one table.
+    columns: The values_list() fields written for each row, in order. They double as the CSV header / JSON keys.
+    member_field: The field holding the member id, filtered on to export the rows of one member.
+    by_payment_method: Whether the rows can be filtered by payment method.
+    """
+
+    def __init__(self, model, columns, member_field, by_payment_method=False):
+        self.model = model
+        self.columns = columns
+        self.member_field = member_field
+        self.by_payment_method = by_payment_method
+
+    def rows(self, start=None, end=None, member=None, payment_method=None, chunk_size=2000, using=None):
+        """
+        Yields the rows as tuples, oldest first, fetching chunk_size rows at a time with a server-side cursor
+        where the database has them, so memory use does not grow with the number of rows.
+        start / end: Dates bounding created_at, both included.
+        member: Only rows of this member, given as a Member or its id.
+        payment_method: Only payments made with this method; ignored unless by_payment_method is set.
+        using: Database alias to read from. The rows are read after the view returns, so the alias is fixed here.
+        """
+        queryset = self.model.objects.using(using)
+        if start:
+            queryset = queryset.filter(created_at__gte=start)
+        if end:
+            queryset = queryset.filter(created_at__lt=end + datetime.timedelta(days=1))
+        if member:
+            queryset = queryset.filter(**{self.member_field: getattr(member, "pk", member)})
+        if payment_method and self.by_payment_method:
+            queryset = queryset.filter(payment_method=payment_method)
+
+        return queryset.order_by("created_at", "id").values_list(*self.columns).iterator(chunk_size=chunk_size)
+
+
+EXPORTS = {
+    "payments": Export(
+        Transaction,
+        ("id", "member_id", "member__name", "amount", "payment_method", "created_at"),
+        "member_id",
+        by_payment_method=True,
+    ),
+    "loans": Export(
+        BorrowedBook,
+        (
+            "id",
+            "member_id",
+            "member__name",
+            "book_id",
+            "book__title",
+            "return_date",
+            "fine",
+            "returned",
+            "overdue",
+            "created_at",
+        ),
+        "member_id",
+    ),
+    "members": Export(Member, ("id", "name", "email", "amount_due", "created_at"), "pk"),
+}
+
+
+class Echo:
+    """
+    File-like object whose write() returns the line instead of storing it, so csv.writer() can feed a generator.
+    """
+
+    def write(self, value):
+        return value
+
+
+def csv_lines(columns, rows):
+    writer = csv.writer(Echo())
+    yield writer.writerow(columns)
+    for row in rows:
+        yield writer.writerow(row)
+
+
+def jsonl_lines(columns, rows):
+    for row in rows:
+        yield json.dumps(dict(zip(columns, row)), cls=DjangoJSONEncoder) + "\n"
+
+
+FORMATS = {
+    "csv": (csv_lines, "text/csv"),
+    "jsonl": (jsonl_lines, "application/x-ndjson"),
+}
@@ -3,6 +3,7 @@ from django.core.exceptions import ValidationError
 from django.utils.translation import gettext_lazy as _
 
 from .models import CATEGORY_CHOICES, PAYMENT_METHOD_CHOICES, Book, BorrowedBook, Member
+from .widgets import AutocompleteSelect, AutocompleteSelectMultiple
 
 
 class AddMemberForm(forms.ModelForm):
@@ -26,6 +27,25 @@ class AddMemberForm(forms.ModelForm):
         return email
 
 
+class ImportMemberForm(AddMemberForm):
+    """
+    AddMemberForm for one row of a CSV import.
+    known_emails: Emails already taken. Duplicates are checked against this set instead of with one query per row.
+    """
+
+    def __init__(self, *args, known_emails, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.known_emails = known_emails
+
+    def clean_email(self):
+        email = self.cleaned_data.get("email")
+
+        if email in self.known_emails:
+            raise ValidationError(_("A member with that email already exists."))
+
+        return email
+
+
 class UpdateMemberForm(forms.ModelForm):
     name = forms.CharField(
         widget=forms.TextInput(attrs={"class": "form-control form-control-lg", "placeholder": "Enter Member Name"})
@@ -73,19 +93,22 @@ class AddBookForm(forms.ModelForm):
 
 
 class LendBookForm(forms.ModelForm):
-    book = forms.ModelChoiceField(
+    book = forms.ModelMultipleChoiceField(
         label="Book / Books",
         queryset=Book.objects.filter(quantity__gt=0),
-        empty_label=None,
-        widget=forms.Select(
-            attrs={"class": "form-control form-control-lg js-example-basic-multiple w-100", "multiple": "multiple"}
+        widget=AutocompleteSelectMultiple(
+            "book-lookup",
+            attrs={"class": "form-control form-control-lg js-example-basic-multiple w-100"},
         ),
     )
 
     member = forms.ModelChoiceField(
         queryset=Member.objects.all(),
         empty_label=None,
-        widget=forms.Select(attrs={"class": "form-control form-control-lg js-example-basic-single w-100"}),
+        widget=AutocompleteSelect(
+            "member-lookup",
+            attrs={"class": "form-control form-control-lg js-example-basic-single w-100"},
+        ),
     )
 
     return_date = forms.DateField(
@@ -98,15 +121,15 @@ class LendBookForm(forms.ModelForm):
 
     class Meta:
         model = BorrowedBook
-        fields = ["book", "member", "return_date", "fine"]
+        fields = ["member", "return_date", "fine"]
 
 
 class LendMemberBookForm(forms.ModelForm):
-    book = forms.ModelChoiceField(
+    book = forms.ModelMultipleChoiceField(
         queryset=Book.objects.filter(quantity__gt=0),
-        empty_label=None,
-        widget=forms.Select(
-            attrs={"class": "form-control form-control-lg js-example-basic-multiple w-100", "multiple": "multiple"}
+        widget=AutocompleteSelectMultiple(
+            "book-lookup",
+            attrs={"class": "form-control form-control-lg js-example-basic-multiple w-100"},
         ),
     )
 
@@ -120,7 +143,7 @@ class LendMemberBookForm(forms.ModelForm):
 
     class Meta:
         model = BorrowedBook
-        fields = ["book", "return_date", "fine"]
+        fields = ["return_date", "fine"]
 
 
 class UpdateBorrowedBookForm(forms.ModelForm):
@@ -137,6 +160,84 @@ class UpdateBorrowedBookForm(forms.ModelForm):
         fields = ["return_date", "fine"]
 
 
+class ReturnBooksForm(forms.Form):
+    """
+    Loans to return at once. The loan ids are separated by spaces, commas or new lines, as a barcode scanner
+    types them. The payment method is only needed when some of the books are overdue.
+    """
+
+    max_loans = 500
+
+    loans = forms.CharField(
+        label="Loan IDs",
+        widget=forms.Textarea(
+            attrs={"class": "form-control form-control-lg", "rows": 8, "placeholder": "Scan or paste the loan IDs"}
+        ),
+    )
+
+    payment_method = forms.ChoiceField(
+        label="Payment method for fines",
+        required=False,
+        choices=[("", "---------")] + list(PAYMENT_METHOD_CHOICES),
+        widget=forms.Select(attrs={"class": "form-control form-control-lg"}),
+    )
+
+    def clean_loans(self):
+        loans = list(dict.fromkeys(self.cleaned_data["loans"].replace(",", " ").split()))
+        if len(loans) > self.max_loans:
+            raise ValidationError(
+                _("At most %(limit)s books can be returned at once."), params={"limit": self.max_loans}
+            )
+
+        pk_field = BorrowedBook._meta.pk
+        invalid = []
+        for loan in loans:
+            try:
+                pk_field.to_python(loan)
+            except ValidationError:
+                invalid.append(loan)
+        if invalid:
+            raise ValidationError(_("Unknown loan(s): %(loans)s."), params={"loans": ", ".join(invalid)})
+        return loans
+
+
+class ImportForm(forms.Form):
+    kind = forms.ChoiceField(
+        label="Import",
+        choices=(("books", "Books"), ("members", "Members")),
+        widget=forms.Select(attrs={"class": "form-control form-control-lg"}),
+    )
+
+    file = forms.FileField(
+        label="CSV file",
+        widget=forms.ClearableFileInput(attrs={"class": "form-control form-control-lg", "accept": ".csv"}),
+    )
+
+
+class ExportForm(forms.Form):
+    """
+    Filters of an export, read from the query string.
+    """
+
+    format = forms.ChoiceField(choices=(("csv", "CSV"), ("jsonl", "JSON Lines")), required=False)
+    start = forms.DateField(required=False)
+    end = forms.DateField(required=False)
+    member = forms.ModelChoiceField(queryset=Member.objects.all(), required=False)
+    payment_method = forms.ChoiceField(choices=PAYMENT_METHOD_CHOICES, required=False)
+
+
+class RevenueForm(forms.Form):
+    start = forms.DateField(
+        required=False,
+        widget=forms.DateInput(attrs={"class": "form-control form-control-lg", "type": "date"}),
+    )
+
+    end = forms.DateField(
+        required=False,
+        widget=forms.DateInput(attrs={"class": "form-control form-control-lg", "type": "date"}),
+    )
+
+
 class PaymentForm(forms.Form):
     payment_method = forms.ChoiceField(
         choices=PAYMENT_METHOD_CHOICES, widget=forms.Select(attrs={"class": "form-control form-control-lg"})
@@ -144,3 +245,42 @@ class PaymentForm(forms.Form):
 
     class Meta:
         fields = ["payment_method"]
+
+
+class LoansTableFiltersForm(forms.Form):
+    """
+    Per-column filters of the loans table. Only rendered: the table sends them to LoansTableDataView as the
+    search values of its columns.
+    """
+
+    member = forms.ModelChoiceField(
+        queryset=Member.objects.all(),
+        required=False,
+        widget=AutocompleteSelect(
+            "member-lookup",
+            attrs={
+                "class": "form-control js-example-basic-single w-100",
+                "data-placeholder": "Any member",
+                "data-allow-clear": "true",
+                "data-column": "member",
+            },
+        ),
+    )
+    returned = forms.ChoiceField(
+        choices=(("", "Returned or not"), ("true", "Returned"), ("false", "Not returned")),
+        required=False,
+        widget=forms.Select(attrs={"class": "form-control", "data-column": "returned"}),
+    )
+    overdue = forms.ChoiceField(
+        choices=(("", "Overdue or not"), ("true", "Overdue"), ("false", "Not overdue")),
+        required=False,
+        widget=forms.Select(attrs={"class": "form-control", "data-column": "overdue"}),
+    )
+    return_date_start = forms.DateField(
+        required=False,
+        widget=forms.DateInput(attrs={"class": "form-control", "type": "date", "data-column": "return_date"}),
+    )
+    return_date_end = forms.DateField(
+        required=False,
+        widget=forms.DateInput(attrs={"class": "form-control", "type": "date", "data-column": "return_date"}),
+    )
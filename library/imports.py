@@ -0,0 +1,121 @@
+import csv
+import logging
+
+from django.core.exceptions import ValidationError
+from django.utils.translation import gettext_lazy as _
+
+from .cache import invalidate
+from .forms import AddBookForm, ImportMemberForm
+from .models import Book, Member
+
+logger = logging.getLogger(__name__)
+
+
+class CSVImporter:
+    """
+    Streams the rows of a CSV file through the form used to add one object and inserts the valid rows with chunked
+    bulk_create(), so memory use stays flat whatever the size of the file.
+    chunk_size: Number of rows per INSERT.
+    on_reject: Called as on_reject(line_number, row, message) for every invalid row, as soon as it is read.
+    """
+
+    model = None
+    form_class = None
+
+    def __init__(self, chunk_size=1000, on_reject=None):
+        self.chunk_size = chunk_size
+        self.on_reject = on_reject
+        self.created = 0
+        self.rejected = 0
+
+    def get_form(self, row):
+        return self.form_class(data=row)
+
+    def build(self, form):
+        return form.save(commit=False)
+
+    def run(self, lines):
+        """
+        Imports the rows of lines, an iterable of CSV lines whose header names the form fields.
+        Raises ValidationError if a column is missing. Returns the number of rows created and rejected.
+        """
+        reader = csv.DictReader(lines)
+        missing = [column for column in self.form_class._meta.fields if column not in (reader.fieldnames or ())]
+        if missing:
+            raise ValidationError(
+                _("The CSV file is missing the column(s): %(columns)s."), params={"columns": ", ".join(missing)}
+            )
+
+        chunk = []
+        for row in reader:
+            form = self.get_form(row)
+            if not form.is_valid():
+                self.reject(reader.line_num, row, form.errors)
+                continue
+
+            obj = self.build(form)
+            obj.id = self.model.generate_id()
+            chunk.append(obj)
+            if len(chunk) >= self.chunk_size:
+                self.insert(chunk)
+                chunk = []
+        self.insert(chunk)
+
+        logger.info(f"{self.created} {self.model._meta.verbose_name_plural} imported, {self.rejected} row(s) rejected.")
+        return self.created, self.rejected
+
+    def insert(self, chunk):
+        if not chunk:
+            return
+
+        self.model.objects.bulk_create(chunk)
+        invalidate(self.model)
+        self.created += len(chunk)
+
+    def reject(self, line_number, row, errors):
+        self.rejected += 1
+        if self.on_reject:
+            message = "; ".join(f"{field}: {' '.join(messages)}" for field, messages in errors.items())
+            self.on_reject(line_number, row, message)
+
+
+class BookImporter(CSVImporter):
+    """
+    Imports books with the AddBookForm rules. Columns: title, author, category, quantity, borrowing_fee.
+    """
+
+    model = Book
+    form_class = AddBookForm
+
+    def build(self, form):
+        book = form.save(commit=False)
+        book.status = "not-available" if book.quantity == 0 else "available"
+        return book
+
+
+class MemberImporter(CSVImporter):
+    """
+    Imports members with the AddMemberForm rules. Columns: name, email.
+    Emails are deduplicated against the existing members, fetched once, and the rows imported before them.
+    """
+
+    model = Member
+    form_class = ImportMemberForm
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.known_emails = set(Member.objects.values_list("email", flat=True).iterator())
+
+    def get_form(self, row):
+        return self.form_class(data=row, known_emails=self.known_emails)
+
+    def build(self, form):
+        member = form.save(commit=False)
+        self.known_emails.add(member.email)
+        return member
+
+
+IMPORTERS = {
+    "books": BookImporter,
+    "members": MemberImporter,
+}
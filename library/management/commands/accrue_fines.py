@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from library.services import accrue_fines
+
+
+class Command(BaseCommand):
+    help = (
+        "Marks unreturned books past their return date as overdue and refreshes every member's amount due "
+        "with chunked, set-based UPDATEs. Meant to run daily."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--chunk-size", type=int, default=1000, help="Number of rows per UPDATE.")
+
+    def handle(self, *args, **options):
+        marked, refreshed = accrue_fines(chunk_size=options["chunk_size"])
+        self.stdout.write(
+            self.style.SUCCESS(f"{marked} loan(s) marked overdue, amount due refreshed for {refreshed} member(s).")
+        )
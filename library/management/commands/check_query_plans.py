@@ -0,0 +1,88 @@
+import re
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections, transaction
+from django.utils import timezone
+
+from library.models import Book, BorrowedBook, Member, Transaction
+from library.pagination import DEFAULT_ORDERING
+from library.views import BookLookupView, MemberLookupView
+
+# A full table scan in the EXPLAIN output of each vendor. SQLite reports "SCAN <table>" for a full scan
+# and "SCAN <table> USING [COVERING] INDEX ..." for a full index scan, which keeps the order of the index.
+SEQUENTIAL_SCANS = {
+    "postgresql": re.compile(r"Seq Scan on (\w+)"),
+    "sqlite": re.compile(r"\bSCAN (\w+)\b(?!\s+USING)"),
+}
+
+
+def view_queries():
+    """
+    The main query of each view and background job. Aggregates are replaced by the columns they read, which
+    selects the rows the same way.
+    """
+    today = timezone.now().date()
+    outstanding = BorrowedBook.objects.filter(returned=False)
+    overdue = outstanding.filter(return_date__lt=today)
+    page = slice(0, 51)
+
+    return {
+        "HomeView: overdue books": overdue.order_by().values_list("id", "fine"),
+        "OverdueBooksView": overdue.select_related("member", "book").order_by(*DEFAULT_ORDERING)[page],
+        "LibraryStats.rebuild: outstanding loans": outstanding.order_by().values_list("id"),
+        "mark_overdue_loans": overdue.filter(overdue=False).order_by("pk").values_list("pk", flat=True)[:1000],
+        "BookLookupView": BookLookupView().get_queryset("")[:21],
+        "MemberLookupView": MemberLookupView().get_queryset("")[:21],
+        "BooksListView": Book.objects.order_by(*DEFAULT_ORDERING)[page],
+        "MembersListView": Member.objects.with_amount_due().order_by(*DEFAULT_ORDERING)[page],
+        "LentBooksListView": BorrowedBook.objects.select_related("member", "book").order_by(*DEFAULT_ORDERING)[page],
+        "ListPaymentsView": Transaction.objects.select_related("member").order_by(*DEFAULT_ORDERING)[page],
+        "Payment history of a member": Transaction.objects.filter(member_id=Member.generate_id()).order_by(
+            *DEFAULT_ORDERING
+        )[page],
+    }
+
+
+class Command(BaseCommand):
+    help = (
+        "Runs EXPLAIN on the main query of each list view, lookup and background job, and fails if a plan reads "
+        "a whole table instead of using an index. On PostgreSQL sequential scans are disabled for the check, so a "
+        "sequential scan is only reported when no index can serve the query, as it would be on a large table."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--database", default="default", help="Database alias to check.")
+        parser.add_argument("--verbose-plans", action="store_true", help="Print the plan of every query.")
+
+    def handle(self, *args, **options):
+        connection = connections[options["database"]]
+        pattern = SEQUENTIAL_SCANS.get(connection.vendor)
+        if pattern is None:
+            raise CommandError(f"Query plans can't be checked on {connection.vendor}.")
+
+        failures = []
+        with transaction.atomic(using=options["database"]):
+            if connection.vendor == "postgresql":
+                with connection.cursor() as cursor:
+                    cursor.execute("SET LOCAL enable_seqscan = off")
+
+            for name, queryset in view_queries().items():
+                plan = self.explain(connection, queryset.using(options["database"]))
+                if options["verbose_plans"]:
+                    self.stdout.write(f"{name}:\n{plan}\n")
+
+                scanned = sorted(set(pattern.findall(plan)))
+                if scanned:
+                    failures.append(f"{name}: sequential scan of {', '.join(scanned)}")
+                else:
+                    self.stdout.write(self.style.SUCCESS(f"{name}: OK"))
+
+        if failures:
+            raise CommandError("\n".join(failures))
+
+    def explain(self, connection, queryset):
+        sql, params = queryset.query.get_compiler(connection=connection).as_sql()
+        prefix = "EXPLAIN QUERY PLAN" if connection.vendor == "sqlite" else "EXPLAIN"
+        with connection.cursor() as cursor:
+            cursor.execute(f"{prefix} {sql}", params)
+            return "\n".join(" ".join(str(column) for column in row) for row in cursor.fetchall())
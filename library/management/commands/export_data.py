@@ -0,0 +1,60 @@
+import datetime
+
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+
+from library.exports import EXPORTS, FORMATS
+from library.models import PAYMENT_METHOD_CHOICES
+
+
+def date(value):
+    return datetime.date.fromisoformat(value)
+
+
+class Command(BaseCommand):
+    help = (
+        "Exports payments, loans or members as CSV or JSON Lines, oldest first. Rows are read in chunks with a "
+        "server-side cursor and written as they arrive, so memory use stays constant whatever the number of rows."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("kind", choices=sorted(EXPORTS), help="What to export.")
+        parser.add_argument("--format", choices=sorted(FORMATS), default="csv", help="Output format.")
+        parser.add_argument("--output", help="File to write to. Defaults to stdout.")
+        parser.add_argument("--start", type=date, help="First creation date exported, as YYYY-MM-DD.")
+        parser.add_argument("--end", type=date, help="Last creation date exported, as YYYY-MM-DD.")
+        parser.add_argument("--member", help="Only export the rows of the member with this id.")
+        parser.add_argument(
+            "--payment-method",
+            choices=[method for method, _label in PAYMENT_METHOD_CHOICES],
+            help="Only export the payments made with this method.",
+        )
+        parser.add_argument("--chunk-size", type=int, default=2000, help="Number of rows fetched at a time.")
+
+    def handle(self, *args, **options):
+        export = EXPORTS[options["kind"]]
+        lines, _content_type = FORMATS[options["format"]]
+        try:
+            rows = export.rows(
+                start=options["start"],
+                end=options["end"],
+                member=options["member"],
+                payment_method=options["payment_method"],
+                chunk_size=options["chunk_size"],
+            )
+        except ValidationError as e:
+            raise CommandError(" ".join(e.messages))
+
+        try:
+            output = open(options["output"], "w", newline="", encoding="utf-8") if options["output"] else None
+        except OSError as e:
+            raise CommandError(e)
+
+        # Every line ends with a newline, so self.stdout writes it unchanged.
+        stream = output or self.stdout
+        try:
+            for line in lines(export.columns, rows):
+                stream.write(line)
+        finally:
+            if output:
+                output.close()
@@ -0,0 +1,33 @@
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+
+from library.imports import IMPORTERS
+
+
+class Command(BaseCommand):
+    help = (
+        "Imports books or members from a CSV file whose header names the fields of the add book / add member form. "
+        "Rows are validated with the same rules as the forms, streamed from the file and inserted in chunks. "
+        "Rejected rows are reported on stderr with their line number."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("kind", choices=sorted(IMPORTERS), help="What the file contains.")
+        parser.add_argument("path", help="Path of the CSV file.")
+        parser.add_argument("--chunk-size", type=int, default=1000, help="Number of rows per INSERT.")
+
+    def handle(self, *args, **options):
+        importer = IMPORTERS[options["kind"]](chunk_size=options["chunk_size"], on_reject=self.report)
+
+        try:
+            with open(options["path"], newline="", encoding="utf-8-sig") as lines:
+                created, rejected = importer.run(lines)
+        except (OSError, UnicodeDecodeError) as e:
+            raise CommandError(e)
+        except ValidationError as e:
+            raise CommandError(" ".join(e.messages))
+
+        self.stdout.write(self.style.SUCCESS(f"{created} {options['kind']} imported, {rejected} row(s) rejected."))
+
+    def report(self, line_number, row, message):
+        self.stderr.write(f"Line {line_number}: {message}")
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from library.models import DailyRevenue
+
+
+class Command(BaseCommand):
+    help = (
+        "Recomputes the DailyRevenue rollup from the Transaction table with one GROUP BY date, payment method pass. "
+        "Run it once after deploying the table, and whenever the rollup needs to be checked against the payments."
+    )
+
+    def handle(self, *args, **options):
+        rows = DailyRevenue.rebuild()
+        self.stdout.write(self.style.SUCCESS(f"Daily revenue rebuilt: {rows} day / payment method row(s)."))
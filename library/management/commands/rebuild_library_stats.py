@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+
+from library.models import LibraryStats
+
+
+class Command(BaseCommand):
+    help = "Recomputes the dashboard LibraryStats rollup from the Transaction and BorrowedBook tables."
+
+    def handle(self, *args, **options):
+        stats = LibraryStats.rebuild()
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Library stats rebuilt: total_amount={stats.total_amount}, "
+                f"total_borrowed_books={stats.total_borrowed_books}"
+            )
+        )
@@ -0,0 +1,26 @@
+import datetime
+
+from django.core.management.base import BaseCommand
+
+from library.reminders import send_overdue_reminders
+
+
+class Command(BaseCommand):
+    help = (
+        "Emails every member with overdue books one reminder listing them, over a single connection to the mail "
+        "server. Members reminded in the last --interval-days days are skipped, so reruns send nothing new. "
+        "Meant to run daily, after accrue_fines."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--interval-days", type=int, default=7, help="Days between two reminders to a member.")
+        parser.add_argument("--batch-size", type=int, default=100, help="Number of emails sent per batch.")
+        parser.add_argument("--chunk-size", type=int, default=2000, help="Number of loans read at a time.")
+
+    def handle(self, *args, **options):
+        sent = send_overdue_reminders(
+            interval=datetime.timedelta(days=options["interval_days"]),
+            batch_size=options["batch_size"],
+            chunk_size=options["chunk_size"],
+        )
+        self.stdout.write(self.style.SUCCESS(f"{sent} overdue reminder(s) sent."))
@@ -0,0 +1,100 @@
+import os
+
+from django.conf import settings
+from django.contrib.staticfiles import finders
+from django.core.management.base import BaseCommand
+from django.template import Context, Engine
+from django.template.loader_tags import ExtendsNode
+from django.templatetags.static import StaticNode
+from whitenoise.compress import Compressor
+
+
+def page_assets(engine, name):
+    """
+    The static files a page template loads with {% static %}, including those of the templates it extends.
+    """
+    assets = []
+    while name:
+        nodelist = engine.get_template(name).nodelist
+        assets += [node.path.resolve(Context()) for node in nodelist.get_nodes_by_type(StaticNode)]
+        parents = nodelist.get_nodes_by_type(ExtendsNode)
+        name = parents[0].parent_name.resolve(Context()) if parents else None
+    return list(dict.fromkeys(assets))
+
+
+def pages(directory):
+    """
+    The templates of directory that extend another template, i.e. the pages, relative to directory.
+    """
+    names = []
+    for root, _dirs, files in os.walk(directory):
+        for file in files:
+            path = os.path.join(root, file)
+            if file.endswith(".html"):
+                with open(path) as template:
+                    if "{% extends" in template.read():
+                        names.append(os.path.relpath(path, directory))
+    return sorted(names)
+
+
+class Command(BaseCommand):
+    help = (
+        "Reports the static assets each page loads: their size, the bytes sent on a first visit once collectstatic "
+        "has precompressed them, and the bytes saved. With --baseline, the savings are counted from the uncompressed "
+        "assets the pages of another templates directory (e.g. a checkout of an older commit) load. Repeat visits "
+        "send no asset bytes at all, the hashed files being cached as immutable."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--templates", default=os.path.join(settings.BASE_DIR, "templates"), help="Templates directory to report."
+        )
+        parser.add_argument("--baseline", help="Templates directory to count the savings from.")
+
+    def handle(self, *args, **options):
+        self.compressor = Compressor(quiet=True)
+        self.sizes = {}
+        current = self.load(options["templates"])
+        baseline = self.load(options["baseline"]) if options["baseline"] else {}
+
+        self.stdout.write(f"{'Page':<40}{'Assets':>8}{'Bytes':>12}{'Sent':>12}{'Saved':>12}{'Saved %':>9}")
+        for page, assets in current.items():
+            size = sum(self.size(asset)[0] for asset in assets)
+            sent = sum(self.size(asset)[1] for asset in assets)
+            before = sum(self.size(asset)[0] for asset in baseline.get(page, assets))
+            saved = before - sent
+            percent = f"{saved / before:.0%}" if before else "-"
+            self.stdout.write(f"{page:<40}{len(assets):>8}{size:>12,}{sent:>12,}{saved:>12,}{percent:>9}")
+
+        missing = sorted(asset for asset, (size, _sent) in self.sizes.items() if size is None)
+        for asset in missing:
+            self.stderr.write(f"Not found: {asset}")
+
+    def load(self, directory):
+        engine = Engine(dirs=[directory], libraries=Engine.get_default().libraries)
+        return {page: page_assets(engine, page) for page in pages(directory)}
+
+    def size(self, asset):
+        """
+        The size of an asset and the bytes sent for it: its brotli (or gzip, without the Brotli package) version
+        when collectstatic keeps one, which it does when compression saves at least 5%.
+        """
+        if asset not in self.sizes:
+            path = finders.find(asset)
+            if path is None:
+                self.sizes[asset] = (None, None)
+            else:
+                with open(path, "rb") as file:
+                    data = file.read()
+                sent = len(data)
+                if self.compressor.should_compress(path):
+                    if self.compressor.use_brotli:
+                        compressed = self.compressor.compress_brotli(data)
+                    else:
+                        compressed = self.compressor.compress_gzip(data)
+                    if self.compressor.is_compressed_effectively("", path, len(data), compressed):
+                        sent = len(compressed)
+                self.sizes[asset] = (len(data), sent)
+
+        size, sent = self.sizes[asset]
+        return (size or 0, sent or 0)
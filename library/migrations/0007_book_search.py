@@ -0,0 +1,80 @@
+# Generated by Django 5.0.1 on 2026-10-17 01:30
+
+import django.contrib.postgres.search
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+
+POSTGRESQL_FORWARDS = [
+    """
+    CREATE TRIGGER library_book_search_vector_update
+    BEFORE INSERT OR UPDATE OF title, author, search_vector ON library_book
+    FOR EACH ROW EXECUTE FUNCTION tsvector_update_trigger(search_vector, 'pg_catalog.simple', title, author)
+    """,
+    "UPDATE library_book SET search_vector = to_tsvector('pg_catalog.simple', title || ' ' || author)",
+    "CREATE INDEX library_book_search_vector_gin ON library_book USING gin (search_vector)",
+    "CREATE INDEX library_book_title_trgm ON library_book USING gin (title gin_trgm_ops)",
+    "CREATE INDEX library_book_author_trgm ON library_book USING gin (author gin_trgm_ops)",
+]
+
+POSTGRESQL_BACKWARDS = [
+    "DROP INDEX IF EXISTS library_book_author_trgm",
+    "DROP INDEX IF EXISTS library_book_title_trgm",
+    "DROP INDEX IF EXISTS library_book_search_vector_gin",
+    "DROP TRIGGER IF EXISTS library_book_search_vector_update ON library_book",
+]
+
+SQLITE_FORWARDS = [
+    "CREATE VIRTUAL TABLE library_book_fts USING fts5(book_id UNINDEXED, title, author, prefix='2 3')",
+    """
+    CREATE TRIGGER library_book_fts_insert AFTER INSERT ON library_book BEGIN
+        INSERT INTO library_book_fts (book_id, title, author) VALUES (new.id, new.title, new.author);
+    END
+    """,
+    """
+    CREATE TRIGGER library_book_fts_update AFTER UPDATE OF id, title, author ON library_book BEGIN
+        UPDATE library_book_fts SET book_id = new.id, title = new.title, author = new.author
+        WHERE book_id = old.id;
+    END
+    """,
+    """
+    CREATE TRIGGER library_book_fts_delete AFTER DELETE ON library_book BEGIN
+        DELETE FROM library_book_fts WHERE book_id = old.id;
+    END
+    """,
+    "INSERT INTO library_book_fts (book_id, title, author) SELECT id, title, author FROM library_book",
+]
+
+SQLITE_BACKWARDS = [
+    "DROP TRIGGER IF EXISTS library_book_fts_delete",
+    "DROP TRIGGER IF EXISTS library_book_fts_update",
+    "DROP TRIGGER IF EXISTS library_book_fts_insert",
+    "DROP TABLE IF EXISTS library_book_fts",
+]
+
+
+def run_vendor_sql(statements):
+    def run(apps, schema_editor):
+        for statement in statements.get(schema_editor.connection.vendor, []):
+            schema_editor.execute(statement)
+
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('library', '0006_created_at_id_indexes'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.AddField(
+            model_name='book',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.RunPython(
+            run_vendor_sql({"postgresql": POSTGRESQL_FORWARDS, "sqlite": SQLITE_FORWARDS}),
+            run_vendor_sql({"postgresql": POSTGRESQL_BACKWARDS, "sqlite": SQLITE_BACKWARDS}),
+        ),
+    ]
@@ -0,0 +1,46 @@
+from django.db import migrations
+
+# Expression indexes matching the UPPER(column::text) LIKE 'term%' that Django emits for istartswith on PostgreSQL.
+POSTGRESQL_FORWARDS = [
+    "CREATE INDEX library_book_title_prefix ON library_book (UPPER(title::text) text_pattern_ops)",
+    "CREATE INDEX library_book_author_prefix ON library_book (UPPER(author::text) text_pattern_ops)",
+    "CREATE INDEX library_member_name_prefix ON library_member (UPPER(name::text) text_pattern_ops)",
+    "CREATE INDEX library_member_email_prefix ON library_member (UPPER(email::text) text_pattern_ops)",
+]
+
+# SQLite uses an index for a case-insensitive LIKE prefix match only if the index is COLLATE NOCASE.
+SQLITE_FORWARDS = [
+    "CREATE INDEX library_book_title_prefix ON library_book (title COLLATE NOCASE)",
+    "CREATE INDEX library_book_author_prefix ON library_book (author COLLATE NOCASE)",
+    "CREATE INDEX library_member_name_prefix ON library_member (name COLLATE NOCASE)",
+    "CREATE INDEX library_member_email_prefix ON library_member (email COLLATE NOCASE)",
+]
+
+BACKWARDS = [
+    "DROP INDEX IF EXISTS library_book_title_prefix",
+    "DROP INDEX IF EXISTS library_book_author_prefix",
+    "DROP INDEX IF EXISTS library_member_name_prefix",
+    "DROP INDEX IF EXISTS library_member_email_prefix",
+]
+
+
+def run_vendor_sql(statements):
+    def run(apps, schema_editor):
+        for statement in statements.get(schema_editor.connection.vendor, []):
+            schema_editor.execute(statement)
+
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('library', '0007_book_search'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            run_vendor_sql({"postgresql": POSTGRESQL_FORWARDS, "sqlite": SQLITE_FORWARDS}),
+            run_vendor_sql({"postgresql": BACKWARDS, "sqlite": BACKWARDS}),
+        ),
+    ]
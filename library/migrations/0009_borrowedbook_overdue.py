@@ -0,0 +1,18 @@
+# Generated by Django 5.0.1 on 2026-10-17 01:34
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('library', '0008_prefix_lookup_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='borrowedbook',
+            name='overdue',
+            field=models.BooleanField(default=False),
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 5.0.1 on 2026-10-17 01:46
+
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('library', '0009_borrowedbook_overdue'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='book',
+            index=models.Index(django.db.models.functions.text.Upper('title'), models.F('id'), condition=models.Q(('quantity__gt', 0)), name='book_in_stock_title_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='borrowedbook',
+            index=models.Index(condition=models.Q(('returned', False)), fields=['return_date'], name='borrowedbook_outstanding_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='member',
+            index=models.Index(django.db.models.functions.text.Upper('name'), models.F('id'), name='member_name_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='transaction',
+            index=models.Index(fields=['member', 'created_at', 'id'], name='transaction_member_created_idx'),
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 5.0.1 on 2026-10-17 01:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('library', '0010_outstanding_and_history_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyRevenue',
+            fields=[
+                ('id', models.CharField(max_length=255, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('date', models.DateField()),
+                ('payment_method', models.CharField(choices=[('cash', 'Cash'), ('mpesa', 'Mpesa'), ('card', 'Card')], max_length=20)),
+                ('amount', models.DecimalField(decimal_places=2, default=0.0, max_digits=14)),
+                ('payments', models.IntegerField(default=0)),
+            ],
+            options={
+                'verbose_name_plural': 'daily revenue',
+                'abstract': False,
+                'indexes': [models.Index(fields=['created_at', 'id'], name='dailyrevenue_created_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='dailyrevenue',
+            constraint=models.UniqueConstraint(fields=('date', 'payment_method'), name='dailyrevenue_day_unique'),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.0.1 on 2026-10-17 02:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('library', '0011_dailyrevenue'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='borrowedbook',
+            index=models.Index(fields=['return_date', 'id'], name='borrowedbook_return_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='borrowedbook',
+            index=models.Index(fields=['fine', 'id'], name='borrowedbook_fine_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.0.1 on 2026-10-17 02:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('library', '0012_loans_table_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='member',
+            name='last_reminded_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 5.0.1 on 2026-10-17 03:05
+
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+def copy_book_fees(apps, schema_editor):
+    # The fee each past loan was charged isn't recorded anywhere, so it is taken to be the book's current fee.
+    Book = apps.get_model("library", "Book")
+    BorrowedBook = apps.get_model("library", "BorrowedBook")
+    BorrowedBook.objects.update(
+        borrowing_fee=Subquery(Book.objects.filter(pk=OuterRef("book_id")).values("borrowing_fee")[:1])
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('library', '0013_member_last_reminded_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='borrowedbook',
+            name='borrowing_fee',
+            field=models.DecimalField(blank=True, decimal_places=2, max_digits=10, null=True),
+        ),
+        migrations.RunPython(copy_book_fees, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='borrowedbook',
+            name='borrowing_fee',
+            field=models.DecimalField(blank=True, decimal_places=2, max_digits=10),
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 5.0.1 on 2026-10-17 02:46
+
+from django.db import migrations, models
+
+
+def create_versions(apps, schema_editor):
+    # The models of the cached list pages, so their first writes don't have to create the rows.
+    DataVersion = apps.get_model("library", "DataVersion")
+    labels = ["library.book", "library.borrowedbook", "library.member", "library.transaction"]
+    DataVersion.objects.bulk_create([DataVersion(id=label, version=1) for label in labels])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('library', '0014_borrowedbook_borrowing_fee'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DataVersion',
+            fields=[
+                ('id', models.CharField(max_length=255, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('version', models.PositiveBigIntegerField(default=0)),
+            ],
+            options={
+                'abstract': False,
+                'indexes': [models.Index(fields=['created_at', 'id'], name='dataversion_created_idx')],
+            },
+        ),
+        migrations.RunPython(create_versions, migrations.RunPython.noop),
+    ]
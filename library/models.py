@@ -1,8 +1,11 @@
+from django.contrib.postgres.search import SearchVectorField
 from django.core.validators import MaxValueValidator, MinValueValidator
-from django.db import models
+from django.db import IntegrityError, models, transaction
+from django.db.models import Count, F, Q, Sum
+from django.db.models.functions import TruncDate, Upper
 from django.utils import timezone
 
-from users.models import AbstractBaseModel
+from users.models import AbstractBaseModel, PrimaryKeyForeignKey
 
 STATUS_CHOICES = (
     ("available", "Available"),
@@ -29,24 +32,42 @@ PAYMENT_METHOD_CHOICES = (
 )
 
 
+class MemberQuerySet(models.QuerySet):
+    def with_amount_due(self):
+        """
+        Annotates each member with overdue_fines, the total fine on their overdue, unreturned books,
+        computed in the same query as the members themselves.
+        """
+        overdue = Q(borrowed_books__returned=False, borrowed_books__return_date__lt=timezone.now().date())
+        return self.annotate(overdue_fines=Sum("borrowed_books__fine", filter=overdue, default=0))
+
+
 class Member(AbstractBaseModel):
     name = models.CharField(max_length=100)
     email = models.EmailField()
     amount_due = models.DecimalField(
         max_digits=10, decimal_places=2, default=0.00, validators=[MinValueValidator(0.00), MaxValueValidator(500.00)]
     )
+    # When the member was last emailed a reminder of their overdue books, see library.reminders.
+    last_reminded_at = models.DateTimeField(null=True, blank=True)
+
+    objects = MemberQuerySet.as_manager()
+
+    class Meta(AbstractBaseModel.Meta):
+        indexes = AbstractBaseModel.Meta.indexes + [
+            # Members by name, for the member lookup of the lend form.
+            models.Index(Upper("name"), F("id"), name="member_name_idx"),
+        ]
 
     def __str__(self):
         return f"{self.name}"
 
     def calculate_amount_due(self):
-        borrowed_books = self.borrowed_books.all()
-        amount = 0
-        for book in borrowed_books:
-            if book.return_date < timezone.now().date() and not book.returned:
-                amount += book.fine
+        if hasattr(self, "overdue_fines"):
+            return self.overdue_fines
 
-        return amount
+        overdue_books = self.borrowed_books.filter(returned=False, return_date__lt=timezone.now().date())
+        return overdue_books.aggregate(amount=Sum("fine", default=0))["amount"]
 
 
 class Book(AbstractBaseModel):
@@ -58,26 +79,186 @@ class Book(AbstractBaseModel):
         max_digits=10, decimal_places=2, default=1.00, validators=[MinValueValidator(1.00)]
     )
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default="available")
+    # Full-text index of title and author, maintained by a database trigger on PostgreSQL. See library.search.
+    search_vector = SearchVectorField(null=True, editable=False)
+
+    class Meta(AbstractBaseModel.Meta):
+        indexes = AbstractBaseModel.Meta.indexes + [
+            # Books in stock by title, for the book lookup of the lend forms.
+            models.Index(Upper("title"), F("id"), condition=Q(quantity__gt=0), name="book_in_stock_title_idx"),
+        ]
 
     def __str__(self):
         return f"{self.title} by {self.author}"
 
 
 class BorrowedBook(AbstractBaseModel):
-    member = models.ForeignKey(Member, on_delete=models.CASCADE, related_name="borrowed_books")
-    book = models.ForeignKey(Book, on_delete=models.CASCADE, related_name="borrowed_books")
+    member = PrimaryKeyForeignKey(Member, on_delete=models.CASCADE, related_name="borrowed_books")
+    book = PrimaryKeyForeignKey(Book, on_delete=models.CASCADE, related_name="borrowed_books")
     return_date = models.DateField()
     returned = models.BooleanField(default=False)
     fine = models.DecimalField(max_digits=10, decimal_places=2, default=0.00, validators=[MinValueValidator(0.00)])
+    # The book's borrowing fee when it was lent, so changing the fee later doesn't restate past loans.
+    # save() copies it from the book; bulk_create() callers set it themselves.
+    borrowing_fee = models.DecimalField(max_digits=10, decimal_places=2, blank=True)
+    # Set by the accrue_fines job once the book is past its return date, and when it is returned with a fine.
+    overdue = models.BooleanField(default=False)
+
+    class Meta(AbstractBaseModel.Meta):
+        indexes = AbstractBaseModel.Meta.indexes + [
+            # Outstanding loans by return date, for the overdue books and the dashboard counters.
+            models.Index(fields=["return_date"], condition=Q(returned=False), name="borrowedbook_outstanding_idx"),
+            # Sorting of the loans table, see library.datatables.
+            models.Index(fields=["return_date", "id"], name="borrowedbook_return_date_idx"),
+            models.Index(fields=["fine", "id"], name="borrowedbook_fine_idx"),
+        ]
 
     def __str__(self):
         return f"{self.member.name} borrowed {self.book.title} on {self.created_at}"
 
+    def save(self, *args, **kwargs):
+        if self.borrowing_fee is None:
+            self.borrowing_fee = self.book.borrowing_fee
+        super().save(*args, **kwargs)
+
 
 class Transaction(AbstractBaseModel):
-    member = models.ForeignKey(Member, on_delete=models.CASCADE, related_name="transactions")
+    member = PrimaryKeyForeignKey(Member, on_delete=models.CASCADE, related_name="transactions")
     amount = models.DecimalField(max_digits=10, decimal_places=2, default=0.00, validators=[MinValueValidator(0.00)])
     payment_method = models.CharField(max_length=20, choices=PAYMENT_METHOD_CHOICES)
 
+    class Meta(AbstractBaseModel.Meta):
+        indexes = AbstractBaseModel.Meta.indexes + [
+            # Payment history of a member, newest first.
+            models.Index(fields=["member", "created_at", "id"], name="transaction_member_created_idx"),
+        ]
+
     def __str__(self):
         return f"{self.member.name} paid {self.amount} via {self.payment_method}"
+
+
+class LibraryStats(AbstractBaseModel):
+    """
+    Single-row rollup of the dashboard totals so the Dashboard reads one row instead of scanning
+    Transaction and BorrowedBook.
+    record(): Applies deltas to the counters. Called by the lend, return and payment code paths.
+    rebuild(): Recomputes the counters from the source tables with Sum/Count aggregates.
+    """
+
+    SINGLETON_ID = "librarystats"
+
+    total_amount = models.DecimalField(max_digits=14, decimal_places=2, default=0.00)
+    total_borrowed_books = models.IntegerField(default=0)
+
+    class Meta:
+        verbose_name_plural = "library stats"
+
+    def __str__(self):
+        return f"Library stats as of {self.updated_at}"
+
+    @classmethod
+    def load(cls):
+        return cls.objects.filter(pk=cls.SINGLETON_ID).first() or cls.rebuild()
+
+    @classmethod
+    def record(cls, **deltas):
+        counters = {field: F(field) + value for field, value in deltas.items() if value}
+        if not counters:
+            return
+
+        updated = cls.objects.filter(pk=cls.SINGLETON_ID).update(**counters, updated_at=timezone.now())
+        if not updated:
+            # The row is created lazily; the source tables already include this change.
+            cls.rebuild()
+
+    @classmethod
+    def rebuild(cls):
+        totals = Transaction.objects.aggregate(total_amount=Sum("amount", default=0))
+        totals.update(BorrowedBook.objects.filter(returned=False).aggregate(total_borrowed_books=Count("id")))
+
+        stats, _ = cls.objects.update_or_create(pk=cls.SINGLETON_ID, defaults=totals)
+        return stats
+
+
+class DailyRevenue(AbstractBaseModel):
+    """
+    Revenue rollup: the payments of one day made with one payment method, so revenue reports read one row per day
+    and method instead of scanning Transaction.
+    record(): Adds payments to the day's row, or removes them with negative values. Called by the payment code paths.
+    rebuild(): Recomputes every row from Transaction in one GROUP BY pass.
+    totals(): The date / payment method groups of a Transaction queryset, as rebuild() computes them.
+    """
+
+    date = models.DateField()
+    payment_method = models.CharField(max_length=20, choices=PAYMENT_METHOD_CHOICES)
+    amount = models.DecimalField(max_digits=14, decimal_places=2, default=0.00)
+    payments = models.IntegerField(default=0)
+
+    class Meta(AbstractBaseModel.Meta):
+        verbose_name_plural = "daily revenue"
+        constraints = [models.UniqueConstraint(fields=["date", "payment_method"], name="dailyrevenue_day_unique")]
+
+    def __str__(self):
+        return f"{self.payment_method} revenue on {self.date}"
+
+    @classmethod
+    def record(cls, date, payment_method, amount, payments=1):
+        if not amount and not payments:
+            return
+
+        counters = {"amount": F("amount") + amount, "payments": F("payments") + payments, "updated_at": timezone.now()}
+        day = cls.objects.filter(date=date, payment_method=payment_method)
+        if day.update(**counters):
+            return
+
+        try:
+            with transaction.atomic():
+                cls.objects.create(date=date, payment_method=payment_method, amount=amount, payments=payments)
+        except IntegrityError:
+            # Another request created the day's row first.
+            day.update(**counters)
+
+    @classmethod
+    def record_payment(cls, payment, sign=1):
+        cls.record(payment.created_at.date(), payment.payment_method, sign * payment.amount, payments=sign)
+
+    @classmethod
+    def totals(cls, payments):
+        return (
+            payments.annotate(date=TruncDate("created_at"))
+            .order_by()
+            .values("date", "payment_method")
+            .annotate(amount=Sum("amount"), payments=Count("id"))
+        )
+
+    @classmethod
+    def rebuild(cls, batch_size=1000):
+        with transaction.atomic():
+            cls.objects.all().delete()
+            rows = [cls(id=cls.generate_id(), **day) for day in cls.totals(Transaction.objects.all())]
+            cls.objects.bulk_create(rows, batch_size=batch_size)
+        return len(rows)
+
+
+class DataVersion(AbstractBaseModel):
+    """
+    Version of the rows of one model, keyed by its label, for the ETags of the list pages (see
+    library.cache.data_version). Every write to the model bumps it in the same transaction, whichever process makes
+    it, so checking whether a page changed reads one row per model by primary key, and a replica's versions match
+    the rows it has applied.
+    bump(): Increments the versions of models, creating their rows the first time.
+    """
+
+    version = models.PositiveBigIntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.id} version {self.version}"
+
+    @classmethod
+    def bump(cls, *models):
+        # Sorted, so that transactions bumping the same models lock their rows in the same order.
+        labels = sorted({model._meta.label_lower for model in models})
+        updated = cls.objects.filter(pk__in=labels).update(version=F("version") + 1, updated_at=timezone.now())
+        if updated < len(labels):
+            # The rows are created lazily; a missing row reads as no version at all, so 1 is already new.
+            cls.objects.bulk_create([cls(id=label, version=1) for label in labels], ignore_conflicts=True)
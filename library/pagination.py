@@ -0,0 +1,144 @@
+import base64
+import binascii
+import json
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+
+DEFAULT_ORDERING = ("-created_at", "-id")
+
+
+class KeysetPage:
+    """
+    A page of results returned by KeysetPaginator.
+    next_cursor / previous_cursor: Opaque tokens to pass back as the ?cursor= parameter.
+    """
+
+    def __init__(self, object_list, next_cursor=None, previous_cursor=None):
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+
+class KeysetPaginator:
+    """
+    Cursor (keyset) paginator. A page is selected with a WHERE clause on the ordering keys of the last row seen,
+    instead of an OFFSET, so fetching page 1000 costs the same as fetching page 1.
+    ordering: The ordering keys, "-" for descending. The last key must be unique so the ordering is stable.
+    per_page: Number of rows per page.
+    """
+
+    def __init__(self, queryset, per_page, ordering=DEFAULT_ORDERING):
+        self.queryset = queryset
+        self.per_page = per_page
+        self.ordering = ordering
+
+    def page(self, cursor=None):
+        position = self.decode_cursor(cursor)
+
+        if position is None:
+            rows = list(self.queryset.order_by(*self.ordering)[: self.per_page + 1])
+            has_more = len(rows) > self.per_page
+            rows = rows[: self.per_page]
+            return KeysetPage(rows, next_cursor=self.encode_cursor(rows[-1], "next") if has_more else None)
+
+        direction, values = position
+        reverse = direction == "previous"
+        try:
+            queryset = self.queryset.filter(self.seek(values, reverse=reverse))
+        except ValidationError:
+            return self.page()
+
+        if reverse:
+            rows = list(queryset.order_by(*self.reversed_ordering())[: self.per_page + 1])
+            has_more = len(rows) > self.per_page
+            rows = rows[: self.per_page][::-1]
+            next_cursor = self.encode_cursor(rows[-1], "next") if rows else None
+            previous_cursor = self.encode_cursor(rows[0], "previous") if has_more else None
+        else:
+            rows = list(queryset.order_by(*self.ordering)[: self.per_page + 1])
+            has_more = len(rows) > self.per_page
+            rows = rows[: self.per_page]
+            next_cursor = self.encode_cursor(rows[-1], "next") if has_more else None
+            previous_cursor = self.encode_cursor(rows[0], "previous") if rows else None
+
+        return KeysetPage(rows, next_cursor=next_cursor, previous_cursor=previous_cursor)
+
+    def keys(self):
+        return [key.lstrip("-") for key in self.ordering]
+
+    def reversed_ordering(self):
+        return [key[1:] if key.startswith("-") else f"-{key}" for key in self.ordering]
+
+    def seek(self, values, reverse=False):
+        """
+        Builds (k1 < v1) OR (k1 = v1 AND k2 < v2) OR ... for the ordering keys, flipping the comparison
+        for ascending keys and when paging backwards.
+        """
+        condition = Q()
+        equal = {}
+        for key, value in zip(self.ordering, values):
+            name = key.lstrip("-")
+            descending = key.startswith("-") != reverse
+            lookup = "lt" if descending else "gt"
+            condition |= Q(**equal, **{f"{name}__{lookup}": value})
+            equal[name] = value
+        return condition
+
+    def encode_cursor(self, obj, direction):
+        values = [str(getattr(obj, key)) for key in self.keys()]
+        payload = json.dumps({"d": direction, "v": values}).encode()
+        return base64.urlsafe_b64encode(payload).decode()
+
+    def decode_cursor(self, cursor):
+        if not cursor:
+            return None
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+            direction, values = payload["d"], payload["v"]
+        except (binascii.Error, ValueError, TypeError, KeyError):
+            return None
+
+        if direction not in ("next", "previous") or len(values) != len(self.ordering):
+            return None
+        return direction, values
+
+
+def paginate(request, queryset, ordering=DEFAULT_ORDERING):
+    """
+    Returns the KeysetPage of the queryset selected by the request's ?cursor= parameter.
+    Search POSTs always return the first page.
+    The page size is LIBRARY_PAGE_SIZE and can be lowered or raised up to LIBRARY_MAX_PAGE_SIZE with ?per_page=.
+    """
+    cursor = request.GET.get("cursor") if request.method == "GET" else None
+    return KeysetPaginator(queryset, page_size(request), ordering=ordering).page(cursor)
+
+
+def page_size(request):
+    """
+    LIBRARY_PAGE_SIZE, or the ?per_page= parameter of the request bounded by LIBRARY_MAX_PAGE_SIZE.
+    """
+    per_page = settings.LIBRARY_PAGE_SIZE
+    try:
+        return min(max(int(request.GET.get("per_page", per_page)), 1), settings.LIBRARY_MAX_PAGE_SIZE)
+    except ValueError:
+        return per_page
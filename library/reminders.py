@@ -0,0 +1,70 @@
+import datetime
+import logging
+from itertools import groupby
+from operator import attrgetter
+
+from django.core.mail import EmailMessage, get_connection
+from django.db.models import Q
+from django.template.loader import render_to_string
+from django.utils import timezone
+
+from .cache import invalidate
+from .models import BorrowedBook, Member
+from .streaming import chunks
+
+logger = logging.getLogger(__name__)
+
+
+def overdue_loans(today, reminded_before):
+    """
+    The unreturned loans past their return date of the members not reminded since reminded_before, ordered by
+    member so that the loans of a member are consecutive.
+    """
+    return (
+        BorrowedBook.objects.filter(returned=False, return_date__lt=today)
+        .filter(Q(member__last_reminded_at__isnull=True) | Q(member__last_reminded_at__lt=reminded_before))
+        .select_related("member", "book")
+        .only("return_date", "fine", "member__name", "member__email", "book__title")
+        .order_by("member_id", "return_date", "id")
+    )
+
+
+def reminder_message(member, loans):
+    """
+    The digest email of the overdue loans of a member.
+    """
+    context = {"member": member, "loans": loans, "total_fine": sum(loan.fine for loan in loans)}
+    return EmailMessage(
+        subject=f"Reminder: {len(loans)} overdue book(s) to return",
+        body=render_to_string("emails/overdue-reminder.txt", context),
+        to=[member.email],
+    )
+
+
+def send_overdue_reminders(now=None, interval=datetime.timedelta(days=7), batch_size=100, chunk_size=2000):
+    """
+    Emails every member with overdue books one digest of them, unless they were reminded within interval, so
+    running it again sends nothing new.
+    The overdue loans of every member are read in one query, chunk_size rows at a time, and grouped by member as
+    they come. The emails are sent batch_size at a time over one connection to the mail server, and the members
+    of each batch are marked reminded with one UPDATE once it is sent. A failure stops the run; the members of the
+    batches already sent are not emailed again on the next run.
+    Returns the number of reminders sent.
+    """
+    now = now or timezone.now()
+    loans = overdue_loans(now.date(), now - interval).iterator(chunk_size=chunk_size)
+    digests = ([*member_loans] for _member_id, member_loans in groupby(loans, key=attrgetter("member_id")))
+
+    sent = 0
+    with get_connection() as connection:
+        for batch in chunks(digests, batch_size):
+            messages = [reminder_message(member_loans[0].member, member_loans) for member_loans in batch]
+            connection.send_messages(messages)
+            members = [member_loans[0].member_id for member_loans in batch]
+            Member.objects.filter(pk__in=members).update(last_reminded_at=now, updated_at=now)
+            sent += len(batch)
+            logger.info(f"{sent} overdue reminder(s) sent.")
+
+    if sent:
+        invalidate(Member)
+    return sent
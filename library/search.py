@@ -0,0 +1,101 @@
+import re
+
+from django.contrib.postgres.lookups import TrigramSimilar
+from django.contrib.postgres.search import SearchQuery, SearchRank, TrigramSimilarity
+from django.db import connections
+from django.db.models import F, FloatField, Func, Q, Value
+from django.db.models.expressions import RawSQL
+from django.db.models.functions import Cast
+
+from .models import Book
+
+# Ordering of ranked search results: best match first, then newest first so that keyset pagination is stable.
+SEARCH_ORDERING = ("-search_rank", "-created_at", "-id")
+
+FTS_TABLE = f"{Book._meta.db_table}_fts"
+
+
+def search_terms(query):
+    return re.findall(r"\w+", query or "")
+
+
+class BookSearchBackend:
+    """
+    Fallback search backend for databases without a full-text index. Matches title or author with icontains
+    and gives every match the same rank.
+    """
+
+    def search(self, queryset, query, terms, book_path):
+        matches = Q()
+        for term in terms:
+            matches &= Q(**{f"{book_path}title__icontains": term}) | Q(**{f"{book_path}author__icontains": term})
+        return queryset.filter(matches).annotate(search_rank=Value(0.0, output_field=FloatField()))
+
+
+class PostgresBookSearchBackend(BookSearchBackend):
+    """
+    PostgreSQL search backend.
+    Prefix full-text match on Book.search_vector (maintained by a trigger, GIN indexed) or trigram similarity on
+    title/author (pg_trgm GIN indexes). Ranked by ts_rank plus the trigram similarity of title and author.
+    """
+
+    def search(self, queryset, query, terms, book_path):
+        title, author, vector = (f"{book_path}{field}" for field in ("title", "author", "search_vector"))
+        search_query = SearchQuery(" & ".join(f"{term}:*" for term in terms), config="simple", search_type="raw")
+
+        matches = (
+            Q(**{vector: search_query})
+            | Q(TrigramSimilar(F(title), Value(query)))
+            | Q(TrigramSimilar(F(author), Value(query)))
+        )
+        rank = SearchRank(F(vector), search_query) + TrigramSimilarity(title, query) + TrigramSimilarity(author, query)
+
+        # ts_rank() and similarity() return real; cast to double precision so the rank survives the round trip
+        # through a pagination cursor unchanged.
+        return queryset.filter(matches).annotate(search_rank=Cast(rank, FloatField()))
+
+
+class FTS5Rank(Func):
+    """
+    bm25() rank of a book in the SQLite FTS5 index, negated so that higher is better.
+    Takes the MATCH expression and the book primary key.
+    """
+
+    template = f"(SELECT -bm25({FTS_TABLE}) FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %(expressions)s)"
+    arg_joiner = f" AND {FTS_TABLE}.book_id = "
+    output_field = FloatField()
+
+
+class SQLiteBookSearchBackend(BookSearchBackend):
+    """
+    SQLite search backend for local development and tests.
+    Prefix match against the FTS5 table library_book_fts (maintained by triggers on library_book), ranked by bm25().
+    """
+
+    def search(self, queryset, query, terms, book_path):
+        match = " ".join(f'"{term}"*' for term in terms)
+        matched_books = RawSQL(f"SELECT book_id FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s", (match,))
+
+        return queryset.filter(**{f"{book_path}pk__in": matched_books}).annotate(
+            search_rank=FTS5Rank(Value(match), F(f"{book_path}pk"))
+        )
+
+
+BACKENDS = {
+    "postgresql": PostgresBookSearchBackend,
+    "sqlite": SQLiteBookSearchBackend,
+}
+
+
+def search_books(queryset, query, book_path=""):
+    """
+    Filters a queryset of books, or of rows related to a book, to those whose book title or author matches query.
+    Matching rows are annotated with search_rank (higher is better); order them with SEARCH_ORDERING.
+    book_path: Lookup path from the queryset's model to Book, e.g. "book__" for BorrowedBook.
+    """
+    terms = search_terms(query)
+    if not terms:
+        return queryset.annotate(search_rank=Value(0.0, output_field=FloatField()))
+
+    backend = BACKENDS.get(connections[queryset.db].vendor, BookSearchBackend)()
+    return backend.search(queryset, query, terms, book_path)
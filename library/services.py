@@ -0,0 +1,207 @@
+import logging
+from collections import Counter
+
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.db.models import Case, DecimalField, F, OuterRef, Subquery, Sum, Value, When
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+
+from .cache import invalidate
+from .models import Book, BorrowedBook, DailyRevenue, LibraryStats, Member, Transaction
+
+logger = logging.getLogger(__name__)
+
+
+def lend_books(member, book_ids, return_date, fine, payment_method):
+    """
+    Lends several books to a member and records the borrowing fee payment.
+    Everything runs in one transaction with a constant number of queries regardless of the number of books:
+        - the books are fetched and locked in one select_for_update() query, so concurrent checkouts
+          cannot oversell the stock.
+        - the stock is decremented with F() expressions.
+        - the BorrowedBook objects are inserted with bulk_create().
+    Raises ValidationError if a book does not exist or does not have enough copies left.
+    Returns the created BorrowedBook objects.
+    """
+    requested = Counter(book_ids)
+
+    with transaction.atomic():
+        books = Book.objects.select_for_update().in_bulk(list(requested))
+
+        if len(books) != len(requested):
+            raise ValidationError(_("One or more of the selected books do not exist."))
+
+        unavailable = [str(books[pk]) for pk, count in requested.items() if books[pk].quantity < count]
+        if unavailable:
+            raise ValidationError(
+                _("Not enough copies available: %(books)s."), params={"books": ", ".join(unavailable)}
+            )
+
+        # One UPDATE per distinct number of copies requested, which is usually one UPDATE in total.
+        # The status Case() sees the quantity from before the decrement.
+        for count in set(requested.values()):
+            Book.objects.filter(pk__in=[pk for pk, copies in requested.items() if copies == count]).update(
+                quantity=F("quantity") - count,
+                status=Case(When(quantity__gt=count, then=Value("available")), default=Value("not-available")),
+                updated_at=timezone.now(),
+            )
+        logger.info("Book Quantity updated successfully.")
+
+        borrowed_books = BorrowedBook.objects.bulk_create(
+            [
+                BorrowedBook(
+                    id=BorrowedBook.generate_id(),
+                    member=member,
+                    book=books[pk],
+                    borrowing_fee=books[pk].borrowing_fee,
+                    return_date=return_date,
+                    fine=fine,
+                )
+                for pk, count in requested.items()
+                for _copy in range(count)
+            ]
+        )
+        logger.info(f"{len(borrowed_books)} book(s) lent successfully.")
+        invalidate(Book, BorrowedBook)
+
+        amount = sum(books[pk].borrowing_fee * count for pk, count in requested.items())
+        payment = Transaction.objects.create(member=member, amount=amount, payment_method=payment_method)
+        logger.info("Payment made successfully.")
+
+        DailyRevenue.record_payment(payment)
+
+        LibraryStats.record(total_amount=amount, total_borrowed_books=len(borrowed_books))
+
+    return borrowed_books
+
+
+def return_books(loan_ids, payment_method=None, today=None):
+    """
+    Returns several loans at once, e.g. a bin of books scanned at the returns desk.
+    Everything runs in one transaction with a constant number of queries regardless of the number of loans:
+        - the loans are fetched and locked in one select_for_update() query. Loans already returned are skipped.
+        - the loans are marked returned with one UPDATE, and overdue ones also flagged overdue with a second one.
+        - the stock is incremented with F() expressions, one UPDATE per distinct number of copies returned.
+        - the fines of the overdue loans are paid with one combined payment per member, inserted with bulk_create().
+    Raises ValidationError if a loan does not exist, or if fines are due and no payment method is given.
+    Returns the returned BorrowedBook objects and the fine payments.
+    """
+    today = today or timezone.now().date()
+    requested = set(loan_ids)
+
+    with transaction.atomic():
+        loans = BorrowedBook.objects.select_for_update().in_bulk(list(requested))
+
+        missing = requested - set(loans)
+        if missing:
+            raise ValidationError(
+                _("Unknown loan(s): %(loans)s."), params={"loans": ", ".join(sorted(str(pk) for pk in missing))}
+            )
+
+        loans = [loan for loan in loans.values() if not loan.returned]
+        overdue = [loan for loan in loans if loan.return_date < today]
+        fines = Counter()
+        for loan in overdue:
+            fines[loan.member_id] += loan.fine
+        fines = {member_id: amount for member_id, amount in fines.items() if amount}
+
+        if fines and not payment_method:
+            raise ValidationError(_("Select a payment method for the fines of the overdue books."))
+
+        if not loans:
+            return [], []
+
+        BorrowedBook.objects.filter(pk__in=[loan.pk for loan in loans]).update(returned=True, updated_at=timezone.now())
+        if overdue:
+            BorrowedBook.objects.filter(pk__in=[loan.pk for loan in overdue]).update(overdue=True)
+        logger.info(f"{len(loans)} book(s) returned successfully.")
+
+        copies = Counter(loan.book_id for loan in loans)
+        for count in set(copies.values()):
+            Book.objects.filter(pk__in=[pk for pk, returned in copies.items() if returned == count]).update(
+                quantity=F("quantity") + count, status="available", updated_at=timezone.now()
+            )
+        logger.info("Book Quantity updated successfully.")
+
+        payments = Transaction.objects.bulk_create(
+            [
+                Transaction(
+                    id=Transaction.generate_id(), member_id=member_id, amount=amount, payment_method=payment_method
+                )
+                for member_id, amount in fines.items()
+            ]
+        )
+        total = sum(fines.values())
+        if payments:
+            logger.info(f"{len(payments)} fine payment(s) made successfully.")
+            DailyRevenue.record(payments[0].created_at.date(), payment_method, total, payments=len(payments))
+            refresh_amount_due(Member.objects.filter(pk__in=list(fines)))
+
+        LibraryStats.record(total_amount=total, total_borrowed_books=-len(loans))
+        invalidate(Book, BorrowedBook, Transaction)
+
+    return loans, payments
+
+
+def mark_overdue_loans(today=None, chunk_size=1000):
+    """
+    Marks unreturned loans past their return date as overdue, chunk_size rows per UPDATE, so that a million
+    loans are processed in bounded memory without long-running transactions.
+    Returns the number of loans marked.
+    """
+    today = today or timezone.now().date()
+    pending = BorrowedBook.objects.filter(returned=False, overdue=False, return_date__lt=today)
+
+    marked = 0
+    while True:
+        chunk = list(pending.order_by("pk").values_list("pk", flat=True)[:chunk_size])
+        if not chunk:
+            break
+
+        marked += BorrowedBook.objects.filter(pk__in=chunk).update(overdue=True, updated_at=timezone.now())
+
+    if marked:
+        invalidate(BorrowedBook)
+    return marked
+
+
+def refresh_amount_due(members):
+    """
+    Sets Member.amount_due of the members to the total fine on their overdue, unreturned books with one UPDATE.
+    """
+    fines = (
+        BorrowedBook.objects.filter(member=OuterRef("pk"), returned=False, overdue=True)
+        .order_by()
+        .values("member")
+        .annotate(total=Sum("fine"))
+        .values("total")
+    )
+    amount_due = Coalesce(Subquery(fines), Value(0), output_field=DecimalField(max_digits=10, decimal_places=2))
+    refreshed = members.update(amount_due=amount_due, updated_at=timezone.now())
+    invalidate(Member)
+    return refreshed
+
+
+def accrue_fines(today=None, chunk_size=1000):
+    """
+    Marks overdue loans and refreshes Member.amount_due of every member, chunk_size members per UPDATE.
+    Returns the number of loans marked overdue and the number of members refreshed.
+    """
+    marked = mark_overdue_loans(today=today, chunk_size=chunk_size)
+    logger.info(f"{marked} loan(s) marked overdue.")
+
+    refreshed = 0
+    last_pk = None
+    while True:
+        members = Member.objects.filter(pk__gt=last_pk) if last_pk is not None else Member.objects.all()
+        chunk = list(members.order_by("pk").values_list("pk", flat=True)[:chunk_size])
+        if not chunk:
+            break
+
+        refreshed += refresh_amount_due(Member.objects.filter(pk__in=chunk))
+        last_pk = chunk[-1]
+    logger.info(f"Amount due refreshed for {refreshed} member(s).")
+
+    return marked, refreshed
@@ -1,7 +1,11 @@
-from django.db.models.signals import pre_save
+from django.db.models.signals import post_delete, post_save, pre_save
 from django.dispatch import receiver
 
-from library.models import BorrowedBook
+from library.cache import bump_version
+from library.models import Book, BorrowedBook, Member, Transaction
+
+# Models whose rows appear on the cached list pages.
+CACHED_MODELS = (Book, BorrowedBook, Member, Transaction)
 
 
 @receiver(pre_save, sender=BorrowedBook)
@@ -10,3 +14,12 @@ def update_book_quantity_on_borrowing(sender, instance, **kwargs):
         instance.book.status = "available"
     else:
         instance.book.status = "not-available"
+
+
+def invalidate_list_cache(sender, **kwargs):
+    bump_version(sender)
+
+
+for model in CACHED_MODELS:
+    post_save.connect(invalidate_list_cache, sender=model, dispatch_uid=f"invalidate_{model._meta.model_name}_cache")
+    post_delete.connect(invalidate_list_cache, sender=model, dispatch_uid=f"invalidate_{model._meta.model_name}_cache")
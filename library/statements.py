@@ -0,0 +1,126 @@
+from collections import namedtuple
+from datetime import datetime
+from decimal import Decimal
+
+from django.db import connections
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from .models import Book, BorrowedBook, Transaction
+from .pagination import KeysetPage, KeysetPaginator
+
+# Newest entry first. kind breaks the tie between the loan and the fine of the same BorrowedBook.
+STATEMENT_ORDERING = ("-entry_at", "-kind", "-id")
+
+StatementEntry = namedtuple("StatementEntry", ["entry_at", "kind", "id", "description", "charge", "credit", "balance"])
+
+# The fine of an overdue book is charged at the start of the day after its return date.
+FINE_DATE = {
+    "postgresql": "CAST(b.return_date + 1 AS timestamp)",
+    "sqlite": "datetime(b.return_date, '+1 day')",
+}
+
+STATEMENT_SQL = """
+SELECT entry_at, kind, id, description, charge, credit, balance FROM (
+    SELECT entries.*, SUM(charge - credit) OVER (
+        ORDER BY entry_at, kind, id ROWS BETWEEN UNBOUNDED PRECEDING AND CURRENT ROW
+    ) AS balance
+    FROM (
+        SELECT b.created_at AS entry_at, 'loan' AS kind, b.id AS id, bk.title AS description,
+               b.borrowing_fee AS charge, 0 AS credit
+        FROM {borrowed_book} b INNER JOIN {book} bk ON bk.id = b.book_id
+        WHERE b.member_id = %(member)s
+        UNION ALL
+        SELECT {fine_date}, 'loan-fine', b.id, bk.title, b.fine, 0
+        FROM {borrowed_book} b INNER JOIN {book} bk ON bk.id = b.book_id
+        WHERE b.member_id = %(member)s AND b.fine > 0 AND (b.overdue OR (NOT b.returned AND b.return_date < %(today)s))
+        UNION ALL
+        SELECT t.created_at, 'payment', t.id, t.payment_method, 0, t.amount
+        FROM {transaction} t
+        WHERE t.member_id = %(member)s
+    ) entries
+) ledger
+{where}
+ORDER BY entry_at {direction}, kind {direction}, id {direction}
+LIMIT %(limit)s
+"""
+
+CENTS = Decimal("0.01")
+
+
+def to_decimal(value):
+    return Decimal(str(value)).quantize(CENTS)
+
+
+def to_datetime(value):
+    return value if isinstance(value, datetime) else parse_datetime(value)
+
+
+class MemberStatement(KeysetPaginator):
+    """
+    Account statement of a member: the borrowing fee charged for each loan, the fine of each overdue loan and each
+    payment, merged into one ledger with a UNION ALL query. The running balance (charges minus payments, oldest
+    first) is computed by the database with a window function, so a page costs one query whatever its position.
+    Paginated by cursor on STATEMENT_ORDERING, newest entry first.
+    """
+
+    def __init__(self, member, per_page, today=None, using="default"):
+        super().__init__(None, per_page, ordering=STATEMENT_ORDERING)
+        self.member = member
+        self.today = today or timezone.now().date()
+        self.connection = connections[using]
+
+    def page(self, cursor=None):
+        position = self.decode_cursor(cursor)
+        values = None
+        reverse = False
+        if position is not None:
+            direction, values = position
+            reverse = direction == "previous"
+            values[0] = parse_datetime(values[0])
+            if values[0] is None:
+                return self.page()
+
+        rows = self.fetch(values, reverse)
+        has_more = len(rows) > self.per_page
+        rows = rows[: self.per_page]
+
+        if reverse:
+            rows = rows[::-1]
+            next_cursor = self.encode_cursor(rows[-1], "next") if rows else None
+            previous_cursor = self.encode_cursor(rows[0], "previous") if has_more else None
+        else:
+            next_cursor = self.encode_cursor(rows[-1], "next") if has_more else None
+            previous_cursor = self.encode_cursor(rows[0], "previous") if rows and values is not None else None
+
+        return KeysetPage(rows, next_cursor=next_cursor, previous_cursor=previous_cursor)
+
+    def fetch(self, values, reverse):
+        params = {"member": self.member.pk, "today": self.today, "limit": self.per_page + 1}
+        where = ""
+        if values is not None:
+            where = f"WHERE (entry_at, kind, id) {'>' if reverse else '<'} (%(entry_at)s, %(kind)s, %(id)s)"
+            params.update(entry_at=values[0], kind=values[1], id=values[2])
+
+        sql = STATEMENT_SQL.format(
+            borrowed_book=BorrowedBook._meta.db_table,
+            book=Book._meta.db_table,
+            transaction=Transaction._meta.db_table,
+            fine_date=FINE_DATE[self.connection.vendor],
+            where=where,
+            direction="ASC" if reverse else "DESC",
+        )
+        with self.connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            return [
+                StatementEntry(
+                    entry_at=to_datetime(entry_at),
+                    kind=kind,
+                    id=BorrowedBook._meta.pk.from_db_value(id, None, self.connection),
+                    description=description,
+                    charge=to_decimal(charge),
+                    credit=to_decimal(credit),
+                    balance=to_decimal(balance),
+                )
+                for entry_at, kind, id, description, charge, credit, balance in cursor.fetchall()
+            ]
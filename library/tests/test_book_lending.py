@@ -1,7 +1,13 @@
+from unittest import mock
+
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
+from django.utils import timezone
 
-from library.models import Book, BorrowedBook, Member
+from library.models import Book, BorrowedBook, DailyRevenue, LibraryStats, Member, Transaction
+from library.views import MemberLookupView
 from users.models import Librarian
 
 
@@ -52,6 +58,65 @@ class TestLendBookView(TestCase):
         self.assertEqual(self.book.quantity, 9)
 
 
+class TestLendSeveralBooks(TestCase):
+    def setUp(self):
+        self.user = Librarian.objects.create_user(email="test@gmail.com", password="password")
+        self.member = Member.objects.create(name="John Doe", email="member@gmail.com")
+        self.books = [
+            Book.objects.create(
+                title=f"Test Title {index}",
+                author="Test Author",
+                category="fiction",
+                quantity=1 if index == 0 else 5,
+                borrowing_fee=2.00,
+                status="available",
+            )
+            for index in range(10)
+        ]
+
+    def lend(self, books):
+        data = {
+            "book": [book.pk for book in books],
+            "return_date": "2099-12-12",
+            "fine": 0.00,
+            "payment_method": "cash",
+        }
+        return self.client.post(reverse("lend-member-book", kwargs={"pk": self.member.pk}), data)
+
+    def test_lend_several_books_in_one_payment(self):
+        self.client.force_login(self.user)
+        self.lend(self.books)
+
+        self.assertEqual(BorrowedBook.objects.count(), 10)
+        self.assertEqual(Transaction.objects.get().amount, 20)
+        self.books[0].refresh_from_db()
+        self.books[1].refresh_from_db()
+        self.assertEqual((self.books[0].quantity, self.books[0].status), (0, "not-available"))
+        self.assertEqual((self.books[1].quantity, self.books[1].status), (4, "available"))
+
+    def test_query_count_does_not_grow_with_books(self):
+        LibraryStats.rebuild()
+        DailyRevenue.objects.create(date=timezone.now().date(), payment_method="cash")
+        self.client.force_login(self.user)
+        with CaptureQueriesContext(connection) as one_book:
+            self.lend(self.books[1:2])
+        with CaptureQueriesContext(connection) as nine_books:
+            self.lend(self.books[1:])
+
+        self.assertEqual(len(one_book), len(nine_books))
+
+    def test_out_of_stock_book_is_not_lent(self):
+        self.client.force_login(self.user)
+        self.lend(self.books[:1])
+        response = self.lend(self.books[:2])
+
+        self.assertIn("book", response.context["form"].errors)
+        self.assertEqual(BorrowedBook.objects.count(), 1)
+        self.assertEqual(Transaction.objects.count(), 1)
+        self.books[1].refresh_from_db()
+        self.assertEqual(self.books[1].quantity, 5)
+
+
 class TestLendIndividualMemberView(TestCase):
     def setUp(self):
         self.user = Librarian.objects.create_user(email="test@gmail.com", password="password")
@@ -192,3 +257,47 @@ class TestDeleteLentBookView(TestCase):
         self.book.refresh_from_db()
         self.assertEqual(BorrowedBook.objects.count(), 0)
         self.assertEqual(self.book.quantity, 11)
+
+
+class TestLookupViews(TestCase):
+    def setUp(self):
+        self.user = Librarian.objects.create_user(email="test@gmail.com", password="password")
+        self.member = Member.objects.create(name="John Doe", email="member@gmail.com")
+        Member.objects.create(name="Jane Roe", email="jane@gmail.com")
+        self.book = Book.objects.create(
+            title="Harry Potter", author="J. K. Rowling", category="fiction", quantity=1, status="available"
+        )
+        Book.objects.create(title="Hamlet", author="Shakespeare", category="drama", quantity=0, status="not-available")
+        Book.objects.create(title="The Hobbit", author="Tolkien", category="fiction", quantity=2, status="available")
+
+    def test_login_required(self):
+        response = self.client.get(reverse("book-lookup"), {"term": "ha"})
+
+        self.assertRedirects(response, f"{reverse('login')}?next={reverse('book-lookup')}%3Fterm%3Dha")
+
+    def test_book_lookup_returns_books_in_stock_by_prefix(self):
+        self.client.force_login(self.user)
+        response = self.client.get(reverse("book-lookup"), {"term": "ha"})
+
+        self.assertEqual(
+            response.json(),
+            {"results": [{"id": self.book.pk, "text": "Harry Potter by J. K. Rowling"}], "pagination": {"more": False}},
+        )
+
+    def test_member_lookup_is_paginated(self):
+        self.client.force_login(self.user)
+        with mock.patch.object(MemberLookupView, "page_size", 1):
+            first = self.client.get(reverse("member-lookup"), {"term": "j", "page": 1}).json()
+            second = self.client.get(reverse("member-lookup"), {"term": "j", "page": 2}).json()
+
+        self.assertEqual([result["text"] for result in first["results"]], ["Jane Roe"])
+        self.assertTrue(first["pagination"]["more"])
+        self.assertEqual([result["text"] for result in second["results"]], ["John Doe"])
+        self.assertFalse(second["pagination"]["more"])
+
+    def test_lend_form_renders_only_selected_options(self):
+        self.client.force_login(self.user)
+        response = self.client.get(reverse("lend-book"))
+
+        self.assertNotContains(response, "Harry Potter")
+        self.assertContains(response, f'data-ajax--url="{reverse("book-lookup")}"')
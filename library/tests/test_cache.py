@@ -0,0 +1,157 @@
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from library.cache import bump_version, data_version, get_versions
+from library.models import Book, BorrowedBook, DataVersion, Member, Transaction
+from library.services import lend_books
+from users.models import Librarian
+
+
+class TestListPageCache(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = Librarian.objects.create_user(email="test@gmail.com", password="password")
+        self.client.force_login(self.user)
+        self.member = Member.objects.create(name="John Doe", email="member@gmail.com")
+        self.book = Book.objects.create(title="Test Title", author="Test Author", category="fiction", quantity=10)
+
+    def count_queries(self, url):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return len(context.captured_queries)
+
+    def test_second_request_is_served_from_the_cache(self):
+        url = reverse("books")
+        first = self.count_queries(url)
+        second = self.count_queries(url)
+
+        self.assertLess(second, first)
+
+    def test_saving_a_book_invalidates_the_books_page(self):
+        self.client.get(reverse("books"))
+        Book.objects.create(title="New Title", author="New Author", category="fiction", quantity=1)
+
+        response = self.client.get(reverse("books"))
+
+        self.assertContains(response, "New Title")
+
+    def test_deleting_a_book_invalidates_the_books_page(self):
+        self.client.get(reverse("books"))
+        self.client.get(reverse("delete-book", kwargs={"pk": self.book.pk}))
+
+        response = self.client.get(reverse("books"))
+
+        self.assertNotContains(response, "Test Title")
+
+    def test_writes_only_invalidate_the_affected_model(self):
+        book_version, member_version, transaction_version = get_versions((Book, Member, Transaction))
+        Transaction.objects.create(member=self.member, amount=10, payment_method="cash")
+
+        self.assertEqual(get_versions((Book, Member)), [book_version, member_version])
+        self.assertNotEqual(get_versions((Transaction,)), [transaction_version])
+
+    def test_lending_invalidates_books_and_lent_books(self):
+        book_version, borrowed_version = get_versions((Book, BorrowedBook))
+        lend_books(self.member, [self.book.pk], "2099-12-12", 10, "cash")
+
+        new_book_version, new_borrowed_version = get_versions((Book, BorrowedBook))
+        self.assertNotEqual(new_book_version, book_version)
+        self.assertNotEqual(new_borrowed_version, borrowed_version)
+
+
+class TestConditionalListPages(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = Librarian.objects.create_user(email="test@gmail.com", password="password")
+        self.client.force_login(self.user)
+        self.book = Book.objects.create(title="Test Title", author="Test Author", category="fiction", quantity=10)
+
+    def revalidate(self, url, etag, **params):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url, params, HTTP_IF_NONE_MATCH=etag)
+        return response, context.captured_queries
+
+    def test_unchanged_page_is_not_modified(self):
+        url = reverse("books")
+        etag = self.client.get(url)["ETag"]
+        response, queries = self.revalidate(url, etag)
+
+        self.assertEqual(response.status_code, 304)
+        # Only the validator is read: the DataVersion row of the books.
+        library_queries = [query["sql"] for query in queries if "library_" in query["sql"]]
+        self.assertEqual(len(library_queries), 1)
+        self.assertIn(DataVersion._meta.db_table, library_queries[0])
+        self.assertIn("no-cache", response["Cache-Control"])
+
+    def test_write_changes_the_etag(self):
+        url = reverse("books")
+        etag = self.client.get(url)["ETag"]
+        Book.objects.filter(pk=self.book.pk).update(title="New Title")
+        bump_version(Book)
+        response, _queries = self.revalidate(url, etag)
+
+        self.assertContains(response, "New Title")
+
+    def test_write_from_another_process_changes_the_etag(self):
+        url = reverse("books")
+        etag = self.client.get(url)["ETag"]
+        # Like the cron jobs: the write bumps the DataVersion but can't bump this process's cache versions.
+        Book.objects.filter(pk=self.book.pk).update(title="New Title", updated_at=timezone.now())
+        DataVersion.bump(Book)
+        response, _queries = self.revalidate(url, etag)
+
+        self.assertContains(response, "New Title")
+
+    def test_deleting_a_row_changes_the_etag(self):
+        Book.objects.create(title="Other Title", author="Other Author", category="fiction", quantity=1)
+        url = reverse("books")
+        etag = self.client.get(url)["ETag"]
+        # Deleted from another process, which bumps the DataVersion but can't bump this process's cache versions.
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {Book._meta.db_table} WHERE id = %s", [self.book.pk])
+        DataVersion.bump(Book)
+        response, _queries = self.revalidate(url, etag)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertNotContains(response, "Test Title")
+
+    def test_etag_depends_on_the_query_and_the_librarian(self):
+        url = reverse("books")
+        etag = self.client.get(url)["ETag"]
+        searched, _queries = self.revalidate(url, etag, query="Test")
+        self.client.force_login(Librarian.objects.create_user(email="other@gmail.com", password="password"))
+        other_librarian, _queries = self.revalidate(url, etag)
+
+        self.assertEqual(searched.status_code, 200)
+        self.assertEqual(other_librarian.status_code, 200)
+
+
+class TestDataVersion(TestCase):
+    def test_writes_bump_the_version_of_their_model(self):
+        versions = dict(data_version((Book, Member)))
+        Book.objects.create(title="Test Title", author="Test Author", category="fiction", quantity=10)
+
+        new_versions = dict(data_version((Book, Member)))
+        self.assertEqual(new_versions["library.book"], versions["library.book"] + 1)
+        self.assertEqual(new_versions["library.member"], versions["library.member"])
+
+    def test_rolled_back_writes_keep_the_version(self):
+        versions = data_version((Book,))
+        with self.assertRaises(ValueError), transaction.atomic():
+            Book.objects.create(title="Test Title", author="Test Author", category="fiction", quantity=10)
+            raise ValueError
+
+        self.assertEqual(data_version((Book,)), versions)
+
+    def test_missing_rows_are_created(self):
+        DataVersion.objects.filter(pk="library.book").delete()
+        self.assertEqual(data_version((Book,)), [])
+
+        DataVersion.bump(Book)
+
+        self.assertEqual(data_version((Book,)), [("library.book", 1)])
@@ -0,0 +1,95 @@
+from decimal import Decimal
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+
+from library.models import Book, BorrowedBook, LibraryStats, Member, Transaction
+from users.models import Librarian
+
+
+class TestHomeView(TestCase):
+    def setUp(self):
+        self.user = Librarian.objects.create_user(email="test@gmail.com", password="password")
+        self.member = Member.objects.create(name="John Doe", email="member@gmail.com")
+        self.book = Book.objects.create(
+            title="Test Title",
+            author="Test Author",
+            category="fiction",
+            quantity=10,
+            borrowing_fee=1.00,
+            status="available",
+        )
+        BorrowedBook.objects.create(member=self.member, book=self.book, return_date="2021-12-12", fine=5.00)
+        BorrowedBook.objects.create(member=self.member, book=self.book, return_date="2099-12-12", fine=3.00)
+        Transaction.objects.create(member=self.member, amount=2.00, payment_method="cash")
+        Transaction.objects.create(member=self.member, amount=4.50, payment_method="mpesa")
+
+    def test_login_required(self):
+        response = self.client.get(reverse("home"))
+
+        self.assertRedirects(response, f"{reverse('login')}?next={reverse('home')}")
+
+    def test_dashboard_totals(self):
+        self.client.force_login(self.user)
+        response = self.client.get(reverse("home"))
+
+        self.assertEqual(response.context["total_borrowed_books"], 2)
+        self.assertEqual(response.context["total_overdue_books"], 1)
+        self.assertEqual(response.context["total_amount"], Decimal("6.50"))
+        self.assertEqual(response.context["overdue_amount"], Decimal("5.00"))
+
+
+class TestLibraryStats(TestCase):
+    def setUp(self):
+        self.user = Librarian.objects.create_user(email="test@gmail.com", password="password")
+        self.member = Member.objects.create(name="John Doe", email="member@gmail.com")
+        self.book = Book.objects.create(
+            title="Test Title",
+            author="Test Author",
+            category="fiction",
+            quantity=10,
+            borrowing_fee=2.00,
+            status="available",
+        )
+        self.data = {
+            "book": self.book.pk,
+            "member": self.member.pk,
+            "return_date": "2099-12-12",
+            "fine": 0.00,
+            "payment_method": "cash",
+        }
+
+    def test_lending_updates_stats(self):
+        LibraryStats.rebuild()
+        self.client.force_login(self.user)
+        self.client.post(reverse("lend-book"), self.data)
+
+        stats = LibraryStats.load()
+        self.assertEqual(stats.total_amount, Decimal("2.00"))
+        self.assertEqual(stats.total_borrowed_books, 1)
+
+    def test_returning_and_deleting_payment_updates_stats(self):
+        self.client.force_login(self.user)
+        self.client.post(reverse("lend-book"), self.data)
+        borrowed_book = BorrowedBook.objects.get()
+        payment = Transaction.objects.get()
+
+        self.client.get(reverse("return-book", kwargs={"pk": borrowed_book.pk}))
+        self.client.get(reverse("delete-payment", kwargs={"pk": payment.pk}))
+
+        stats = LibraryStats.load()
+        self.assertEqual(stats.total_amount, Decimal("0.00"))
+        self.assertEqual(stats.total_borrowed_books, 0)
+
+    def test_rebuild_command_recomputes_stats(self):
+        LibraryStats.rebuild()
+        BorrowedBook.objects.create(member=self.member, book=self.book, return_date="2099-12-12")
+        Transaction.objects.create(member=self.member, amount=7.00, payment_method="card")
+
+        call_command("rebuild_library_stats", stdout=StringIO())
+
+        stats = LibraryStats.load()
+        self.assertEqual(stats.total_amount, Decimal("7.00"))
+        self.assertEqual(stats.total_borrowed_books, 1)
@@ -0,0 +1,87 @@
+import csv
+import json
+from io import StringIO
+
+from django.core.management import CommandError, call_command
+from django.test import TestCase
+from django.urls import reverse
+
+from library.models import Book, BorrowedBook, Member, Transaction
+from users.models import Librarian
+
+
+class TestExport(TestCase):
+    def setUp(self):
+        self.user = Librarian.objects.create_user(email="test@gmail.com", password="password")
+        self.member = Member.objects.create(name="John Doe", email="member@gmail.com")
+        self.member2 = Member.objects.create(name="Jane Doe", email="jane@gmail.com")
+        self.book = Book.objects.create(title="Test Title", author="Test Author", category="fiction", quantity=10)
+        Transaction.objects.create(member=self.member, amount=10.00, payment_method="cash")
+        Transaction.objects.create(member=self.member, amount=20.00, payment_method="mpesa")
+        Transaction.objects.create(member=self.member2, amount=30.00, payment_method="cash")
+        Transaction.objects.filter(amount=30.00).update(created_at="2020-01-15 10:00:00")
+        BorrowedBook.objects.create(member=self.member, book=self.book, return_date="2099-12-12", fine=5.00)
+
+    def export(self, kind, **params):
+        self.client.force_login(self.user)
+        response = self.client.get(reverse("export", kwargs={"kind": kind}), params)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        return b"".join(response.streaming_content).decode()
+
+    def test_payments_csv(self):
+        rows = list(csv.DictReader(StringIO(self.export("payments"))))
+
+        self.assertEqual([row["amount"] for row in rows], ["30.00", "10.00", "20.00"])
+        self.assertEqual(rows[1]["member__name"], "John Doe")
+
+    def test_payments_filters(self):
+        by_method = list(csv.DictReader(StringIO(self.export("payments", payment_method="cash"))))
+        by_member = list(csv.DictReader(StringIO(self.export("payments", member=self.member.pk))))
+        by_date = list(csv.DictReader(StringIO(self.export("payments", start="2020-01-01", end="2020-01-15"))))
+
+        self.assertEqual([row["amount"] for row in by_method], ["30.00", "10.00"])
+        self.assertEqual([row["amount"] for row in by_member], ["10.00", "20.00"])
+        self.assertEqual([row["amount"] for row in by_date], ["30.00"])
+
+    def test_loans_jsonl(self):
+        lines = self.export("loans", format="jsonl").splitlines()
+
+        self.assertEqual(len(lines), 1)
+        loan = json.loads(lines[0])
+        self.assertEqual(loan["book__title"], "Test Title")
+        self.assertEqual(loan["fine"], "5.00")
+
+    def test_members_member_filter(self):
+        rows = list(csv.DictReader(StringIO(self.export("members", member=self.member2.pk))))
+
+        self.assertEqual([row["id"] for row in rows], [self.member2.pk])
+
+        stdout = StringIO()
+        call_command("export_data", "members", "--member", self.member.pk, stdout=stdout)
+        self.assertEqual([row["name"] for row in csv.DictReader(StringIO(stdout.getvalue()))], ["John Doe"])
+
+    def test_invalid_filters_and_kinds(self):
+        self.client.force_login(self.user)
+
+        response = self.client.get(reverse("export", kwargs={"kind": "payments"}), {"start": "not-a-date"})
+        self.assertEqual(response.status_code, 400)
+
+        response = self.client.get(reverse("export", kwargs={"kind": "librarians"}))
+        self.assertEqual(response.status_code, 404)
+
+    def test_login_required(self):
+        response = self.client.get(reverse("export", kwargs={"kind": "members"}))
+
+        self.assertEqual(response.status_code, 302)
+
+    def test_command(self):
+        stdout = StringIO()
+        call_command("export_data", "members", "--chunk-size", "1", stdout=stdout)
+
+        rows = list(csv.DictReader(StringIO(stdout.getvalue())))
+        self.assertEqual([row["name"] for row in rows], ["John Doe", "Jane Doe"])
+
+    def test_command_rejects_unknown_payment_methods(self):
+        with self.assertRaisesMessage(CommandError, "invalid choice: 'cheque'"):
+            call_command("export_data", "payments", "--payment-method", "cheque", stdout=StringIO())
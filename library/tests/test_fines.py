@@ -0,0 +1,64 @@
+from decimal import Decimal
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+
+from library.models import Book, BorrowedBook, Member
+from users.models import Librarian
+
+
+class TestAccrueFinesCommand(TestCase):
+    def setUp(self):
+        self.member = Member.objects.create(name="John Doe", email="member@gmail.com")
+        self.member2 = Member.objects.create(name="Jane Doe", email="jane@gmail.com", amount_due=10.00)
+        self.book = Book.objects.create(title="Test Title", author="Test Author", category="fiction", quantity=10)
+        self.overdue = BorrowedBook.objects.create(
+            member=self.member, book=self.book, return_date="2021-12-12", fine=5.00
+        )
+        BorrowedBook.objects.create(member=self.member, book=self.book, return_date="2021-12-12", fine=2.50)
+        BorrowedBook.objects.create(member=self.member, book=self.book, return_date="2099-12-12", fine=4.00)
+        BorrowedBook.objects.create(
+            member=self.member, book=self.book, return_date="2021-12-12", fine=3.00, returned=True
+        )
+
+    def test_marks_overdue_loans_and_refreshes_amount_due(self):
+        call_command("accrue_fines", "--chunk-size", "1", stdout=StringIO())
+
+        self.member.refresh_from_db()
+        self.member2.refresh_from_db()
+        self.assertEqual(BorrowedBook.objects.filter(overdue=True).count(), 2)
+        self.assertEqual(self.member.amount_due, Decimal("7.50"))
+        self.assertEqual(self.member2.amount_due, Decimal("0.00"))
+
+    def test_rerun_is_idempotent(self):
+        call_command("accrue_fines", stdout=StringIO())
+        call_command("accrue_fines", stdout=StringIO())
+
+        self.member.refresh_from_db()
+        self.assertEqual(self.member.amount_due, Decimal("7.50"))
+
+    def test_paying_the_fine_reduces_amount_due(self):
+        call_command("accrue_fines", stdout=StringIO())
+        user = Librarian.objects.create_user(email="test@gmail.com", password="password")
+        self.client.force_login(user)
+
+        self.client.post(reverse("return-book-fine", kwargs={"pk": self.overdue.pk}), {"payment_method": "cash"})
+
+        self.member.refresh_from_db()
+        self.assertEqual(self.member.amount_due, Decimal("2.50"))
+
+    def test_extending_an_overdue_loan_clears_its_fine(self):
+        call_command("accrue_fines", stdout=StringIO())
+        user = Librarian.objects.create_user(email="test@gmail.com", password="password")
+        self.client.force_login(user)
+
+        self.client.post(
+            reverse("edit-borrowed-book", kwargs={"pk": self.overdue.pk}), {"return_date": "2099-12-12", "fine": 5.00}
+        )
+
+        self.overdue.refresh_from_db()
+        self.member.refresh_from_db()
+        self.assertFalse(self.overdue.overdue)
+        self.assertEqual(self.member.amount_due, Decimal("2.50"))
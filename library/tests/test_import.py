@@ -0,0 +1,119 @@
+import os
+import tempfile
+from io import StringIO
+
+from django.core.exceptions import ValidationError
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from library.imports import BookImporter, MemberImporter
+from library.models import Book, Member
+from users.models import Librarian
+
+BOOKS_CSV = """title,author,category,quantity,borrowing_fee
+Title 1,Author 1,fiction,3,10.00
+Title 2,Author 2,history,0,5.00
+Title 3,Author 3,not-a-category,1,5.00
+Title 4,Author 4,science,2,0.50
+Title 5,Author 5,poetry,1,2.00
+"""
+
+MEMBERS_CSV = """name,email
+John Doe,john@gmail.com
+Jane Doe,jane@gmail.com
+Existing,existing@gmail.com
+Duplicate,john@gmail.com
+No Email,
+"""
+
+
+class TestCSVImporter(TestCase):
+    def setUp(self):
+        Member.objects.create(name="Existing", email="existing@gmail.com")
+
+    def test_imports_valid_books_and_rejects_invalid_rows(self):
+        rejects = []
+        created, rejected = BookImporter(chunk_size=2, on_reject=lambda *reject: rejects.append(reject)).run(
+            StringIO(BOOKS_CSV)
+        )
+
+        self.assertEqual((created, rejected), (3, 2))
+        self.assertEqual([line_number for line_number, row, message in rejects], [4, 5])
+        self.assertIn("category", rejects[0][2])
+        self.assertEqual(Book.objects.get(title="Title 2").status, "not-available")
+        self.assertEqual(Book.objects.get(title="Title 1").status, "available")
+
+    def test_member_emails_are_checked_against_one_prefetched_set(self):
+        rejects = []
+        with CaptureQueriesContext(connection) as context:
+            created, rejected = MemberImporter(on_reject=lambda *reject: rejects.append(reject)).run(
+                StringIO(MEMBERS_CSV)
+            )
+
+        self.assertEqual((created, rejected), (2, 3))
+        self.assertEqual([line_number for line_number, row, message in rejects], [4, 5, 6])
+        self.assertEqual(Member.objects.count(), 3)
+        # The prefetch of the emails and the INSERT, whatever the number of rows.
+        self.assertLessEqual(len(context.captured_queries), 4)
+
+    def test_missing_columns_are_rejected(self):
+        with self.assertRaises(ValidationError):
+            BookImporter().run(StringIO("title,author\nTitle,Author\n"))
+
+        self.assertEqual(Book.objects.count(), 0)
+
+
+class TestImportCommand(TestCase):
+    def write_csv(self, content):
+        with tempfile.NamedTemporaryFile("w", suffix=".csv", delete=False) as file:
+            file.write(content)
+        self.addCleanup(os.remove, file.name)
+        return file.name
+
+    def test_imports_books_and_reports_rejected_rows(self):
+        stdout, stderr = StringIO(), StringIO()
+        call_command("import_csv", "books", self.write_csv(BOOKS_CSV), stdout=stdout, stderr=stderr)
+
+        self.assertEqual(Book.objects.count(), 3)
+        self.assertIn("3 books imported, 2 row(s) rejected.", stdout.getvalue())
+        self.assertIn("Line 4:", stderr.getvalue())
+
+    def test_missing_file_raises_command_error(self):
+        with self.assertRaises(CommandError):
+            call_command("import_csv", "members", "/does/not/exist.csv", stdout=StringIO())
+
+
+class TestImportView(TestCase):
+    def setUp(self):
+        self.user = Librarian.objects.create_user(email="test@gmail.com", password="password")
+
+    def upload(self, kind, content):
+        file = SimpleUploadedFile("import.csv", content.encode(), content_type="text/csv")
+        return self.client.post(reverse("import"), {"kind": kind, "file": file})
+
+    def test_login_required(self):
+        response = self.upload("members", MEMBERS_CSV)
+
+        self.assertEqual(Member.objects.count(), 0)
+        self.assertRedirects(response, f"{reverse('login')}?next={reverse('import')}")
+
+    def test_upload_imports_members_and_lists_rejected_rows(self):
+        self.client.force_login(self.user)
+        response = self.upload("members", MEMBERS_CSV)
+
+        self.assertEqual(Member.objects.count(), 3)
+        self.assertEqual(response.context["created"], 3)
+        self.assertEqual(response.context["rejected"], 2)
+        self.assertContains(response, "Line 5:")
+        self.assertContains(response, "Line 6:")
+
+    def test_missing_columns_are_reported_on_the_file_field(self):
+        self.client.force_login(self.user)
+        response = self.upload("books", "title\nTitle\n")
+
+        self.assertEqual(Book.objects.count(), 0)
+        self.assertIn("file", response.context["form"].errors)
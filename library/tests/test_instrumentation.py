@@ -0,0 +1,35 @@
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from library.models import Book
+from users.models import Librarian
+
+
+class TestRequestInstrumentationMiddleware(TestCase):
+    def setUp(self):
+        self.user = Librarian.objects.create_user(email="test@gmail.com", password="password")
+        self.client.force_login(self.user)
+        Book.objects.create(title="Test Title", author="Test Author", category="fiction", quantity=10)
+
+    def test_request_metrics_are_logged_as_fields(self):
+        with self.assertLogs("core.instrumentation", level="INFO") as logs:
+            self.client.get(reverse("books"))
+
+        record = logs.records[-1]
+        self.assertEqual(record.levelname, "INFO")
+        self.assertEqual(record.view, "library.views.BooksListView")
+        self.assertEqual(record.status, 200)
+        self.assertGreater(record.query_count, 0)
+        self.assertGreater(record.template_time_ms, 0)
+        self.assertGreaterEqual(record.view_time_ms, record.db_time_ms)
+        self.assertFalse(hasattr(record, "top_queries"))
+
+    @override_settings(SLOW_REQUEST_THRESHOLD_MS=0, SLOW_REQUEST_TOP_QUERIES=2)
+    def test_slow_requests_log_the_top_queries(self):
+        with self.assertLogs("core.instrumentation", level="WARNING") as logs:
+            self.client.get(reverse("books"))
+
+        record = logs.records[-1]
+        self.assertEqual(record.levelname, "WARNING")
+        self.assertLessEqual(len(record.top_queries), 2)
+        self.assertEqual(set(record.top_queries[0]), {"sql", "count", "time_ms"})
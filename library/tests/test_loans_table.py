@@ -0,0 +1,148 @@
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from library.models import Book, BorrowedBook, Member
+from users.models import Librarian
+
+COLUMNS = ("book", "member", "return_date", "fine", "returned", "overdue", "created_at")
+
+
+def table_query(order=(), filters=None, search="", start=0, length=10):
+    """
+    The query string DataTables sends for the loans table.
+    order: (column name, direction) pairs.
+    filters: Search value of each filtered column name.
+    """
+    params = {"draw": 3, "start": start, "length": length, "search[value]": search}
+    for index, name in enumerate(COLUMNS):
+        params[f"columns[{index}][data]"] = name
+        params[f"columns[{index}][search][value]"] = (filters or {}).get(name, "")
+    for index, (name, direction) in enumerate(order):
+        params[f"order[{index}][column]"] = COLUMNS.index(name)
+        params[f"order[{index}][dir]"] = direction
+    return params
+
+
+class TestLoansTableDataView(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = Librarian.objects.create_user(email="test@gmail.com", password="password")
+        self.member = Member.objects.create(name="John Doe", email="member@gmail.com")
+        self.other = Member.objects.create(name="Jane Roe", email="jane@gmail.com")
+        self.book = Book.objects.create(title="Test Title", author="Test Author", category="fiction", quantity=10)
+        self.other_book = Book.objects.create(title="Other Title", author="Other Author", category="poetry")
+        self.loans = [
+            BorrowedBook.objects.create(member=self.member, book=self.book, return_date="2024-01-10", fine=3.00),
+            BorrowedBook.objects.create(
+                member=self.member, book=self.other_book, return_date="2024-02-10", returned=True, overdue=True
+            ),
+            BorrowedBook.objects.create(member=self.other, book=self.book, return_date="2024-03-10", fine=1.00),
+        ]
+
+    def get(self, **kwargs):
+        return self.client.get(reverse("loans-table-data"), table_query(**kwargs))
+
+    def ids(self, **kwargs):
+        return [row["DT_RowId"] for row in self.get(**kwargs).json()["data"]]
+
+    def test_login_required(self):
+        response = self.client.get(reverse("loans-table-data"))
+
+        self.assertRedirects(response, f"{reverse('login')}?next={reverse('loans-table-data')}")
+
+    def test_page_of_loans(self):
+        self.client.force_login(self.user)
+        response = self.get(order=[("return_date", "asc")], length=2)
+
+        data = response.json()
+        self.assertEqual((data["draw"], data["recordsTotal"], data["recordsFiltered"]), (3, 3, 3))
+        self.assertEqual(
+            data["data"][0],
+            {
+                "DT_RowId": self.loans[0].pk,
+                "book": "Test Title",
+                "member": "John Doe",
+                "return_date": "2024-01-10",
+                "fine": "3.00",
+                "returned": False,
+                "overdue": False,
+                "created_at": data["data"][0]["created_at"],
+            },
+        )
+        self.assertEqual(len(data["data"]), 2)
+
+    def test_sorting(self):
+        self.client.force_login(self.user)
+
+        self.assertEqual(self.ids(order=[("return_date", "desc")]), [loan.pk for loan in self.loans[::-1]])
+        self.assertEqual(self.ids(order=[("fine", "asc")]), [self.loans[1].pk, self.loans[2].pk, self.loans[0].pk])
+        self.assertEqual(self.ids(order=[("return_date", "asc")], start=1, length=1), [self.loans[1].pk])
+
+    def test_column_filters(self):
+        self.client.force_login(self.user)
+
+        self.assertEqual(self.ids(filters={"member": self.other.pk}), [self.loans[2].pk])
+        self.assertEqual(self.ids(filters={"returned": "true"}), [self.loans[1].pk])
+        self.assertEqual(len(self.ids(filters={"overdue": "false"})), 2)
+        ids = self.ids(order=[("return_date", "asc")], filters={"return_date": "2024-02-10,2024-03-10"})
+        self.assertEqual(ids, [self.loans[1].pk, self.loans[2].pk])
+        self.assertEqual(self.ids(filters={"return_date": ",2024-01-10"}), [self.loans[0].pk])
+
+        data = self.get(filters={"member": self.member.pk, "returned": "false"}).json()
+        self.assertEqual((data["recordsTotal"], data["recordsFiltered"]), (3, 1))
+
+    def test_global_search(self):
+        self.client.force_login(self.user)
+
+        self.assertEqual(self.ids(search="Other"), [self.loans[1].pk])
+
+    def test_invalid_parameters(self):
+        self.client.force_login(self.user)
+
+        for kwargs in (
+            {"order": [("book", "asc")]},
+            {"filters": {"fine": "3"}},
+            {"filters": {"returned": "maybe"}},
+            {"filters": {"return_date": "2024-13-01,"}},
+        ):
+            with self.subTest(**kwargs):
+                response = self.get(**kwargs)
+
+                self.assertEqual(response.status_code, 400)
+                self.assertIn("error", response.json())
+
+    def test_query_count_does_not_grow_with_loans(self):
+        self.client.force_login(self.user)
+        query = table_query(order=[("return_date", "desc")], filters={"overdue": "false"})
+        with CaptureQueriesContext(connection) as three_loans:
+            self.client.get(reverse("loans-table-data"), query)
+
+        for index in range(10):
+            BorrowedBook.objects.create(member=self.other, book=self.other_book, return_date="2024-04-10")
+
+        with CaptureQueriesContext(connection) as thirteen_loans:
+            response = self.client.get(reverse("loans-table-data"), query)
+
+        self.assertEqual(response.json()["recordsFiltered"], 12)
+        self.assertEqual(len(three_loans), len(thirteen_loans))
+
+    def test_counts_are_cached(self):
+        self.client.force_login(self.user)
+        self.get(filters={"overdue": "false"})
+
+        with CaptureQueriesContext(connection) as queries:
+            self.get(filters={"overdue": "false"}, start=1)
+
+        self.assertEqual(len(queries), 1)
+
+
+class TestLoansTableView(TestCase):
+    def test_table_page(self):
+        self.client.force_login(Librarian.objects.create_user(email="test@gmail.com", password="password"))
+        response = self.client.get(reverse("loans-table"))
+
+        self.assertContains(response, reverse("loans-table-data"))
+        self.assertContains(response, "dataTables.bootstrap4.css")
@@ -0,0 +1,136 @@
+import io
+import json
+import logging
+import os
+import threading
+import timeit
+from datetime import datetime, timezone
+
+from django.test import SimpleTestCase, tag
+from pythonjsonlogger import jsonlogger
+
+from core.logging_formatter import CustomJsonFormatter
+from core.logging_handlers import QueueStreamHandler
+
+
+class LegacyJsonFormatter(jsonlogger.JsonFormatter):
+    """
+    The formatter CustomJsonFormatter replaced, formatting the current time for every record.
+    """
+
+    def add_fields(self, log_record, record, message_dict):
+        super().add_fields(log_record, record, message_dict)
+        if not log_record.get("timestamp"):
+            log_record["timestamp"] = datetime.utcnow().strftime("%Y-%m-%dT%H:%M:%S.%fZ")
+        if log_record.get("level"):
+            log_record["level"] = log_record["level"].upper()
+        else:
+            log_record["level"] = record.levelname
+
+
+class BlockedStream(io.StringIO):
+    """
+    A stream whose writes wait until unblocked is set.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.unblocked = threading.Event()
+
+    def write(self, value):
+        self.unblocked.wait(timeout=5)
+        return super().write(value)
+
+
+def make_record(message="Book returned successfully."):
+    return logging.LogRecord("library.views", logging.INFO, __file__, 1, message, None, None)
+
+
+class TestCustomJsonFormatter(SimpleTestCase):
+    def test_timestamp_is_the_time_the_record_was_created(self):
+        record = make_record()
+        record.created = 1700000000.123456
+
+        log = json.loads(CustomJsonFormatter().format(record))
+
+        expected = datetime.fromtimestamp(record.created, timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.%fZ")
+        self.assertEqual(log["timestamp"][:23], expected[:23])
+        self.assertEqual(log["level"], "INFO")
+        self.assertEqual(log["message"], "Book returned successfully.")
+
+    def test_cached_second_is_refreshed(self):
+        formatter = CustomJsonFormatter()
+
+        self.assertEqual(formatter.format_timestamp(1700000000.5), "2023-11-14T22:13:20.500000Z")
+        self.assertEqual(formatter.format_timestamp(1700000061.25), "2023-11-14T22:14:21.250000Z")
+
+    @tag("benchmark")
+    def test_faster_than_the_legacy_formatter(self):
+        record = make_record()
+        legacy, custom = LegacyJsonFormatter(), CustomJsonFormatter()
+
+        legacy_time = min(timeit.repeat(lambda: legacy.format(record), number=2000, repeat=5))
+        custom_time = min(timeit.repeat(lambda: custom.format(record), number=2000, repeat=5))
+
+        self.assertLess(custom_time, legacy_time)
+
+
+class TestQueueStreamHandler(SimpleTestCase):
+    def make_logger(self, handler):
+        handler.setFormatter(CustomJsonFormatter())
+        logger = logging.getLogger(f"test_queue_stream_handler.{id(handler)}")
+        logger.propagate = False
+        logger.setLevel(logging.INFO)
+        logger.addHandler(handler)
+        self.addCleanup(logger.removeHandler, handler)
+        return logger
+
+    def test_records_are_written_by_the_listener(self):
+        stream = io.StringIO()
+        handler = QueueStreamHandler(stream)
+        logger = self.make_logger(handler)
+
+        logger.info("Lent %s book(s).", 2, extra={"member": "John Doe"})
+        try:
+            raise ValueError("boom")
+        except ValueError:
+            logger.exception("Lending failed.")
+        handler.close()
+
+        first, second = (json.loads(line) for line in stream.getvalue().splitlines())
+        self.assertEqual(first["message"], "Lent 2 book(s).")
+        self.assertEqual(first["member"], "John Doe")
+        self.assertIn("ValueError: boom", second["exc_info"])
+
+    def test_logging_does_not_wait_for_the_stream(self):
+        stream = BlockedStream()
+        handler = QueueStreamHandler(stream)
+        logger = self.make_logger(handler)
+
+        logger.info("Book returned successfully.")
+        self.assertEqual(stream.getvalue(), "")
+
+        stream.unblocked.set()
+        handler.close()
+        self.assertEqual(json.loads(stream.getvalue())["message"], "Book returned successfully.")
+
+    def test_listener_starts_with_the_first_record_of_each_process(self):
+        stream = io.StringIO()
+        handler = QueueStreamHandler(stream)
+        logger = self.make_logger(handler)
+        self.assertIsNone(handler.listener)
+
+        logger.info("Lent 1 book(s).")
+        listener, records = handler.listener, handler.queue
+        self.assertEqual(handler.pid, os.getpid())
+
+        # As if the handler had been inherited by a forked worker.
+        handler.pid = -1
+        logger.info("Lent 2 book(s).")
+        handler.close()
+        listener.stop()
+
+        self.assertIsNot(handler.listener, listener)
+        self.assertIsNot(handler.queue, records)
+        messages = [json.loads(line)["message"] for line in stream.getvalue().splitlines()]
+        self.assertEqual(sorted(messages), ["Lent 1 book(s).", "Lent 2 book(s)."])
@@ -1,7 +1,15 @@
+import datetime
+from decimal import Decimal
+from unittest import mock
+
+from django.core.cache import cache
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
+from django.utils import timezone
 
-from library.models import Member
+from library.models import Book, BorrowedBook, Member
 from users.models import Librarian
 
 
@@ -37,6 +45,66 @@ class TestAddMemberView(TestCase):
         assert response.context["form"].errors["email"] == ["A member with that email already exists."]
 
 
+class TestMembersListView(TestCase):
+    def setUp(self):
+        self.user = Librarian.objects.create_user(email="test@gmail.com", password="password")
+        self.member = Member.objects.create(name="John Doe", email="johndoe@gmail.com")
+        self.book = Book.objects.create(
+            title="Test Title",
+            author="Test Author",
+            category="fiction",
+            quantity=10,
+            borrowing_fee=1.00,
+            status="available",
+        )
+        BorrowedBook.objects.create(member=self.member, book=self.book, return_date="2021-12-12", fine=5.00)
+        BorrowedBook.objects.create(member=self.member, book=self.book, return_date="2021-12-12", fine=2.50)
+        BorrowedBook.objects.create(member=self.member, book=self.book, return_date="2099-12-12", fine=4.00)
+
+    def test_amount_due_is_annotated(self):
+        self.client.force_login(self.user)
+        response = self.client.get(reverse("members"))
+
+        member = response.context["members"][0]
+        self.assertEqual(member.overdue_fines, Decimal("7.50"))
+        self.assertEqual(member.calculate_amount_due(), Decimal("7.50"))
+
+    def test_amount_due_is_revalidated_when_the_day_changes(self):
+        cache.clear()
+        self.client.force_login(self.user)
+        now = timezone.now()
+        member = Member.objects.create(name="Jane Roe", email="janeroe@gmail.com")
+        BorrowedBook.objects.create(member=member, book=self.book, return_date=now.date(), fine=7.00)
+
+        response = self.client.get(reverse("members"))
+        amounts = {member.pk: member.calculate_amount_due() for member in response.context["members"]}
+        self.assertEqual(amounts[member.pk], 0)
+
+        with mock.patch("django.utils.timezone.now", return_value=now + datetime.timedelta(days=2)):
+            response = self.client.get(reverse("members"), HTTP_IF_NONE_MATCH=response["ETag"])
+
+        self.assertEqual(response.status_code, 200)
+        amounts = {member.pk: member.calculate_amount_due() for member in response.context["members"]}
+        self.assertEqual(amounts[member.pk], Decimal("7.00"))
+
+    def test_calculate_amount_due_without_annotation(self):
+        self.assertEqual(self.member.calculate_amount_due(), Decimal("7.50"))
+
+    def test_query_count_does_not_grow_with_members(self):
+        self.client.force_login(self.user)
+        with CaptureQueriesContext(connection) as single_member:
+            self.client.get(reverse("members"))
+
+        for index in range(5):
+            member = Member.objects.create(name=f"Member {index}", email=f"member{index}@gmail.com")
+            BorrowedBook.objects.create(member=member, book=self.book, return_date="2021-12-12", fine=1.00)
+
+        with CaptureQueriesContext(connection) as many_members:
+            self.client.get(reverse("members"))
+
+        self.assertEqual(len(single_member), len(many_members))
+
+
 class TestUpdateMemberDetailsView(TestCase):
     def setUp(self):
         self.member = Member.objects.create(name="John Doe", email="johndoe@gmail.com")
@@ -0,0 +1,73 @@
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from library.models import Book
+from library.pagination import KeysetPaginator
+from users.models import Librarian
+
+
+class TestKeysetPaginator(TestCase):
+    def setUp(self):
+        self.books = [
+            Book.objects.create(title=f"Book {index}", author="Test Author", category="fiction", quantity=1)
+            for index in range(5)
+        ]
+
+    def titles(self, page):
+        return [book.title for book in page]
+
+    def test_pages_are_newest_first_and_do_not_overlap(self):
+        paginator = KeysetPaginator(Book.objects.all(), per_page=2)
+
+        first = paginator.page()
+        second = paginator.page(first.next_cursor)
+        third = paginator.page(second.next_cursor)
+
+        self.assertEqual(self.titles(first), ["Book 4", "Book 3"])
+        self.assertEqual(self.titles(second), ["Book 2", "Book 1"])
+        self.assertEqual(self.titles(third), ["Book 0"])
+        self.assertFalse(first.has_previous())
+        self.assertFalse(third.has_next())
+
+    def test_previous_cursor_returns_the_previous_page(self):
+        paginator = KeysetPaginator(Book.objects.all(), per_page=2)
+
+        second = paginator.page(paginator.page().next_cursor)
+        first = paginator.page(second.previous_cursor)
+
+        self.assertEqual(self.titles(first), ["Book 4", "Book 3"])
+        self.assertFalse(first.has_previous())
+        self.assertTrue(first.has_next())
+
+    def test_invalid_cursor_returns_the_first_page(self):
+        paginator = KeysetPaginator(Book.objects.all(), per_page=2)
+
+        self.assertEqual(self.titles(paginator.page("not-a-cursor")), ["Book 4", "Book 3"])
+
+
+@override_settings(LIBRARY_PAGE_SIZE=2)
+class TestPaginatedListViews(TestCase):
+    def setUp(self):
+        self.user = Librarian.objects.create_user(email="test@gmail.com", password="password")
+        for index in range(3):
+            Book.objects.create(title=f"Python {index}", author="Test Author", category="fiction", quantity=1)
+        Book.objects.create(title="Django", author="Test Author", category="fiction", quantity=1)
+
+    def test_list_books_is_paginated(self):
+        self.client.force_login(self.user)
+        response = self.client.get(reverse("books"))
+
+        self.assertEqual(len(response.context["books"]), 2)
+        self.assertTrue(response.context["page"].has_next())
+
+    def test_search_results_are_paginated(self):
+        self.client.force_login(self.user)
+        response = self.client.post(reverse("books"), {"query": "Python"})
+        page = response.context["page"]
+
+        self.assertEqual([book.title for book in page], ["Python 2", "Python 1"])
+
+        response = self.client.get(reverse("books"), {"query": "Python", "cursor": page.next_cursor})
+
+        self.assertEqual([book.title for book in response.context["page"]], ["Python 0"])
+        self.assertFalse(response.context["page"].has_next())
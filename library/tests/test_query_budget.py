@@ -0,0 +1,254 @@
+import datetime
+import json
+import os
+from time import perf_counter
+
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from library import urls as library_urls
+from library.models import Book, BorrowedBook, DailyRevenue, LibraryStats, Member, Transaction
+from users import urls as users_urls
+from users.models import Librarian
+
+# Number of rows of each model the views are measured against.
+SIZES = (10, 100, 1000)
+
+# Set QUERY_BUDGET_REPORT to a file path to write the query counts and timings of every view as JSON.
+REPORT_PATH = os.environ.get("QUERY_BUDGET_REPORT")
+
+PASSWORD = "Str0ng-Passw0rd"
+
+
+class Fixtures:
+    """
+    Fresh rows for one request, so destructive views always act on a row the other requests don't use.
+    """
+
+    def __init__(self, number):
+        self.number = number
+        self.member = Member.objects.create(name=f"Budget Member {number}", email=f"budget{number}@gmail.com")
+        self.book = Book.objects.create(
+            title=f"Budget Title {number}", author="Budget Author", category="fiction", quantity=10
+        )
+        self.loan = BorrowedBook.objects.create(
+            member=self.member, book=self.book, return_date=datetime.date(2099, 12, 12), fine=5.00
+        )
+        self.overdue_loan = BorrowedBook.objects.create(
+            member=self.member, book=self.book, return_date=datetime.date(2020, 12, 12), fine=5.00
+        )
+        self.payment = Transaction.objects.create(member=self.member, amount=10.00, payment_method="cash")
+        DailyRevenue.record_payment(self.payment)
+
+
+def lend_data(fixtures):
+    return {
+        "member": fixtures.member.pk,
+        "book": [fixtures.book.pk],
+        "return_date": "2099-12-12",
+        "fine": 10.00,
+        "payment_method": "cash",
+    }
+
+
+def book_data(fixtures):
+    return {
+        "title": f"New Title {fixtures.number}",
+        "author": "New Author",
+        "category": "fiction",
+        "quantity": 10,
+        "borrowing_fee": 10.00,
+    }
+
+
+def member_data(fixtures):
+    return {"name": f"New Member {fixtures.number}", "email": f"new{fixtures.number}@gmail.com"}
+
+
+def import_data(fixtures):
+    content = f"name,email\nImported {fixtures.number},imported{fixtures.number}@gmail.com\n"
+    return {"kind": "members", "file": SimpleUploadedFile("members.csv", content.encode(), content_type="text/csv")}
+
+
+def streamed(fixtures):
+    return {"stream": "1"}
+
+
+def loans_table_query(fixtures):
+    return {
+        "draw": 1,
+        "columns[0][data]": "member",
+        "columns[0][search][value]": fixtures.member.pk,
+        "columns[1][data]": "return_date",
+        "columns[2][data]": "overdue",
+        "columns[2][search][value]": "false",
+        "order[0][column]": 1,
+        "order[0][dir]": "desc",
+        "search[value]": "Budget",
+    }
+
+
+def register_data(fixtures):
+    return {
+        "first_name": "New",
+        "last_name": "Librarian",
+        "email": f"librarian{fixtures.number}@gmail.com",
+        "password": PASSWORD,
+        "repeat_password": PASSWORD,
+    }
+
+
+# URL name -> list of (method, URL kwargs, POST data or GET parameters), each built from the Fixtures of the request.
+REQUESTS = {
+    "home": [("get", None, None)],
+    "add-member": [("get", None, None), ("post", None, member_data)],
+    "members": [("get", None, None), ("get", None, streamed)],
+    "member-statement": [("get", lambda f: {"pk": f.member.pk}, None)],
+    "update-member": [
+        ("get", lambda f: {"pk": f.member.pk}, None),
+        ("post", lambda f: {"pk": f.member.pk}, member_data),
+    ],
+    "delete-member": [("get", lambda f: {"pk": f.member.pk}, None)],
+    "add-book": [("get", None, None), ("post", None, book_data)],
+    "books": [("get", None, None)],
+    "update-book": [("get", lambda f: {"pk": f.book.pk}, None), ("post", lambda f: {"pk": f.book.pk}, book_data)],
+    "delete-book": [("get", lambda f: {"pk": f.book.pk}, None)],
+    "lend-book": [("get", None, None), ("post", None, lend_data)],
+    "lend-member-book": [
+        ("get", lambda f: {"pk": f.member.pk}, None),
+        ("post", lambda f: {"pk": f.member.pk}, lend_data),
+    ],
+    "lent-books": [("get", None, None), ("get", None, streamed)],
+    "loans-table": [("get", None, None)],
+    "loans-table-data": [("get", None, None), ("get", None, loans_table_query)],
+    "edit-borrowed-book": [
+        ("get", lambda f: {"pk": f.loan.pk}, None),
+        ("post", lambda f: {"pk": f.loan.pk}, lambda f: {"return_date": "2099-12-13", "fine": 6.00}),
+    ],
+    "delete-borrowed-book": [("get", lambda f: {"pk": f.loan.pk}, None)],
+    "return-book": [("get", lambda f: {"pk": f.loan.pk}, None)],
+    "return-books": [
+        ("get", None, None),
+        ("post", None, lambda f: {"loans": f"{f.loan.pk} {f.overdue_loan.pk}", "payment_method": "cash"}),
+    ],
+    "return-book-fine": [
+        ("get", lambda f: {"pk": f.overdue_loan.pk}, None),
+        ("post", lambda f: {"pk": f.overdue_loan.pk}, lambda f: {"payment_method": "cash"}),
+    ],
+    "payments": [("get", None, None), ("get", None, streamed)],
+    "delete-payment": [("get", lambda f: {"pk": f.payment.pk}, None)],
+    "revenue": [("get", None, None)],
+    "overdue-books": [("get", None, None)],
+    "export": [("get", lambda f: {"kind": "payments"}, None)],
+    "import": [("get", None, None), ("post", None, import_data)],
+    "book-lookup": [("get", None, None)],
+    "member-lookup": [("get", None, None)],
+    "login": [("get", None, None), ("post", None, lambda f: {"email": "budget@gmail.com", "password": PASSWORD})],
+    "register": [("get", None, None), ("post", None, register_data)],
+    "logout": [("get", None, None)],
+}
+
+
+class TestQueryBudget(TestCase):
+    """
+    Requests every URL of library/urls.py and users/urls.py against 10, 100 and 1,000 rows per model and checks
+    that the number of queries does not grow with the data. Set QUERY_BUDGET_REPORT to also record the timings.
+    """
+
+    def setUp(self):
+        self.user = Librarian.objects.create_user(email="budget@gmail.com", password=PASSWORD)
+        LibraryStats.rebuild()
+        self.requests = 0
+
+    def seed(self, size):
+        """
+        Tops every model up to size rows.
+        """
+        missing = size - Member.objects.count()
+        members = Member.objects.bulk_create(
+            [
+                Member(id=Member.generate_id(), name=f"Member {n}", email=f"member{size}-{n}@gmail.com")
+                for n in range(missing)
+            ]
+        )
+        books = Book.objects.bulk_create(
+            [
+                Book(id=Book.generate_id(), title=f"Title {n}", author=f"Author {n}", category="fiction", quantity=5)
+                for n in range(missing)
+            ]
+        )
+        BorrowedBook.objects.bulk_create(
+            [
+                BorrowedBook(
+                    id=BorrowedBook.generate_id(),
+                    member=member,
+                    book=book,
+                    borrowing_fee=book.borrowing_fee,
+                    return_date=datetime.date(2020 + n % 2 * 80, 1, 1),
+                    fine=5.00,
+                )
+                for n, (member, book) in enumerate(zip(members, books))
+            ]
+        )
+        Transaction.objects.bulk_create(
+            [
+                Transaction(id=Transaction.generate_id(), member=member, amount=10.00, payment_method="cash")
+                for member in members
+            ]
+        )
+        Librarian.objects.bulk_create(
+            [
+                Librarian(id=Librarian.generate_id(), email=f"librarian{size}-{n}@gmail.com", password="!")
+                for n in range(size - Librarian.objects.count())
+            ]
+        )
+
+    def measure(self, name, method, kwargs, data):
+        self.requests += 1
+        fixtures = Fixtures(self.requests)
+        self.client.force_login(self.user)
+        cache.clear()
+
+        url = reverse(name, kwargs=kwargs(fixtures) if kwargs else None)
+        with CaptureQueriesContext(connection) as context:
+            start = perf_counter()
+            response = getattr(self.client, method)(url, data(fixtures) if data else None)
+            if response.streaming:
+                b"".join(response.streaming_content)
+            elapsed = perf_counter() - start
+
+        self.assertLess(response.status_code, 400, f"{method.upper()} {url}")
+        return len(context.captured_queries), elapsed
+
+    def test_every_url_is_budgeted(self):
+        names = {pattern.name for pattern in library_urls.urlpatterns + users_urls.urlpatterns}
+
+        self.assertEqual(names, set(REQUESTS))
+
+    def test_query_count_does_not_grow_with_the_data(self):
+        results = {}
+        for size in SIZES:
+            self.seed(size)
+            for name, requests in REQUESTS.items():
+                for method, kwargs, data in requests:
+                    queries, elapsed = self.measure(name, method, kwargs, data)
+                    request = f"{method.upper()} {name}" + (f" ({data.__name__})" if method == "get" and data else "")
+                    result = results.setdefault(request, {"queries": {}, "time_ms": {}})
+                    result["queries"][size] = queries
+                    result["time_ms"][size] = round(elapsed * 1000, 2)
+
+        for request, result in results.items():
+            with self.subTest(request=request):
+                self.assertEqual(len(set(result["queries"].values())), 1, f"{request}: {result['queries']}")
+
+        if REPORT_PATH:
+            with open(REPORT_PATH, "w") as report:
+                json.dump(
+                    {"generated_at": datetime.datetime.now().isoformat(), "sizes": SIZES, "views": results},
+                    report,
+                    indent=2,
+                )
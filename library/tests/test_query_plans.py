@@ -0,0 +1,33 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase
+
+from library.management.commands.check_query_plans import SEQUENTIAL_SCANS
+
+
+class TestCheckQueryPlansCommand(TestCase):
+    def test_every_view_query_uses_an_index(self):
+        stdout = StringIO()
+        call_command("check_query_plans", stdout=stdout)
+
+        self.assertIn("OverdueBooksView: OK", stdout.getvalue())
+        self.assertIn("BookLookupView: OK", stdout.getvalue())
+
+
+class TestSequentialScanPatterns(SimpleTestCase):
+    def test_sqlite(self):
+        pattern = SEQUENTIAL_SCANS["sqlite"]
+
+        self.assertEqual(pattern.findall("4 0 0 SCAN library_member"), ["library_member"])
+        self.assertEqual(pattern.findall("5 0 0 SCAN library_book USING INDEX book_created_idx"), [])
+        self.assertEqual(pattern.findall("9 0 0 SCAN U0 USING COVERING INDEX member_created_idx"), [])
+        self.assertEqual(pattern.findall("3 0 0 SEARCH library_borrowedbook USING INDEX x (return_date<?)"), [])
+
+    def test_postgresql(self):
+        pattern = SEQUENTIAL_SCANS["postgresql"]
+
+        plan = "Seq Scan on library_transaction  (cost=0.00..1.01 rows=1 width=100)"
+
+        self.assertEqual(pattern.findall(plan), ["library_transaction"])
+        self.assertEqual(pattern.findall("Index Scan using transaction_created_idx on library_transaction"), [])
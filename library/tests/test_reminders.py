@@ -0,0 +1,153 @@
+import datetime
+import math
+import os
+from io import StringIO
+
+from django.core import mail
+from django.core.mail.backends.locmem import EmailBackend
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from library.models import Book, BorrowedBook, Member
+from library.reminders import send_overdue_reminders
+from users.models import Librarian
+
+# Number of overdue loans the reminders are measured against, e.g. REMINDER_BENCHMARK_LOANS=100000.
+BENCHMARK_LOANS = int(os.environ.get("REMINDER_BENCHMARK_LOANS", 1000))
+
+
+class CountingEmailBackend(EmailBackend):
+    """
+    locmem backend counting the connections opened and the batches sent.
+    """
+
+    opened = 0
+    batches = 0
+
+    def open(self):
+        CountingEmailBackend.opened += 1
+        return super().open()
+
+    def send_messages(self, messages):
+        CountingEmailBackend.batches += 1
+        return super().send_messages(messages)
+
+
+class TestOverdueReminders(TestCase):
+    def setUp(self):
+        self.now = datetime.datetime(2024, 6, 1, 8, 0)
+        self.member = Member.objects.create(name="John Doe", email="member@gmail.com")
+        self.other = Member.objects.create(name="Jane Roe", email="jane@gmail.com")
+        self.punctual = Member.objects.create(name="Max Mustermann", email="max@gmail.com")
+        self.book = Book.objects.create(title="Test Title", author="Test Author", category="fiction", quantity=10)
+        self.other_book = Book.objects.create(title="Other Title", author="Other Author", category="poetry")
+        BorrowedBook.objects.create(member=self.member, book=self.book, return_date="2024-05-01", fine=5.00)
+        BorrowedBook.objects.create(member=self.member, book=self.other_book, return_date="2024-05-20", fine=2.50)
+        BorrowedBook.objects.create(member=self.member, book=self.book, return_date="2024-07-01")
+        BorrowedBook.objects.create(member=self.member, book=self.book, return_date="2024-05-01", returned=True)
+        BorrowedBook.objects.create(member=self.other, book=self.other_book, return_date="2024-05-31")
+        BorrowedBook.objects.create(member=self.punctual, book=self.book, return_date="2024-06-02")
+
+    def test_one_digest_per_member(self):
+        sent = send_overdue_reminders(now=self.now)
+
+        self.assertEqual(sent, 2)
+        messages = {message.to[0]: message for message in mail.outbox}
+        self.assertEqual(set(messages), {"member@gmail.com", "jane@gmail.com"})
+        body = messages["member@gmail.com"].body
+        self.assertIn("Hello John Doe", body)
+        self.assertIn("- Test Title, due May 1, 2024, fine 5.00", body)
+        self.assertIn("- Other Title, due May 20, 2024, fine 2.50", body)
+        self.assertIn("Total fine: 7.50", body)
+        self.assertEqual(body.count("\n- "), 2)
+        self.assertNotIn("Total fine", messages["jane@gmail.com"].body)
+
+    def test_rerun_sends_nothing_new(self):
+        send_overdue_reminders(now=self.now)
+        sent = send_overdue_reminders(now=self.now + datetime.timedelta(days=1))
+
+        self.assertEqual(sent, 0)
+        self.assertEqual(len(mail.outbox), 2)
+        self.member.refresh_from_db()
+        self.assertEqual(self.member.last_reminded_at, self.now)
+        self.assertIsNone(Member.objects.get(pk=self.punctual.pk).last_reminded_at)
+
+    def test_members_are_reminded_again_after_the_interval(self):
+        send_overdue_reminders(now=self.now)
+        sent = send_overdue_reminders(now=self.now + datetime.timedelta(days=7, minutes=1))
+
+        # The punctual member's book is overdue by then too.
+        self.assertEqual(sent, 3)
+
+    @override_settings(EMAIL_BACKEND="library.tests.test_reminders.CountingEmailBackend")
+    def test_batches_share_one_connection(self):
+        CountingEmailBackend.opened = CountingEmailBackend.batches = 0
+
+        send_overdue_reminders(now=self.now, batch_size=1)
+
+        self.assertEqual((CountingEmailBackend.opened, CountingEmailBackend.batches), (1, 2))
+        self.assertEqual(len(mail.outbox), 2)
+
+    def test_query_count_does_not_grow_with_members(self):
+        with CaptureQueriesContext(connection) as two_members:
+            send_overdue_reminders(now=self.now)
+
+        for index in range(10):
+            member = Member.objects.create(name=f"Member {index}", email=f"member{index}@gmail.com")
+            BorrowedBook.objects.create(member=member, book=self.book, return_date="2024-05-01")
+        with CaptureQueriesContext(connection) as ten_members:
+            send_overdue_reminders(now=self.now)
+
+        self.assertEqual(len(two_members), len(ten_members))
+
+    def test_command(self):
+        out = StringIO()
+        call_command("send_overdue_reminders", "--batch-size", "1", stdout=out)
+
+        self.assertIn("3 overdue reminder(s) sent.", out.getvalue())
+
+    def test_overdue_books_page_shows_the_last_reminder(self):
+        send_overdue_reminders(now=self.now)
+        self.client.force_login(Librarian.objects.create_user(email="test@gmail.com", password="password"))
+
+        response = self.client.get(reverse("overdue-books"))
+
+        self.assertContains(response, "2024-06-01")
+
+
+class TestOverdueRemindersAtScale(TestCase):
+    """
+    Sends the reminders of BENCHMARK_LOANS overdue loans, 4 per member, and checks that one query reads them all
+    and one UPDATE per batch records the reminders, plus one per batch bumping the DataVersion of the members.
+    """
+
+    def test_reminders_at_scale(self):
+        book = Book.objects.create(title="Test Title", author="Test Author", category="fiction", quantity=10)
+        members = [
+            Member(id=Member.generate_id(), name=f"Member {n}", email=f"member{n}@gmail.com")
+            for n in range(math.ceil(BENCHMARK_LOANS / 4))
+        ]
+        Member.objects.bulk_create(members, batch_size=5000)
+        BorrowedBook.objects.bulk_create(
+            [
+                BorrowedBook(
+                    id=BorrowedBook.generate_id(),
+                    member=members[n // 4],
+                    book=book,
+                    borrowing_fee=book.borrowing_fee,
+                    return_date="2024-05-01",
+                )
+                for n in range(BENCHMARK_LOANS)
+            ],
+            batch_size=5000,
+        )
+
+        with CaptureQueriesContext(connection) as queries:
+            sent = send_overdue_reminders(now=datetime.datetime(2024, 6, 1, 8, 0), batch_size=500)
+
+        self.assertEqual(sent, len(members))
+        self.assertEqual(len(mail.outbox), len(members))
+        self.assertEqual(len(queries), 1 + 2 * math.ceil(len(members) / 500))
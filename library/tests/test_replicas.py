@@ -0,0 +1,84 @@
+from django.conf import settings
+from django.db import router
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase, override_settings
+from django.urls import reverse
+from django.views.generic import View
+
+from core.routers import PIN_COOKIE, ReplicaRouter, ReplicaRoutingMiddleware
+from library.models import Book
+from users.models import Librarian
+
+
+class ReportView(View):
+    read_from_replica = True
+
+    def get(self, request, *args, **kwargs):
+        return HttpResponse(f"{router.db_for_read(Book)} {router.db_for_read(Librarian)}")
+
+    def post(self, request, *args, **kwargs):
+        router.db_for_write(Book)
+        return HttpResponse(router.db_for_read(Book))
+
+
+class WriteView(ReportView):
+    read_from_replica = False
+
+
+@override_settings(REPLICA_DATABASES=["replica_1"], REPLICA_PIN_SECONDS=5)
+class TestReplicaRouting(TestCase):
+    def handle(self, view_class, request):
+        view = view_class.as_view()
+        middleware = ReplicaRoutingMiddleware(
+            lambda request: middleware.process_view(request, view, (), {}) or view(request)
+        )
+        return middleware(request)
+
+    def test_reports_read_the_library_from_a_replica(self):
+        response = self.handle(ReportView, RequestFactory().get("/"))
+
+        self.assertEqual(response.content, b"replica_1 default")
+
+    def test_other_views_read_the_primary(self):
+        response = self.handle(WriteView, RequestFactory().get("/"))
+
+        self.assertEqual(response.content, b"default default")
+
+    def test_writes_pin_the_client_to_the_primary(self):
+        response = self.handle(ReportView, RequestFactory().post("/"))
+
+        self.assertEqual(response.content, b"default")
+        self.assertEqual(response.cookies[PIN_COOKIE]["max-age"], 5)
+
+    def test_pinned_client_reads_the_primary(self):
+        request = RequestFactory().get("/")
+        request.COOKIES[PIN_COOKIE] = "1"
+        response = self.handle(ReportView, request)
+
+        self.assertEqual(response.content, b"default default")
+        self.assertNotIn(PIN_COOKIE, response.cookies)
+
+    def test_outside_a_request_everything_goes_to_the_primary(self):
+        self.assertEqual(router.db_for_read(Book), "default")
+        self.assertFalse(ReplicaRouter().allow_migrate("replica_1", "library"))
+        self.assertTrue(ReplicaRouter().allow_migrate("default", "library"))
+
+
+# The primary stands in for the replica, so the views run their queries.
+@override_settings(REPLICA_DATABASES=["default"], REPLICA_PIN_SECONDS=5)
+class TestReplicaViews(TestCase):
+    def setUp(self):
+        self.user = Librarian.objects.create_user(email="test@gmail.com", password="password")
+        self.client.force_login(self.user)
+
+    def test_pages_read_from_a_replica_are_cached_briefly(self):
+        response = self.client.get(reverse("members"))
+
+        self.assertEqual(response.context["page"].cache_timeout, 5)
+
+    def test_redirect_after_a_write_reads_the_primary(self):
+        response = self.client.post(reverse("add-member"), {"name": "John Doe", "email": "member@gmail.com"})
+        self.assertIn(PIN_COOKIE, response.cookies)
+
+        response = self.client.get(reverse("members"))
+        self.assertEqual(response.context["page"].cache_timeout, settings.LIBRARY_CACHE_TIMEOUT)
@@ -1,7 +1,12 @@
+from decimal import Decimal
+
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
+from django.utils import timezone
 
-from library.models import Book, BorrowedBook, Member
+from library.models import Book, BorrowedBook, DailyRevenue, LibraryStats, Member, Transaction
 from users.models import Librarian
 
 
@@ -80,3 +85,84 @@ class TestReturnBookOnFineView(TestCase):
 
         self.assertEqual(self.borrowed_book.returned, True)
         self.assertEqual(self.book.quantity, 11)
+
+
+class TestReturnBooksView(TestCase):
+    def setUp(self):
+        self.user = Librarian.objects.create_user(email="test@gmail.com", password="password")
+        self.member = Member.objects.create(name="John Doe", email="member@gmail.com")
+        self.other = Member.objects.create(name="Jane Roe", email="jane@gmail.com")
+        self.books = [
+            Book.objects.create(title=f"Test Title {index}", author="Test Author", category="fiction", quantity=0)
+            for index in range(3)
+        ]
+        self.on_time = [
+            BorrowedBook.objects.create(member=self.member, book=book, return_date="2099-12-12") for book in self.books
+        ]
+        self.overdue = [
+            BorrowedBook.objects.create(member=member, book=book, return_date="2021-12-12", fine=fine)
+            for member, book, fine in zip((self.member, self.member, self.other), self.books, (5.00, 2.50, 4.00))
+        ]
+        LibraryStats.rebuild()
+
+    def return_books(self, loans, payment_method="cash"):
+        data = {"loans": "\n".join(loan.pk for loan in loans), "payment_method": payment_method}
+        return self.client.post(reverse("return-books"), data)
+
+    def test_login_required(self):
+        response = self.return_books(self.on_time)
+
+        self.assertRedirects(response, f"{reverse('login')}?next={reverse('return-books')}")
+        self.assertFalse(BorrowedBook.objects.filter(returned=True).exists())
+
+    def test_return_books(self):
+        self.client.force_login(self.user)
+        response = self.return_books(self.on_time + self.overdue)
+
+        self.assertRedirects(response, reverse("lent-books"))
+        self.assertFalse(BorrowedBook.objects.filter(returned=False).exists())
+        self.assertEqual(BorrowedBook.objects.filter(overdue=True).count(), 3)
+        self.assertEqual([book.quantity for book in Book.objects.order_by("title")], [2, 2, 2])
+        self.assertEqual(Book.objects.filter(status="available").count(), 3)
+
+    def test_fines_are_paid_with_one_payment_per_member(self):
+        self.client.force_login(self.user)
+        self.return_books(self.on_time + self.overdue, payment_method="mpesa")
+
+        payments = dict(Transaction.objects.values_list("member__name", "amount"))
+        self.assertEqual(payments, {"John Doe": Decimal("7.50"), "Jane Roe": Decimal("4.00")})
+        revenue = DailyRevenue.objects.get(date=timezone.now().date(), payment_method="mpesa")
+        self.assertEqual((revenue.amount, revenue.payments), (Decimal("11.50"), 2))
+        stats = LibraryStats.objects.get()
+        self.assertEqual((stats.total_amount, stats.total_borrowed_books), (Decimal("11.50"), 0))
+
+    def test_fines_need_a_payment_method(self):
+        self.client.force_login(self.user)
+        response = self.return_books(self.on_time + self.overdue, payment_method="")
+
+        self.assertIn("__all__", response.context["form"].errors)
+        self.assertFalse(BorrowedBook.objects.filter(returned=True).exists())
+
+    def test_unknown_loan_returns_nothing(self):
+        self.client.force_login(self.user)
+        response = self.client.post(reverse("return-books"), {"loans": f"{self.on_time[0].pk}, unknown"})
+
+        self.assertIn("unknown", str(response.context["form"].errors))
+        self.assertFalse(BorrowedBook.objects.filter(returned=True).exists())
+
+    def test_returned_loans_are_skipped(self):
+        self.client.force_login(self.user)
+        self.return_books(self.on_time[:1])
+        self.return_books(self.on_time[:2])
+
+        self.assertEqual([book.quantity for book in Book.objects.order_by("title")], [1, 1, 0])
+
+    def test_query_count_does_not_grow_with_loans(self):
+        DailyRevenue.objects.create(date=timezone.now().date(), payment_method="cash")
+        self.client.force_login(self.user)
+        with CaptureQueriesContext(connection) as one_each:
+            self.return_books(self.on_time[:1] + self.overdue[:1])
+        with CaptureQueriesContext(connection) as several:
+            self.return_books(self.on_time[1:] + self.overdue[1:])
+
+        self.assertEqual(len(one_each), len(several))
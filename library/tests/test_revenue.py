@@ -0,0 +1,81 @@
+import datetime
+from decimal import Decimal
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from library.models import Book, BorrowedBook, DailyRevenue, Member, Transaction
+from library.services import lend_books
+from users.models import Librarian
+
+
+class TestDailyRevenue(TestCase):
+    def setUp(self):
+        self.user = Librarian.objects.create_user(email="test@gmail.com", password="password")
+        self.client.force_login(self.user)
+        self.member = Member.objects.create(name="John Doe", email="member@gmail.com")
+        self.book = Book.objects.create(
+            title="Test Title", author="Test Author", category="fiction", quantity=10, borrowing_fee=10.00
+        )
+        self.today = timezone.now().date()
+
+    def revenue(self, payment_method, date=None):
+        day = DailyRevenue.objects.filter(date=date or self.today, payment_method=payment_method).first()
+        return (day.amount, day.payments) if day else None
+
+    def test_lending_records_the_payment(self):
+        lend_books(self.member, [self.book.pk, self.book.pk], "2099-12-12", 10, "mpesa")
+        lend_books(self.member, [self.book.pk], "2099-12-12", 10, "mpesa")
+
+        self.assertEqual(self.revenue("mpesa"), (Decimal("30.00"), 2))
+        self.assertIsNone(self.revenue("cash"))
+
+    def test_fine_payment_and_payment_deletion(self):
+        borrowed_book = BorrowedBook.objects.create(
+            member=self.member, book=self.book, return_date="2021-12-12", fine=5.00
+        )
+        self.client.post(reverse("return-book-fine", kwargs={"pk": borrowed_book.pk}), {"payment_method": "cash"})
+        self.assertEqual(self.revenue("cash"), (Decimal("5.00"), 1))
+
+        payment = Transaction.objects.get()
+        self.client.get(reverse("delete-payment", kwargs={"pk": payment.pk}))
+        self.assertEqual(self.revenue("cash"), (Decimal("0.00"), 0))
+
+    def test_deleting_a_member_removes_their_revenue(self):
+        lend_books(self.member, [self.book.pk], "2099-12-12", 10, "card")
+        self.client.get(reverse("delete-member", kwargs={"pk": self.member.pk}))
+
+        self.assertEqual(self.revenue("card"), (Decimal("0.00"), 0))
+
+    def test_rebuild_groups_payments_by_day_and_method(self):
+        Transaction.objects.create(member=self.member, amount=10.00, payment_method="cash")
+        Transaction.objects.create(member=self.member, amount=15.00, payment_method="cash")
+        Transaction.objects.create(member=self.member, amount=20.00, payment_method="card")
+        Transaction.objects.filter(payment_method="card").update(created_at=datetime.datetime(2024, 1, 2, 12, 30))
+        DailyRevenue.objects.create(date=self.today, payment_method="mpesa", amount=99, payments=9)
+
+        stdout = StringIO()
+        call_command("rebuild_daily_revenue", stdout=stdout)
+
+        self.assertIn("2 day / payment method row(s)", stdout.getvalue())
+        self.assertEqual(self.revenue("cash"), (Decimal("25.00"), 2))
+        self.assertEqual(self.revenue("card", datetime.date(2024, 1, 2)), (Decimal("20.00"), 1))
+        self.assertIsNone(self.revenue("mpesa"))
+
+    def test_revenue_view_reads_the_rollup(self):
+        DailyRevenue.objects.create(date=self.today, payment_method="cash", amount=10, payments=1)
+        DailyRevenue.objects.create(date=self.today, payment_method="card", amount=5, payments=1)
+        DailyRevenue.objects.create(date=datetime.date(2020, 1, 1), payment_method="cash", amount=7, payments=1)
+
+        with self.assertNumQueries(1):
+            response = self.client.get(reverse("revenue"))
+
+        self.assertEqual(len(response.context["days"]), 1)
+        self.assertEqual(response.context["days"][0]["amounts"], [Decimal("10.00"), 0, Decimal("5.00")])
+        self.assertEqual(response.context["total"], Decimal("15.00"))
+
+        response = self.client.get(reverse("revenue"), {"start": "2020-01-01", "end": "2020-01-31"})
+        self.assertEqual(response.context["total"], Decimal("7.00"))
@@ -0,0 +1,70 @@
+from django.test import TestCase
+from django.urls import reverse
+
+from library.models import Book, BorrowedBook, Member
+from library.search import SEARCH_ORDERING, search_books
+from users.models import Librarian
+
+
+class TestSearchBooks(TestCase):
+    def setUp(self):
+        self.potter = Book.objects.create(title="Harry Potter", author="J. K. Rowling", category="fiction", quantity=1)
+        self.hobbit = Book.objects.create(title="The Hobbit", author="J. R. R. Tolkien", category="fiction", quantity=1)
+        self.harry = Book.objects.create(
+            title="Harry Harrison Harry", author="Harry Harrison", category="fiction", quantity=1
+        )
+
+    def test_prefix_match_on_title_and_author(self):
+        self.assertEqual(list(search_books(Book.objects.all(), "tolk")), [self.hobbit])
+        self.assertEqual(list(search_books(Book.objects.all(), "hobb")), [self.hobbit])
+
+    def test_results_are_ranked(self):
+        books = search_books(Book.objects.all(), "harry").order_by(*SEARCH_ORDERING)
+
+        self.assertEqual(list(books), [self.harry, self.potter])
+
+    def test_index_follows_updates_and_deletes(self):
+        self.hobbit.title = "The Silmarillion"
+        self.hobbit.save()
+        self.potter.delete()
+
+        self.assertEqual(list(search_books(Book.objects.all(), "silma")), [self.hobbit])
+        self.assertFalse(search_books(Book.objects.all(), "hobbit").exists())
+        self.assertFalse(search_books(Book.objects.all(), "potter").exists())
+
+    def test_search_through_a_relation(self):
+        member = Member.objects.create(name="John Doe", email="member@gmail.com")
+        borrowed_book = BorrowedBook.objects.create(member=member, book=self.hobbit, return_date="2099-12-12")
+        BorrowedBook.objects.create(member=member, book=self.potter, return_date="2099-12-12")
+
+        borrowed_books = search_books(BorrowedBook.objects.all(), "tolkien", book_path="book__")
+
+        self.assertEqual(list(borrowed_books), [borrowed_book])
+
+
+class TestBookSearchViews(TestCase):
+    def setUp(self):
+        self.user = Librarian.objects.create_user(email="test@gmail.com", password="password")
+        self.member = Member.objects.create(name="John Doe", email="member@gmail.com")
+        self.potter = Book.objects.create(title="Harry Potter", author="J. K. Rowling", category="fiction", quantity=5)
+        self.hobbit = Book.objects.create(title="The Hobbit", author="J. R. R. Tolkien", category="fiction", quantity=5)
+        BorrowedBook.objects.create(member=self.member, book=self.potter, return_date="2021-12-12")
+        BorrowedBook.objects.create(member=self.member, book=self.hobbit, return_date="2021-12-12")
+
+    def test_search_books(self):
+        self.client.force_login(self.user)
+        response = self.client.post(reverse("books"), {"query": "potter"})
+
+        self.assertEqual(list(response.context["books"]), [self.potter])
+
+    def test_search_lent_books(self):
+        self.client.force_login(self.user)
+        response = self.client.post(reverse("lent-books"), {"query": "hobbit"})
+
+        self.assertEqual([borrowed_book.book for borrowed_book in response.context["books"]], [self.hobbit])
+
+    def test_search_overdue_books(self):
+        self.client.force_login(self.user)
+        response = self.client.post(reverse("overdue-books"), {"query": "rowling"})
+
+        self.assertEqual([borrowed_book.book for borrowed_book in response.context["books"]], [self.potter])
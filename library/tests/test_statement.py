@@ -0,0 +1,103 @@
+import datetime
+from decimal import Decimal
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from library.models import Book, BorrowedBook, Member, Transaction
+from library.statements import MemberStatement
+from users.models import Librarian
+
+
+class TestMemberStatement(TestCase):
+    def setUp(self):
+        self.user = Librarian.objects.create_user(email="test@gmail.com", password="password")
+        self.member = Member.objects.create(name="John Doe", email="member@gmail.com")
+        self.other = Member.objects.create(name="Jane Roe", email="jane@gmail.com")
+        self.book = Book.objects.create(
+            title="Test Title", author="Test Author", category="fiction", quantity=10, borrowing_fee=2.00
+        )
+        self.today = datetime.date(2024, 3, 1)
+
+        self.first_loan = self.loan(datetime.datetime(2024, 1, 1, 10), datetime.date(2024, 1, 10), fine=5.00)
+        self.payment(datetime.datetime(2024, 1, 1, 11), 2.00)
+        self.second_loan = self.loan(datetime.datetime(2024, 2, 1, 10), datetime.date(2099, 1, 1), fine=5.00)
+        self.payment(datetime.datetime(2024, 2, 2, 10), 4.00)
+        BorrowedBook.objects.create(member=self.other, book=self.book, return_date="2024-01-01", fine=5.00)
+        Transaction.objects.create(member=self.other, amount=3.00, payment_method="cash")
+
+    def loan(self, created_at, return_date, fine):
+        loan = BorrowedBook.objects.create(member=self.member, book=self.book, return_date=return_date, fine=fine)
+        BorrowedBook.objects.filter(pk=loan.pk).update(created_at=created_at)
+        return loan
+
+    def payment(self, created_at, amount):
+        payment = Transaction.objects.create(member=self.member, amount=amount, payment_method="mpesa")
+        Transaction.objects.filter(pk=payment.pk).update(created_at=created_at)
+        return payment
+
+    def test_ledger_merges_loans_fines_and_payments_with_running_balance(self):
+        page = MemberStatement(self.member, 10, today=self.today).page()
+
+        self.assertEqual(
+            [(entry.kind, entry.charge, entry.credit, entry.balance) for entry in page],
+            [
+                ("payment", Decimal("0.00"), Decimal("4.00"), Decimal("3.00")),
+                ("loan", Decimal("2.00"), Decimal("0.00"), Decimal("7.00")),
+                ("loan-fine", Decimal("5.00"), Decimal("0.00"), Decimal("5.00")),
+                ("payment", Decimal("0.00"), Decimal("2.00"), Decimal("0.00")),
+                ("loan", Decimal("2.00"), Decimal("0.00"), Decimal("2.00")),
+            ],
+        )
+        self.assertEqual(page[2].entry_at, datetime.datetime(2024, 1, 11))
+        self.assertFalse(page.has_other_pages())
+
+    def test_changing_the_book_fee_does_not_restate_past_loans(self):
+        Book.objects.filter(pk=self.book.pk).update(borrowing_fee=10.00)
+
+        page = MemberStatement(self.member, 10, today=self.today).page()
+
+        self.assertEqual([entry.charge for entry in page if entry.kind == "loan"], [Decimal("2.00"), Decimal("2.00")])
+        self.assertEqual(page[0].balance, Decimal("3.00"))
+
+    def test_pages_keep_the_running_balance(self):
+        statement = MemberStatement(self.member, 2, today=self.today)
+        first = statement.page()
+        second = statement.page(first.next_cursor)
+        third = statement.page(second.next_cursor)
+        back = statement.page(third.previous_cursor)
+
+        self.assertEqual([entry.balance for entry in second], [Decimal("5.00"), Decimal("0.00")])
+        self.assertEqual([entry.balance for entry in third], [Decimal("2.00")])
+        self.assertFalse(third.has_next())
+        self.assertEqual(list(back), list(second))
+        self.assertTrue(back.has_previous())
+
+    def test_a_page_is_one_query(self):
+        statement = MemberStatement(self.member, 2, today=self.today)
+        cursor = statement.page().next_cursor
+        with CaptureQueriesContext(connection) as queries:
+            statement.page(cursor)
+
+        self.assertEqual(len(queries), 1)
+
+    def test_invalid_cursor_returns_the_first_page(self):
+        statement = MemberStatement(self.member, 2, today=self.today)
+
+        self.assertEqual(list(statement.page("not-a-cursor")), list(statement.page()))
+
+    def test_login_required(self):
+        url = reverse("member-statement", kwargs={"pk": self.member.pk})
+        response = self.client.get(url)
+
+        self.assertRedirects(response, f"{reverse('login')}?next={url}")
+
+    def test_statement_view(self):
+        self.client.force_login(self.user)
+        response = self.client.get(reverse("member-statement", kwargs={"pk": self.member.pk}), {"per_page": 2})
+
+        self.assertContains(response, "STATEMENT OF JOHN DOE")
+        self.assertEqual(len(response.context["entries"]), 2)
+        self.assertTrue(response.context["page"].has_next())
@@ -0,0 +1,41 @@
+import os
+import shutil
+import tempfile
+from io import StringIO
+
+from django.conf import settings
+from django.core.management import call_command
+from django.templatetags.static import static
+from django.test import SimpleTestCase, override_settings
+
+
+class TestStaticFiles(SimpleTestCase):
+    def test_collectstatic_fingerprints_and_precompresses_the_assets(self):
+        with tempfile.TemporaryDirectory() as root, override_settings(STATIC_ROOT=root):
+            call_command("collectstatic", interactive=False, verbosity=0)
+            url = static("main.css")
+
+            self.assertRegex(url, r"^/static/main\.[0-9a-f]{12}\.css$")
+            self.assertTrue(os.path.exists(os.path.join(root, f"{url.removeprefix('/static/')}.gz")))
+            self.assertFalse(os.path.exists(os.path.join(root, "main.css")))
+            self.assertFalse(os.path.exists(os.path.join(root, "assets", "vendors", "tinymce")))
+
+    def test_urls_are_unhashed_before_collectstatic(self):
+        with tempfile.TemporaryDirectory() as root, override_settings(STATIC_ROOT=root):
+            self.assertEqual(static("main.css"), "/static/main.css")
+
+    def test_static_report_counts_the_bytes_saved_per_page(self):
+        with tempfile.TemporaryDirectory() as baseline:
+            shutil.copytree(os.path.join(settings.BASE_DIR, "templates"), baseline, dirs_exist_ok=True)
+            with open(os.path.join(baseline, "index.html"), "a") as template:
+                template.write("{% static 'assets/vendors/progressbar.js/progressbar.min.js' %}")
+            out = StringIO()
+            call_command("static_report", baseline=baseline, stdout=out)
+
+        report = {line.split()[0]: line.split()[1:] for line in out.getvalue().splitlines()[1:]}
+        assets, size, sent, saved = (int(value.replace(",", "")) for value in report["index.html"][:4])
+        self.assertEqual(assets, 16)
+        self.assertLess(sent, size)
+        # The stripped progressbar.js is saved on top of the compression.
+        self.assertGreater(saved, size - sent)
+        self.assertIn("users/login.html", report)
@@ -0,0 +1,83 @@
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from library.models import Book, BorrowedBook, Member, Transaction
+from library.streaming import ROWS_MARKER
+from users.models import Librarian
+
+
+@override_settings(LIBRARY_PAGE_SIZE=2, LIBRARY_STREAM_CHUNK_SIZE=2)
+class TestStreamedListPages(TestCase):
+    def setUp(self):
+        self.user = Librarian.objects.create_user(email="test@gmail.com", password="password")
+        self.client.force_login(self.user)
+        self.async_client.force_login(self.user)
+        self.book = Book.objects.create(title="Test Title", author="Test Author", category="fiction", quantity=10)
+        for index in range(5):
+            member = Member.objects.create(name=f"Member {index}", email=f"member{index}@gmail.com")
+            BorrowedBook.objects.create(member=member, book=self.book, return_date="2099-12-12")
+            Transaction.objects.create(member=member, amount=1.00, payment_method="cash")
+
+    def stream(self, name, **params):
+        response = self.client.get(reverse(name), {"stream": "1", **params})
+        self.assertTrue(response.streaming)
+        self.assertFalse(response.is_async)
+        return [chunk.decode() for chunk in response.streaming_content]
+
+    def test_page_chrome_is_sent_before_the_rows(self):
+        chunks = self.stream("lent-books")
+
+        self.assertIn("BORROWED BOOKS LIST", chunks[0])
+        self.assertNotIn("Member 0", chunks[0])
+        self.assertIn("</html>", chunks[-1])
+        # The head, 3 chunks of at most 2 rows and the tail.
+        self.assertEqual(len(chunks), 5)
+
+    def test_every_row_is_streamed(self):
+        for name in ("lent-books", "members", "payments"):
+            with self.subTest(name=name):
+                html = "".join(self.stream(name))
+
+                for index in range(5):
+                    self.assertIn(f"Member {index}", html)
+                # The header row and the 5 rows.
+                self.assertEqual(html.count("</tr>"), 6)
+                self.assertNotIn(ROWS_MARKER, html)
+                self.assertNotIn('aria-label="Page navigation"', html)
+
+    def test_search_query_is_applied_and_escaped(self):
+        html = "".join(self.stream("members", query="Member 3"))
+
+        self.assertIn("Member 3", html)
+        self.assertNotIn("Member 2", html)
+
+        html = "".join(self.stream("members", query=ROWS_MARKER))
+        self.assertIn("MEMBERS LIST", html)
+        self.assertIn("</html>", html)
+
+    def test_query_count_does_not_grow_with_rows(self):
+        with CaptureQueriesContext(connection) as five_rows:
+            self.stream("lent-books")
+        for index in range(5, 10):
+            member = Member.objects.create(name=f"Member {index}", email=f"member{index}@gmail.com")
+            BorrowedBook.objects.create(member=member, book=self.book, return_date="2099-12-12")
+        with CaptureQueriesContext(connection) as ten_rows:
+            self.stream("lent-books")
+
+        self.assertEqual(len(five_rows), len(ten_rows))
+
+    def test_paginated_page_links_to_the_streamed_one(self):
+        response = self.client.get(reverse("payments"))
+
+        self.assertFalse(response.streaming)
+        self.assertContains(response, "stream=1")
+
+    async def test_asgi_streams_an_async_iterator(self):
+        response = await self.async_client.get(reverse("lent-books"), {"stream": "1"})
+
+        self.assertTrue(response.is_async)
+        chunks = [chunk.decode() async for chunk in response.streaming_content]
+        self.assertEqual(len(chunks), 5)
+        self.assertIn("Member 4", "".join(chunks))
@@ -1,45 +1,67 @@
-from django.urls import path
+from django.urls import path, register_converter
+
+from users.converters import PrimaryKeyConverter
 
 from .views import (
     AddBookView,
     AddMemberView,
+    BookLookupView,
     BooksListView,
     DeleteBookView,
     DeleteBorrowedBookView,
     DeleteMemberView,
     DeletePaymentView,
+    ExportView,
     HomeView,
+    ImportView,
     LendBookView,
     LendMemberBookView,
     LentBooksListView,
+    LoansTableDataView,
+    LoansTableView,
     ListPaymentsView,
+    MemberLookupView,
     MembersListView,
+    MemberStatementView,
     OverdueBooksView,
     ReturnBookFineView,
+    ReturnBooksView,
     ReturnBookView,
+    RevenueView,
     UpdateBookDetailsView,
     UpdateBorrowedBookView,
     UpdateMemberDetailsView,
 )
 
+register_converter(PrimaryKeyConverter, "pk")
+
 urlpatterns = [
     path("", HomeView.as_view(), name="home"),
     path("add-member/", AddMemberView.as_view(), name="add-member"),
     path("members/", MembersListView.as_view(), name="members"),
-    path("edit-member-details/<str:pk>/", UpdateMemberDetailsView.as_view(), name="update-member"),
-    path("delete-member/<str:pk>/", DeleteMemberView.as_view(), name="delete-member"),
+    path("members/<pk:pk>/statement/", MemberStatementView.as_view(), name="member-statement"),
+    path("edit-member-details/<pk:pk>/", UpdateMemberDetailsView.as_view(), name="update-member"),
+    path("delete-member/<pk:pk>/", DeleteMemberView.as_view(), name="delete-member"),
     path("add-book/", AddBookView.as_view(), name="add-book"),
     path("books/", BooksListView.as_view(), name="books"),
-    path("edit-book-details/<str:pk>/", UpdateBookDetailsView.as_view(), name="update-book"),
-    path("delete-book/<str:pk>/", DeleteBookView.as_view(), name="delete-book"),
+    path("edit-book-details/<pk:pk>/", UpdateBookDetailsView.as_view(), name="update-book"),
+    path("delete-book/<pk:pk>/", DeleteBookView.as_view(), name="delete-book"),
     path("lend-book/", LendBookView.as_view(), name="lend-book"),
-    path("lend-book/<str:pk>/", LendMemberBookView.as_view(), name="lend-member-book"),
+    path("lend-book/<pk:pk>/", LendMemberBookView.as_view(), name="lend-member-book"),
     path("lent-books/", LentBooksListView.as_view(), name="lent-books"),
-    path("edit-borrowed-book/<str:pk>/", UpdateBorrowedBookView.as_view(), name="edit-borrowed-book"),
-    path("delete-borrowed-book/<str:pk>/", DeleteBorrowedBookView.as_view(), name="delete-borrowed-book"),
-    path("return-book/<str:pk>/", ReturnBookView.as_view(), name="return-book"),
-    path("return-book-fine/<str:pk>/", ReturnBookFineView.as_view(), name="return-book-fine"),
+    path("lent-books/table/", LoansTableView.as_view(), name="loans-table"),
+    path("lent-books/table/data/", LoansTableDataView.as_view(), name="loans-table-data"),
+    path("edit-borrowed-book/<pk:pk>/", UpdateBorrowedBookView.as_view(), name="edit-borrowed-book"),
+    path("delete-borrowed-book/<pk:pk>/", DeleteBorrowedBookView.as_view(), name="delete-borrowed-book"),
+    path("return-book/<pk:pk>/", ReturnBookView.as_view(), name="return-book"),
+    path("return-books/", ReturnBooksView.as_view(), name="return-books"),
+    path("return-book-fine/<pk:pk>/", ReturnBookFineView.as_view(), name="return-book-fine"),
     path("payments/", ListPaymentsView.as_view(), name="payments"),
-    path("delete-payment/<str:pk>/", DeletePaymentView.as_view(), name="delete-payment"),
+    path("delete-payment/<pk:pk>/", DeletePaymentView.as_view(), name="delete-payment"),
+    path("revenue/", RevenueView.as_view(), name="revenue"),
     path("overdue-books/", OverdueBooksView.as_view(), name="overdue-books"),
+    path("export/<str:kind>/", ExportView.as_view(), name="export"),
+    path("import/", ImportView.as_view(), name="import"),
+    path("lookup/books/", BookLookupView.as_view(), name="book-lookup"),
+    path("lookup/members/", MemberLookupView.as_view(), name="member-lookup"),
 ]
@@ -1,7 +1,15 @@
+import io
 import logging
+from datetime import timedelta
+from functools import reduce
+from operator import or_
 
 from django.contrib.auth.decorators import login_required
-from django.db.models import Q
+from django.core.exceptions import ValidationError
+from django.db import router
+from django.db.models import Count, Q, Sum
+from django.db.models.functions import Upper
+from django.http import Http404, HttpResponseBadRequest, JsonResponse, StreamingHttpResponse
 from django.shortcuts import redirect, render
 from django.utils import timezone
 from django.utils.decorators import method_decorator
@@ -10,13 +18,27 @@ from django.views.generic import View
 from .forms import (
     AddBookForm,
     AddMemberForm,
+    ExportForm,
+    ImportForm,
     LendBookForm,
     LendMemberBookForm,
+    LoansTableFiltersForm,
     PaymentForm,
+    ReturnBooksForm,
+    RevenueForm,
     UpdateBorrowedBookForm,
     UpdateMemberForm,
 )
-from .models import Book, BorrowedBook, Member, Transaction
+from .cache import cached_page, conditional_page
+from .datatables import LOANS_TABLE
+from .exports import EXPORTS, FORMATS
+from .imports import IMPORTERS
+from .models import PAYMENT_METHOD_CHOICES, Book, BorrowedBook, DailyRevenue, LibraryStats, Member, Transaction
+from .pagination import DEFAULT_ORDERING, page_size
+from .search import SEARCH_ORDERING, search_books
+from .services import lend_books, refresh_amount_due, return_books
+from .statements import MemberStatement
+from .streaming import stream_table, wants_stream
 
 logger = logging.getLogger(__name__)
 
@@ -35,30 +57,29 @@ class HomeView(View):
         - overdue_amount: Total amount of money that overdue books have accrued.
     """
 
+    read_from_replica = True
+
     def get(self, request, *args, **kwargs):
         members = Member.objects.all()
         books = Book.objects.all()
-        borrowed_books = BorrowedBook.objects.filter(returned=False)
         overdue_books = BorrowedBook.objects.filter(return_date__lt=timezone.now().date(), returned=False)
 
+        stats = LibraryStats.load()
+        overdue = overdue_books.aggregate(total=Count("id"), amount=Sum("fine", default=0))
+
         total_members = members.count()
         total_books = books.count()
-        total_borrowed_books = borrowed_books.count()
-        total_overdue_books = overdue_books.count()
 
         recently_added_books = books.order_by("-created_at")[:4]
 
-        total_amount = sum([payment.amount for payment in Transaction.objects.all()])
-        overdue_amount = sum([book.fine for book in overdue_books])
-
         context = {
             "total_members": total_members,
             "total_books": total_books,
-            "total_borrowed_books": total_borrowed_books,
-            "total_overdue_books": total_overdue_books,
+            "total_borrowed_books": stats.total_borrowed_books,
+            "total_overdue_books": overdue["total"],
             "recently_added_books": recently_added_books,
-            "total_amount": total_amount,
-            "overdue_amount": overdue_amount,
+            "total_amount": stats.total_amount,
+            "overdue_amount": overdue["amount"],
         }
 
         return render(request, "index.html", context)
@@ -90,21 +111,59 @@ class AddMemberView(View):
 
 
 @method_decorator(login_required, name="dispatch")
+@method_decorator(
+    conditional_page("members", (Member, BorrowedBook), extra=lambda request: (timezone.now().date(),)), name="get"
+)
 class MembersListView(View):
     """
-    Members List view for the library management system.
-    get(): Returns the list of members in the library.
-    post(): Returns the list of members in the library based on the search query.
+    Members List view for the library management system. The list is paginated by cursor and cached.
+    get(): Returns a page of the members in the library, filtered by the ?query= parameter if present.
+           With ?stream=1, streams every matching member instead, see stream_table().
+    post(): Returns the first page of the members in the library based on the search query.
     """
 
+    read_from_replica = True
+
     def get(self, request, *args, **kwargs):
-        members = Member.objects.all()
-        return render(request, "members/list-members.html", {"members": members})
+        return self.list_members(request, request.GET.get("query", ""))
 
     def post(self, request, *args, **kwargs):
-        query = request.POST.get("query")
-        members = Member.objects.filter(name__icontains=query)
-        return render(request, "members/list-members.html", {"members": members})
+        return self.list_members(request, request.POST.get("query", ""))
+
+    def list_members(self, request, query):
+        members = Member.objects.with_amount_due()
+        if query:
+            members = members.filter(name__icontains=query)
+
+        if wants_stream(request):
+            return stream_table(
+                request,
+                "members/list-members.html",
+                {"query": query},
+                "members/list-members-rows.html",
+                "members",
+                members.order_by(*DEFAULT_ORDERING),
+            )
+
+        page = cached_page(request, "members", (Member, BorrowedBook), members, query, extra=(timezone.now().date(),))
+        return render(request, "members/list-members.html", {"members": page, "page": page, "query": query})
+
+
+@method_decorator(login_required, name="dispatch")
+class MemberStatementView(View):
+    """
+    Member Statement view for the library management system. The borrowing fees, overdue fines and payments of the
+    member in one ledger with a running balance, paginated by cursor. See MemberStatement.
+    get(): Returns a page of the statement of the member, newest entry first.
+    """
+
+    read_from_replica = True
+
+    def get(self, request, *args, **kwargs):
+        member = Member.objects.get(pk=kwargs["pk"])
+        statement = MemberStatement(member, page_size(request), using=router.db_for_read(BorrowedBook))
+        page = statement.page(request.GET.get("cursor"))
+        return render(request, "members/statement.html", {"member": member, "entries": page, "page": page})
 
 
 @method_decorator(login_required, name="dispatch")
@@ -143,7 +202,13 @@ class DeleteMemberView(View):
 
     def get(self, request, *args, **kwargs):
         member = Member.objects.get(pk=kwargs["pk"])
+        revenue = list(DailyRevenue.totals(member.transactions.all()))
+        outstanding = member.borrowed_books.filter(returned=False).count()
+
         member.delete()
+        for day in revenue:
+            DailyRevenue.record(day["date"], day["payment_method"], -day["amount"], payments=-day["payments"])
+        LibraryStats.record(total_amount=-sum(day["amount"] for day in revenue), total_borrowed_books=-outstanding)
         logger.info("Member deleted successfully.")
         return redirect("members")
 
@@ -180,21 +245,31 @@ class AddBookView(View):
 
 
 @method_decorator(login_required, name="dispatch")
+@method_decorator(conditional_page("books", (Book,)), name="get")
 class BooksListView(View):
     """
-    Books List view for the library management system.
-    get(): Returns the list of books in the library.
-    post(): Returns the list of books in the library based on the search query.
+    Books List view for the library management system. The list is paginated by cursor and cached.
+    get(): Returns a page of the books in the library, filtered by the ?query= parameter if present.
+    post(): Returns the first page of the books in the library based on the search query.
     """
 
+    read_from_replica = True
+
     def get(self, request, *args, **kwargs):
-        books = Book.objects.all()
-        return render(request, "books/list-books.html", {"books": books})
+        return self.list_books(request, request.GET.get("query", ""))
 
     def post(self, request, *args, **kwargs):
-        query = request.POST.get("query")
-        books = Book.objects.filter(Q(title__icontains=query) | Q(author__icontains=query))
-        return render(request, "books/list-books.html", {"books": books})
+        return self.list_books(request, request.POST.get("query", ""))
+
+    def list_books(self, request, query):
+        books = Book.objects.all()
+        if query:
+            books = search_books(books, query)
+
+        page = cached_page(
+            request, "books", (Book,), books, query, ordering=SEARCH_ORDERING if query else DEFAULT_ORDERING
+        )
+        return render(request, "books/list-books.html", {"books": page, "page": page, "query": query})
 
 
 @method_decorator(login_required, name="dispatch")
@@ -239,7 +314,10 @@ class DeleteBookView(View):
 
     def get(self, request, *args, **kwargs):
         book = Book.objects.get(pk=kwargs["pk"])
+        outstanding = book.borrowed_books.filter(returned=False).count()
+
         book.delete()
+        LibraryStats.record(total_borrowed_books=-outstanding)
         logger.info("Book deleted successfully.")
         return redirect("books")
 
@@ -252,7 +330,7 @@ class LendBookView(View):
     post(): Validates the form and lends the book to the member.
             Several Books can be lent to the member at once.
             if the member has exceeded the borrowing limit, an error message is displayed.
-            BorrowedBook and Transaction objects are created and the book quantity is updated.
+            BorrowedBook and Transaction objects are created and the book quantity is updated in one transaction.
     """
 
     def get(self, request, *args, **kwargs):
@@ -271,29 +349,18 @@ class LendBookView(View):
                 form.add_error(None, "Member has exceeded the borrowing limit.")
                 logger.error("Member has exceeded the borrowing limit.")
             else:
-                payment_method = payment_form.cleaned_data["payment_method"]
-                books_ids = request.POST.getlist("book")
-                amount = 0
-                for book_id in books_ids:
-                    book = Book.objects.get(pk=book_id)
-                    BorrowedBook.objects.create(
+                try:
+                    lend_books(
                         member=lent_book.member,
-                        book=book,
+                        book_ids=[book.pk for book in form.cleaned_data["book"]],
                         return_date=lent_book.return_date,
                         fine=lent_book.fine,
+                        payment_method=payment_form.cleaned_data["payment_method"],
                     )
-                    logger.info("Book lent successfully.")
-
-                    book.quantity -= 1
-                    book.save()
-                    logger.info("Book Quantity updated successfully.")
-
-                    amount += book.borrowing_fee
-
-                Transaction.objects.create(member=lent_book.member, amount=amount, payment_method=payment_method)
-                logger.info("Payment made successfully.")
-
-                return redirect("lent-books")
+                except ValidationError as e:
+                    form.add_error(None, e)
+                else:
+                    return redirect("lent-books")
 
         logger.error(f"Error occurred while issuing book: {form.errors}")
 
@@ -309,7 +376,7 @@ class LendMemberBookView(View):
     post(): Validates the form and lends the book to the member.
             Several Books can be lent to the member at once.
             if the member has exceeded the borrowing limit, an error message is displayed.
-            BorrowedBook and Transaction objects are created and the book quantity is updated.
+            BorrowedBook and Transaction objects are created and the book quantity is updated in one transaction.
 
     """
 
@@ -332,26 +399,18 @@ class LendMemberBookView(View):
                 logger.error("Member has exceeded the borrowing limit.")
             else:
                 lended_book = form.save(commit=False)
-                payment_method = payment_form.cleaned_data["payment_method"]
-                book_ids = request.POST.getlist("book")
-                amount = 0
-                for book_id in book_ids:
-                    book = Book.objects.get(pk=book_id)
-                    BorrowedBook.objects.create(
-                        member=member, book=book, return_date=lended_book.return_date, fine=lended_book.fine
+                try:
+                    lend_books(
+                        member=member,
+                        book_ids=[book.pk for book in form.cleaned_data["book"]],
+                        return_date=lended_book.return_date,
+                        fine=lended_book.fine,
+                        payment_method=payment_form.cleaned_data["payment_method"],
                     )
-                    logger.info("Book lent successfully.")
-
-                    book.quantity -= 1
-                    book.save()
-                    logger.info("Book Quantity updated successfully.")
-
-                    amount += book.borrowing_fee
-
-                Transaction.objects.create(member=member, amount=amount, payment_method=payment_method)
-                logger.info("Payment made successfully.")
-
-                return redirect("lent-books")
+                except ValidationError as e:
+                    form.add_error(None, e)
+                else:
+                    return redirect("lent-books")
 
         logger.error(f"Error occurred while issuing book: {form.errors}")
 
@@ -361,23 +420,182 @@ class LendMemberBookView(View):
 
 
 @method_decorator(login_required, name="dispatch")
+class ImportView(View):
+    """
+    Import view for the library management system. Bulk imports books or members from an uploaded CSV file.
+    get(): Returns the import page with the ImportForm.
+    post(): Validates the form and imports the rows of the file with the add book / add member form rules.
+            The file is streamed and the rows are inserted in chunks; the rejected rows are listed on the page.
+    """
+
+    max_reported_rejects = 100
+
+    def get(self, request, *args, **kwargs):
+        form = ImportForm(initial={"kind": request.GET.get("kind", "books")})
+        return render(request, "import.html", {"form": form})
+
+    def post(self, request, *args, **kwargs):
+        form = ImportForm(request.POST, request.FILES)
+        context = {"form": form}
+
+        if form.is_valid():
+            rejects = []
+
+            def report(line_number, row, message):
+                if len(rejects) < self.max_reported_rejects:
+                    rejects.append({"line_number": line_number, "message": message})
+
+            importer = IMPORTERS[form.cleaned_data["kind"]](on_reject=report)
+            lines = io.TextIOWrapper(form.cleaned_data["file"].file, encoding="utf-8-sig", newline="")
+            try:
+                created, rejected = importer.run(lines)
+            except ValidationError as e:
+                form.add_error("file", e)
+            except UnicodeDecodeError:
+                form.add_error("file", "The file is not a UTF-8 encoded CSV file.")
+            else:
+                context.update({"created": created, "rejected": rejected, "rejects": rejects})
+                return render(request, "import.html", context)
+
+        logger.error(f"Error occurred while importing: {form.errors}")
+
+        return render(request, "import.html", context)
+
+
+class LookupView(View):
+    """
+    Base view for the select2 JSON lookups used by the lend forms.
+    get(): Returns a page of the objects matching the ?term= prefix as
+           {"results": [{"id": ..., "text": ...}], "pagination": {"more": ...}}. ?page= selects the page.
+    model: The model looked up. Its str() is the text of each result.
+    filters: filter() lookups of the objects that can be selected.
+    search_fields: The fields matched with the term, case-insensitively. Also the only fields read besides id.
+    order_field: The field the matches are sorted by, case-insensitively, with the primary key as a tie breaker.
+    """
+
+    read_from_replica = True
+    page_size = 20
+
+    model = None
+    filters = {}
+    search_fields = ()
+    order_field = None
+
+    def get_queryset(self, term):
+        queryset = self.model.objects.filter(**self.filters).only("id", *self.search_fields)
+        if term:
+            queryset = queryset.filter(
+                reduce(or_, (Q(**{f"{field}__istartswith": term}) for field in self.search_fields))
+            )
+        return queryset.order_by(Upper(self.order_field), "id")
+
+    def get(self, request, *args, **kwargs):
+        term = request.GET.get("term", "").strip()
+        try:
+            page = max(int(request.GET.get("page", 1)), 1)
+        except ValueError:
+            page = 1
+
+        offset = (page - 1) * self.page_size
+        objects = list(self.get_queryset(term)[offset : offset + self.page_size + 1])
+        results = [{"id": obj.pk, "text": str(obj)} for obj in objects[: self.page_size]]
+
+        return JsonResponse({"results": results, "pagination": {"more": len(objects) > self.page_size}})
+
+
+@method_decorator(login_required, name="dispatch")
+class BookLookupView(LookupView):
+    """
+    Book Lookup view for the library management system. Feeds the book select of the lend forms.
+    get(): Returns the books in stock whose title or author starts with the search term.
+    """
+
+    model = Book
+    filters = {"quantity__gt": 0}
+    search_fields = ("title", "author")
+    order_field = "title"
+
+
+@method_decorator(login_required, name="dispatch")
+class MemberLookupView(LookupView):
+    """
+    Member Lookup view for the library management system. Feeds the member select of the lend book form.
+    get(): Returns the members whose name or email starts with the search term.
+    """
+
+    model = Member
+    search_fields = ("name", "email")
+    order_field = "name"
+
+
+@method_decorator(login_required, name="dispatch")
+@method_decorator(conditional_page("lent-books", (BorrowedBook, Member, Book)), name="get")
 class LentBooksListView(View):
     """
-    Lent Books List view for the library management system.
-    get(): Returns the list of books that have been lent to members.
-    post(): Returns the list of books that have been lent to members based on the search query.
+    Lent Books List view for the library management system. The list is paginated by cursor and cached.
+    get(): Returns a page of the books that have been lent to members, filtered by the ?query= parameter if present.
+           With ?stream=1, streams every matching loan instead, see stream_table().
+    post(): Returns the first page of the books that have been lent to members based on the search query.
     """
 
+    read_from_replica = True
+
     def get(self, request, *args, **kwargs):
-        books = BorrowedBook.objects.select_related("member", "book")
-        return render(request, "books/lent-books.html", {"books": books})
+        return self.list_lent_books(request, request.GET.get("query", ""))
 
     def post(self, request, *args, **kwargs):
-        query = request.POST.get("query")
-        books = BorrowedBook.objects.filter(
-            Q(book__title__icontains=query) | Q(book__author__icontains=query)
-        ).select_related("member", "book")
-        return render(request, "books/lent-books.html", {"books": books})
+        return self.list_lent_books(request, request.POST.get("query", ""))
+
+    def list_lent_books(self, request, query):
+        books = BorrowedBook.objects.select_related("member", "book")
+        if query:
+            books = search_books(books, query, book_path="book__")
+
+        ordering = SEARCH_ORDERING if query else DEFAULT_ORDERING
+        if wants_stream(request):
+            return stream_table(
+                request,
+                "books/lent-books.html",
+                {"query": query},
+                "books/lent-books-rows.html",
+                "books",
+                books.order_by(*ordering),
+            )
+
+        page = cached_page(request, "lent-books", (BorrowedBook, Member, Book), books, query, ordering=ordering)
+        return render(request, "books/lent-books.html", {"books": page, "page": page, "query": query})
+
+
+@method_decorator(login_required, name="dispatch")
+class LoansTableView(View):
+    """
+    Loans Table view for the library management system. A DataTables table of every loan that is sorted, filtered
+    and paged by the database, so it stays fast with millions of loans.
+    get(): Returns the loans table page with the LoansTableFiltersForm. The rows are fetched from LoansTableDataView.
+    """
+
+    def get(self, request, *args, **kwargs):
+        return render(request, "books/loans-table.html", {"form": LoansTableFiltersForm()})
+
+
+@method_decorator(login_required, name="dispatch")
+class LoansTableDataView(View):
+    """
+    Loans Table Data view for the library management system. Feeds the loans table.
+    get(): Returns the page of loans requested by the table as JSON, following the DataTables server-side protocol,
+           see library.datatables. Invalid parameters get a 400 response with an "error" message.
+    """
+
+    read_from_replica = True
+
+    def get(self, request, *args, **kwargs):
+        try:
+            data = LOANS_TABLE.response(request.GET)
+        except ValidationError as e:
+            logger.error(f"Error occurred while loading the loans table: {e.messages}")
+            return JsonResponse({"error": " ".join(e.messages)}, status=400)
+
+        return JsonResponse(data)
 
 
 @method_decorator(login_required, name="dispatch")
@@ -385,7 +603,8 @@ class UpdateBorrowedBookView(View):
     """
     Update Borrowed Book view for the library management system. Updates Details of a borrowed book.
     get(): Returns the update borrowed book page with the UpdateBorrowedBookForm.
-    post(): Validates the form and updates the borrowed book details in the database.
+    post(): Validates the form and updates the borrowed book details in the database. The loan is flagged overdue
+    again from its new return date and the member's amount due is refreshed, so extending a loan clears its fine.
     """
 
     def get(self, request, *args, **kwargs):
@@ -398,7 +617,10 @@ class UpdateBorrowedBookView(View):
         form = UpdateBorrowedBookForm(request.POST, instance=book)
 
         if form.is_valid():
-            form.save()
+            book = form.save(commit=False)
+            book.overdue = not book.returned and book.return_date < timezone.now().date()
+            book.save()
+            refresh_amount_due(Member.objects.filter(pk=book.member_id))
             logger.info("Borrowed book details updated successfully.")
             return redirect("lent-books")
         logger.error(f"Error occurred while updating borrowed book: {form.errors}")
@@ -422,6 +644,10 @@ class DeleteBorrowedBookView(View):
         logger.info("Book Quantity updated successfully.")
 
         borrowed_book.delete()
+        if not borrowed_book.returned:
+            LibraryStats.record(total_borrowed_books=-1)
+        if borrowed_book.overdue:
+            refresh_amount_due(Member.objects.filter(pk=borrowed_book.member_id))
 
         logger.info("Borrowed book deleted successfully.")
         return redirect("lent-books")
@@ -442,10 +668,14 @@ class ReturnBookView(View):
             return redirect("return-book-fine", pk=borrowed_book.pk)
 
         else:
+            was_outstanding = not borrowed_book.returned
             borrowed_book.returned = True
             borrowed_book.save()
             logger.info("Book returned successfully.")
 
+            if was_outstanding:
+                LibraryStats.record(total_borrowed_books=-1)
+
             book = borrowed_book.book
             book.quantity += 1
             book.save()
@@ -454,6 +684,35 @@ class ReturnBookView(View):
             return redirect("lent-books")
 
 
+@method_decorator(login_required, name="dispatch")
+class ReturnBooksView(View):
+    """
+    Return Books view for the library management system. Returns many loans in one request, e.g. a bin of books
+    scanned at the returns desk.
+    get(): Returns the return books page with the ReturnBooksForm.
+    post(): Validates the form and returns the loans in one transaction. The fines of the overdue loans are paid
+            with one combined payment per member. See return_books().
+    """
+
+    def get(self, request, *args, **kwargs):
+        return render(request, "books/return-books.html", {"form": ReturnBooksForm()})
+
+    def post(self, request, *args, **kwargs):
+        form = ReturnBooksForm(request.POST)
+
+        if form.is_valid():
+            try:
+                return_books(form.cleaned_data["loans"], payment_method=form.cleaned_data["payment_method"])
+            except ValidationError as e:
+                form.add_error(None, e)
+            else:
+                return redirect("lent-books")
+
+        logger.error(f"Error occurred while returning books: {form.errors}")
+
+        return render(request, "books/return-books.html", {"form": form})
+
+
 @method_decorator(login_required, name="dispatch")
 class ReturnBookFineView(View):
     """
@@ -475,8 +734,10 @@ class ReturnBookFineView(View):
         if form.is_valid():
             payment_method = form.cleaned_data["payment_method"]
             fine = book.fine
+            was_outstanding = not book.returned
 
             book.returned = True
+            book.overdue = True
             book.save()
             logger.info("Book returned successfully.")
 
@@ -484,7 +745,10 @@ class ReturnBookFineView(View):
             book.book.save()
             logger.info("Book Quantity updated successfully.")
 
-            Transaction.objects.create(member=book.member, amount=fine, payment_method=payment_method)
+            payment = Transaction.objects.create(member=book.member, amount=fine, payment_method=payment_method)
+            DailyRevenue.record_payment(payment)
+            LibraryStats.record(total_amount=fine, total_borrowed_books=-1 if was_outstanding else 0)
+            refresh_amount_due(Member.objects.filter(pk=book.member_id))
 
             return redirect("lent-books")
         logger.error(f"Error occurred while returning book: {form.errors}")
@@ -493,21 +757,123 @@ class ReturnBookFineView(View):
 
 
 @method_decorator(login_required, name="dispatch")
+@method_decorator(conditional_page("payments", (Transaction, Member)), name="get")
 class ListPaymentsView(View):
     """
-    List Payment View for the library management system.
-    get(): Returns a list of payments made.
-    post(): Returns a list of payments made by a member based on the search query.
+    List Payment View for the library management system. The list is paginated by cursor and cached.
+    get(): Returns a page of the payments made, filtered by the ?query= parameter if present.
+           With ?stream=1, streams every matching payment instead, see stream_table().
+    post(): Returns the first page of the payments made by a member based on the search query.
     """
 
+    read_from_replica = True
+
     def get(self, request, *args, **kwargs):
-        payments = Transaction.objects.select_related("member")
-        return render(request, "payments/list-payments.html", {"payments": payments})
+        return self.list_payments(request, request.GET.get("query", ""))
 
     def post(self, request, *args, **kwargs):
-        query = request.POST.get("query")
-        payments = Transaction.objects.filter(member__name__icontains=query).select_related("member")
-        return render(request, "payments/list-payments.html", {"payments": payments})
+        return self.list_payments(request, request.POST.get("query", ""))
+
+    def list_payments(self, request, query):
+        payments = Transaction.objects.select_related("member")
+        if query:
+            payments = payments.filter(member__name__icontains=query)
+
+        if wants_stream(request):
+            return stream_table(
+                request,
+                "payments/list-payments.html",
+                {"query": query},
+                "payments/list-payments-rows.html",
+                "payments",
+                payments.order_by(*DEFAULT_ORDERING),
+            )
+
+        page = cached_page(request, "payments", (Transaction, Member), payments, query)
+        return render(request, "payments/list-payments.html", {"payments": page, "page": page, "query": query})
+
+
+@method_decorator(login_required, name="dispatch")
+class ExportView(View):
+    """
+    Export view for the library management system. Downloads the payments, loans or members as a file.
+    get(): Streams every row matching the ?start=, ?end=, ?member= and ?payment_method= filters as CSV,
+           or as JSON Lines with ?format=jsonl. Rows are read from the database in chunks as the response is sent,
+           so memory use does not depend on the number of rows exported.
+    """
+
+    read_from_replica = True
+    chunk_size = 2000
+
+    def get(self, request, *args, **kwargs):
+        export = EXPORTS.get(kwargs["kind"])
+        if export is None:
+            raise Http404
+
+        form = ExportForm(request.GET)
+        if not form.is_valid():
+            logger.error(f"Error occurred while exporting: {form.errors}")
+            return HttpResponseBadRequest(form.errors.as_text(), content_type="text/plain")
+
+        filters = form.cleaned_data
+        rows = export.rows(
+            start=filters["start"],
+            end=filters["end"],
+            member=filters["member"],
+            payment_method=filters["payment_method"],
+            chunk_size=self.chunk_size,
+            using=router.db_for_read(export.model),
+        )
+        extension = filters["format"] or "csv"
+        lines, content_type = FORMATS[extension]
+
+        response = StreamingHttpResponse(lines(export.columns, rows), content_type=content_type)
+        filename = f"{kwargs['kind']}-{timezone.now():%Y-%m-%d}.{extension}"
+        response["Content-Disposition"] = f'attachment; filename="{filename}"'
+        return response
+
+
+@method_decorator(login_required, name="dispatch")
+class RevenueView(View):
+    """
+    Revenue view for the library management system. Reads the DailyRevenue rollup, so the cost depends on the
+    number of days shown, not on the number of payments.
+    get(): Returns the revenue of each day between ?start= and ?end= (the last 30 days by default) per payment
+           method, with the totals of the period.
+    """
+
+    read_from_replica = True
+    default_days = 30
+
+    def get(self, request, *args, **kwargs):
+        form = RevenueForm(request.GET)
+        end = timezone.now().date()
+        start = end - timedelta(days=self.default_days - 1)
+        if form.is_valid():
+            start = form.cleaned_data["start"] or start
+            end = form.cleaned_data["end"] or end
+
+        methods = [method for method, _label in PAYMENT_METHOD_CHOICES]
+        days = {}
+        totals = dict.fromkeys(methods, 0)
+        for revenue in DailyRevenue.objects.filter(date__range=(start, end)).order_by("-date"):
+            day = days.setdefault(revenue.date, dict.fromkeys(methods, 0))
+            day[revenue.payment_method] += revenue.amount
+            totals[revenue.payment_method] += revenue.amount
+
+        context = {
+            "form": form,
+            "start": start,
+            "end": end,
+            "methods": [label for _method, label in PAYMENT_METHOD_CHOICES],
+            "days": [
+                {"date": date, "amounts": list(amounts.values()), "total": sum(amounts.values())}
+                for date, amounts in days.items()
+            ],
+            "totals": list(totals.values()),
+            "total": sum(totals.values()),
+        }
+        return render(request, "payments/revenue.html", context)
 
 
 @method_decorator(login_required, name="dispatch")
@@ -520,28 +886,46 @@ class DeletePaymentView(View):
     def get(self, request, *args, **kwargs):
         payment = Transaction.objects.get(pk=kwargs["pk"])
         payment.delete()
+        LibraryStats.record(total_amount=-payment.amount)
+        DailyRevenue.record_payment(payment, sign=-1)
         logger.info("Payment deleted successfully.")
         return redirect("payments")
 
 
+@method_decorator(
+    conditional_page("overdue-books", (BorrowedBook, Member, Book), extra=lambda request: (timezone.now().date(),)),
+    name="get",
+)
 class OverdueBooksView(View):
     """
-    Overdue Books view for the library management system.
-    get(): Returns a list of overdue books.
-    post(): Returns a list of overdue books based on the search query.
+    Overdue Books view for the library management system. The list is paginated by cursor and cached.
+    get(): Returns a page of the overdue books, filtered by the ?query= parameter if present.
+    post(): Returns the first page of the overdue books based on the search query.
     """
 
+    read_from_replica = True
+
     def get(self, request, *args, **kwargs):
-        overdue_books = BorrowedBook.objects.filter(
-            return_date__lt=timezone.now().date(), returned=False
-        ).select_related("member", "book")
-        return render(request, "books/overdue-books.html", {"books": overdue_books})
+        return self.list_overdue_books(request, request.GET.get("query", ""))
 
     def post(self, request, *args, **kwargs):
-        query = request.POST.get("query")
-        overdue_books = BorrowedBook.objects.filter(
-            Q(book__title__icontains=query) | Q(book__author__icontains=query),
-            return_date__lt=timezone.now().date(),
-            returned=False,
-        ).select_related("member", "book")
-        return render(request, "books/overdue-books.html", {"books": overdue_books})
+        return self.list_overdue_books(request, request.POST.get("query", ""))
+
+    def list_overdue_books(self, request, query):
+        today = timezone.now().date()
+        overdue_books = BorrowedBook.objects.filter(return_date__lt=today, returned=False).select_related(
+            "member", "book"
+        )
+        if query:
+            overdue_books = search_books(overdue_books, query, book_path="book__")
+
+        page = cached_page(
+            request,
+            "overdue-books",
+            (BorrowedBook, Member, Book),
+            overdue_books,
+            query,
+            ordering=SEARCH_ORDERING if query else DEFAULT_ORDERING,
+            extra=(today,),
+        )
+        return render(request, "books/overdue-books.html", {"books": page, "page": page, "query": query})
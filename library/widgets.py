@@ -0,0 +1,41 @@
+from django import forms
+from django.urls import reverse
+
+
+class AutocompleteSelectMixin:
+    """
+    select2 widget backed by one of the JSON lookup views. Only the selected options are rendered;
+    the others are fetched from the lookup view as the user types, so the queryset is never loaded in full.
+    url_name: Name of the lookup URL.
+    """
+
+    def __init__(self, url_name, attrs=None):
+        super().__init__(attrs)
+        self.url_name = url_name
+
+    def build_attrs(self, base_attrs, extra_attrs=None):
+        attrs = super().build_attrs(base_attrs, extra_attrs)
+        attrs.setdefault("data-ajax--url", reverse(self.url_name))
+        attrs.setdefault("data-ajax--delay", 250)
+        attrs.setdefault("data-minimum-input-length", 1)
+        return attrs
+
+    def optgroups(self, name, value, attrs=None):
+        selected = [choice for choice in value if choice]
+        if not selected:
+            return []
+
+        field = self.choices.field
+        objects = self.choices.queryset.filter(pk__in=selected)
+        return [
+            (None, [self.create_option(name, obj.pk, field.label_from_instance(obj), True, index)], index)
+            for index, obj in enumerate(objects)
+        ]
+
+
+class AutocompleteSelect(AutocompleteSelectMixin, forms.Select):
+    pass
+
+
+class AutocompleteSelectMultiple(AutocompleteSelectMixin, forms.SelectMultiple):
+    pass
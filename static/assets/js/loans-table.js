@@ -0,0 +1,42 @@
+(function($) {
+  'use strict';
+  $(function() {
+    var $table = $('#loans-table');
+    if (!$table.length) {
+      return;
+    }
+
+    var table = $table.DataTable({
+      serverSide: true,
+      processing: true,
+      searchDelay: 400,
+      ajax: $table.data('url'),
+      order: [[6, 'desc']],
+      columns: [
+        {data: 'book', name: 'book', orderable: false},
+        {data: 'member', name: 'member', orderable: false},
+        {data: 'return_date', name: 'return_date'},
+        {data: 'fine', name: 'fine'},
+        {data: 'returned', name: 'returned', orderable: false, render: function(value) {
+          return value ? 'Returned' : 'Not Returned';
+        }},
+        {data: 'overdue', name: 'overdue', orderable: false, render: function(value) {
+          return value ? '<span class="text-danger">Overdue</span>' : '';
+        }},
+        {data: 'created_at', name: 'created_at', render: function(value) {
+          return value.slice(0, 10);
+        }}
+      ]
+    });
+
+    // Each filter sets the search value of its column. The two return dates make its "start,end" range.
+    $('[data-column]').on('change', function() {
+      var name = $(this).data('column');
+      var values = $('[data-column="' + name + '"]').map(function() {
+        return $(this).val() || '';
+      }).get();
+      var value = values.length > 1 && values.join('') ? values.join(',') : values.join('');
+      table.column(name + ':name').search(value).draw();
+    });
+  });
+})(jQuery);
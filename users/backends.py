@@ -0,0 +1,28 @@
+from django.conf import settings
+from django.contrib.auth.backends import ModelBackend
+from django.core.cache import cache
+
+
+def user_cache_key(user_id):
+    return f"users:librarian:{user_id}"
+
+
+def cache_user(user):
+    cache.set(user_cache_key(user.pk), user, settings.AUTH_USER_CACHE_TIMEOUT)
+
+
+class CachedModelBackend(ModelBackend):
+    """
+    ModelBackend loading the logged in librarian of each request from the cache instead of the database.
+    The librarian is cached when they log in. The entry is deleted whenever the librarian is saved or deleted (see
+    users.signals), so the next request sees a password change or a deactivation. It otherwise expires after
+    AUTH_USER_CACHE_TIMEOUT.
+    """
+
+    def get_user(self, user_id):
+        user = cache.get(user_cache_key(user_id))
+        if user is None:
+            user = super().get_user(user_id)
+            if user is not None:
+                cache_user(user)
+        return user
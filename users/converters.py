@@ -0,0 +1,26 @@
+import uuid
+
+from django.conf import settings
+
+from .models import compact_id
+
+
+class PrimaryKeyConverter:
+    """
+    Path converter for AbstractBaseModel primary keys.
+    Once PRIMARY_KEY_FORMAT is "uuid7", legacy "<tablename>-<uuid>" ids in old links and bookmarks
+    are converted to the compact id that compact_primary_keys gave the row.
+    Once PRIMARY_KEY_COLUMN_TYPE is "uuid", ids that aren't UUIDs are answered with 404 Not Found.
+    """
+
+    regex = "[^/]+"
+
+    def to_python(self, value):
+        if settings.PRIMARY_KEY_FORMAT == "uuid7":
+            value = compact_id(value)
+        if settings.PRIMARY_KEY_COLUMN_TYPE == "uuid":
+            uuid.UUID(value)
+        return value
+
+    def to_url(self, value):
+        return str(value)
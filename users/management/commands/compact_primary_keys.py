@@ -0,0 +1,68 @@
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import F, Value
+from django.db.models.functions import Replace, Substr
+
+from users.models import COMPACT_KEY_MODELS
+
+
+class Command(BaseCommand):
+    help = (
+        'Rewrites legacy "<tablename>-<uuid>" primary keys, and every foreign key pointing at them, to the compact '
+        '32-character form used when PRIMARY_KEY_FORMAT is "uuid7". Rows are converted in chunks, one transaction '
+        "per chunk, so the command can run on a live database and be resumed. Old ids in URLs keep resolving "
+        'once PRIMARY_KEY_FORMAT is "uuid7". Sessions of logged in librarians are invalidated.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "models", nargs="*", default=COMPACT_KEY_MODELS, help="Models to convert, as app_label.ModelName."
+        )
+        parser.add_argument("--chunk-size", type=int, default=1000, help="Number of rows converted per transaction.")
+
+    def handle(self, *args, **options):
+        for label in options["models"]:
+            try:
+                model = apps.get_model(label)
+            except (LookupError, ValueError) as e:
+                raise CommandError(e)
+
+            converted = self.compact_model(model, options["chunk_size"])
+            self.stdout.write(self.style.SUCCESS(f"{label}: {converted} primary keys compacted."))
+
+    def compact_model(self, model, chunk_size):
+        prefix = f"{model.__name__.lower()}-"
+        pk_name = model._meta.pk.attname
+        references = [
+            (relation.related_model, relation.field.attname)
+            for relation in model._meta.get_fields(include_hidden=True)
+            if relation.auto_created and not relation.concrete and (relation.one_to_many or relation.one_to_one)
+        ]
+
+        converted = 0
+        last_pk = None
+        while True:
+            with transaction.atomic():
+                rows = model._base_manager.filter(pk__startswith=prefix)
+                if last_pk is not None:
+                    rows = rows.filter(pk__gt=last_pk)
+                chunk = list(rows.order_by("pk").values_list("pk", flat=True)[:chunk_size])
+                if not chunk:
+                    return converted
+
+                # Foreign key constraints are deferred to the end of the transaction,
+                # so the references can be rewritten before the rows they point at.
+                for related_model, column in references:
+                    related_model._base_manager.filter(**{f"{column}__in": chunk}).update(
+                        **{column: self.compacted(column, prefix)}
+                    )
+                model._base_manager.filter(pk__in=chunk).update(**{pk_name: self.compacted(pk_name, prefix)})
+
+            converted += len(chunk)
+            last_pk = chunk[-1]
+            self.stdout.write(f"{model._meta.label}: {converted} rows converted...")
+
+    def compacted(self, column, prefix):
+        # "member-0b5f...-4c1e" -> "0b5f...4c1e", the same value users.models.compact_id() computes.
+        return Replace(Substr(F(column), len(prefix) + 1), Value("-"), Value(""))
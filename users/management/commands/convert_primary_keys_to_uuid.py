@@ -0,0 +1,68 @@
+from django.apps import apps
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+
+from users.models import COMPACT_KEY_MODELS
+
+
+class Command(BaseCommand):
+    help = (
+        "Converts the varchar primary keys of Member, Book, BorrowedBook, Transaction and Librarian, and every "
+        "foreign key pointing at them, to native PostgreSQL uuid columns, in one transaction. Run it once "
+        'compact_primary_keys has compacted every id, with PRIMARY_KEY_FORMAT set to "uuid7" and '
+        'PRIMARY_KEY_COLUMN_TYPE set to "uuid". The tables are rewritten and locked while it runs, so run it during '
+        "a maintenance window."
+    )
+
+    def handle(self, *args, **options):
+        if settings.PRIMARY_KEY_FORMAT != "uuid7" or settings.PRIMARY_KEY_COLUMN_TYPE != "uuid":
+            raise CommandError('Set PRIMARY_KEY_FORMAT to "uuid7" and PRIMARY_KEY_COLUMN_TYPE to "uuid" first.')
+
+        models = [apps.get_model(label) for label in COMPACT_KEY_MODELS]
+        for model in models:
+            if model._base_manager.exclude(pk__regex=r"^[0-9a-f]{32}$").exists():
+                raise CommandError(f"{model._meta.label} has legacy primary keys, run compact_primary_keys first.")
+
+        if connection.vendor != "postgresql":
+            raise CommandError("Native uuid columns are only supported on PostgreSQL.")
+
+        columns = [(model._meta.db_table, model._meta.pk.column) for model in models]
+        columns += [
+            (related_model._meta.db_table, field.column)
+            for related_model in apps.get_models(include_auto_created=True)
+            for field in related_model._meta.local_concrete_fields
+            if field.is_relation and field.related_model in models
+        ]
+
+        with transaction.atomic(), connection.cursor() as cursor:
+            self.convert(cursor, {model._meta.db_table for model in models}, columns)
+
+        self.stdout.write(self.style.SUCCESS(f"{len(columns)} columns converted to uuid."))
+
+    def convert(self, cursor, tables, columns):
+        quote = connection.ops.quote_name
+
+        # A foreign key can't join a uuid and a varchar column: the constraints pointing at the tables are dropped
+        # while the columns are converted, then added back as they were.
+        cursor.execute(
+            "SELECT conrelid::regclass::text, conname, pg_get_constraintdef(oid) FROM pg_constraint "
+            "WHERE contype = 'f' AND confrelid::regclass::text = ANY(%s)",
+            [sorted(tables)],
+        )
+        foreign_keys = cursor.fetchall()
+        for table, name, _definition in foreign_keys:
+            cursor.execute(f"ALTER TABLE {quote(table)} DROP CONSTRAINT {quote(name)}")
+
+        for table, column in columns:
+            # The varchar_pattern_ops "_like" indexes Django adds to varchar keys don't apply to uuid.
+            for name, constraint in connection.introspection.get_constraints(cursor, table).items():
+                if constraint["index"] and name.endswith("_like") and constraint["columns"] == [column]:
+                    cursor.execute(f"DROP INDEX {quote(name)}")
+            cursor.execute(
+                f"ALTER TABLE {quote(table)} ALTER COLUMN {quote(column)} TYPE uuid USING {quote(column)}::uuid"
+            )
+            self.stdout.write(f"{table}.{column} converted.")
+
+        for table, name, definition in foreign_keys:
+            cursor.execute(f"ALTER TABLE {quote(table)} ADD CONSTRAINT {quote(name)} {definition}")
@@ -1,23 +1,144 @@
+import os
+import time
 import uuid
 
+from django.conf import settings
 from django.contrib.auth.models import AbstractUser, BaseUserManager
+from django.core.exceptions import ValidationError
 from django.db import models
+from django.utils.translation import gettext_lazy as _
+
+
+def uuid7():
+    """
+    Returns a time-ordered UUID (RFC 9562 version 7): a 48-bit Unix timestamp in milliseconds followed by
+    random bits. Consecutive ids land next to each other in a B-tree index instead of at random pages.
+    """
+    value = (time.time_ns() // 1_000_000) << 80 | int.from_bytes(os.urandom(10), "big")
+    value = value & ~(0xF << 76) | 0x7 << 76
+    value = value & ~(0x3 << 62) | 0x2 << 62
+    return uuid.UUID(int=value)
+
+
+def compact_id(value):
+    """
+    Converts a legacy "<tablename>-<uuid>" primary key into the compact 32-character form.
+    Any other value is returned unchanged.
+    """
+    prefix, _, rest = str(value).partition("-")
+    if not rest or not prefix.isalpha():
+        return value
+
+    try:
+        return uuid.UUID(rest).hex
+    except ValueError:
+        return value
+
+
+# The models whose keys compact_primary_keys and convert_primary_keys_to_uuid convert.
+COMPACT_KEY_MODELS = [
+    "library.Member",
+    "library.Book",
+    "library.BorrowedBook",
+    "library.Transaction",
+    "users.Librarian",
+]
+
+
+class PrimaryKeyField(models.CharField):
+    """
+    The string primary key of AbstractBaseModel.
+    With PRIMARY_KEY_COLUMN_TYPE = "uuid", the keys of COMPACT_KEY_MODELS are UUIDs, read and written as
+    32-character hex strings: any other value raises ValidationError. On PostgreSQL their columns, and those of the
+    foreign keys pointing at them (see PrimaryKeyForeignKey), are native 16-byte uuid columns.
+    Migrations see a plain CharField, so the setting never alters a column: convert_primary_keys_to_uuid does.
+    """
+
+    default_error_messages = {"invalid": _("“%(value)s” is not a valid UUID.")}
+
+    def uuid_keys(self):
+        return settings.PRIMARY_KEY_COLUMN_TYPE == "uuid" and self.model._meta.label in COMPACT_KEY_MODELS
+
+    def native_uuid(self, connection):
+        return self.uuid_keys() and connection.vendor == "postgresql"
+
+    def db_type(self, connection):
+        if self.native_uuid(connection):
+            return "uuid"
+        return super().db_type(connection)
+
+    def from_db_value(self, value, expression, connection):
+        if isinstance(value, uuid.UUID):
+            return value.hex
+        return value
+
+    def to_python(self, value):
+        value = super().to_python(value)
+        if value is None or not self.uuid_keys():
+            return value
+
+        try:
+            return uuid.UUID(value).hex
+        except ValueError:
+            raise ValidationError(self.error_messages["invalid"], code="invalid", params={"value": value})
+
+    def get_db_prep_value(self, value, connection, prepared=False):
+        value = super().get_db_prep_value(value, connection, prepared)
+        if value is not None and self.native_uuid(connection):
+            return uuid.UUID(self.to_python(value))
+        return value
+
+    def deconstruct(self):
+        name, _path, args, kwargs = super().deconstruct()
+        return name, "django.db.models.CharField", args, kwargs
+
+
+class PrimaryKeyForeignKey(models.ForeignKey):
+    """
+    ForeignKey to an AbstractBaseModel. The ids it reads go through the from_db_value() of the target's
+    PrimaryKeyField as well, so they are hex strings like the primary key itself, even from a native uuid column.
+    """
+
+    def get_db_converters(self, connection):
+        converters = super().get_db_converters(connection)
+        if hasattr(self.target_field, "from_db_value"):
+            converters.append(self.target_field.from_db_value)
+        return converters
+
+    def deconstruct(self):
+        name, _path, args, kwargs = super().deconstruct()
+        return name, "django.db.models.ForeignKey", args, kwargs
 
 
 class AbstractBaseModel(models.Model):
-    id = models.CharField(max_length=255, primary_key=True)
+    id = PrimaryKeyField(max_length=255, primary_key=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         abstract = True
+        # Backs the (created_at, id) ordering of the cursor-paginated list pages.
+        indexes = [models.Index(fields=["created_at", "id"], name="%(class)s_created_idx")]
 
     def save(self, *args, **kwargs):
         if not self.id:
-            table_name = self.__class__.__name__.lower()
-            self.id = f"{table_name}-{str(uuid.uuid4())}"
+            self.id = self.generate_id()
         super().save(*args, **kwargs)
 
+    @classmethod
+    def generate_id(cls):
+        """
+        Returns a new primary key. save() assigns it automatically; call it directly for objects
+        inserted with bulk_create(), which bypasses save().
+        With PRIMARY_KEY_FORMAT = "uuid7" the key is a compact, time-ordered UUIDv7 hex string,
+        otherwise it is the legacy "<tablename>-<uuid4>" string.
+        """
+        if settings.PRIMARY_KEY_FORMAT == "uuid7":
+            return uuid7().hex
+
+        table_name = cls.__name__.lower()
+        return f"{table_name}-{str(uuid.uuid4())}"
+
 
 class CustomUserManager(BaseUserManager):
     def create_user(self, email, password, **extra_fields):
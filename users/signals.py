@@ -0,0 +1,19 @@
+from django.contrib.auth.signals import user_logged_in
+from django.core.cache import cache
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from users.backends import cache_user, user_cache_key
+from users.models import Librarian
+
+
+@receiver(post_save, sender=Librarian, dispatch_uid="invalidate_librarian_cache_on_save")
+@receiver(post_delete, sender=Librarian, dispatch_uid="invalidate_librarian_cache_on_delete")
+def invalidate_librarian_cache(sender, instance, **kwargs):
+    cache.delete(user_cache_key(instance.pk))
+
+
+@receiver(user_logged_in, dispatch_uid="cache_librarian_on_login")
+def cache_librarian_on_login(sender, request, user, **kwargs):
+    # Runs after update_last_login has saved, and so uncached, the librarian.
+    cache_user(user)
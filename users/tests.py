@@ -1,3 +1,175 @@
-from django.test import TestCase
+from io import StringIO
+from types import SimpleNamespace
 
-# Create your tests here.
+from django.contrib.sessions.models import Session
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from library.models import Book, BorrowedBook, LibraryStats, Member, Transaction
+from library.services import accrue_fines
+from users.models import Librarian, compact_id, uuid7
+
+
+class TestPrimaryKeys(TestCase):
+    def test_uuid7_is_time_ordered(self):
+        first = uuid7()
+        second = uuid7()
+
+        self.assertEqual(first.version, 7)
+        self.assertLessEqual(first.hex[:12], second.hex[:12])
+
+    def test_legacy_ids_by_default(self):
+        member = Member.objects.create(name="John Doe", email="member@gmail.com")
+
+        self.assertTrue(member.pk.startswith("member-"))
+
+    @override_settings(PRIMARY_KEY_FORMAT="uuid7")
+    def test_compact_ids(self):
+        member = Member.objects.create(name="John Doe", email="member@gmail.com")
+
+        self.assertEqual(len(member.pk), 32)
+        self.assertEqual(compact_id(member.pk), member.pk)
+
+    def test_compact_id(self):
+        self.assertEqual(
+            compact_id("borrowedbook-0b5f2d3e-8c1a-4c1e-9f7a-2b6d4e8f1a3c"), "0b5f2d3e8c1a4c1e9f7a2b6d4e8f1a3c"
+        )
+        self.assertEqual(compact_id("librarystats"), "librarystats")
+
+
+class TestCompactPrimaryKeysCommand(TestCase):
+    def setUp(self):
+        self.user = Librarian.objects.create_user(email="test@gmail.com", password="password")
+        self.member = Member.objects.create(name="John Doe", email="member@gmail.com")
+        self.book = Book.objects.create(title="Test Title", author="Test Author", category="fiction", quantity=10)
+        self.borrowed_book = BorrowedBook.objects.create(member=self.member, book=self.book, return_date="2099-12-12")
+        Transaction.objects.create(member=self.member, amount=1.00, payment_method="cash")
+
+    def test_ids_and_foreign_keys_are_compacted(self):
+        call_command("compact_primary_keys", "--chunk-size", "1", stdout=StringIO())
+
+        member = Member.objects.get(pk=compact_id(self.member.pk))
+        borrowed_book = BorrowedBook.objects.get()
+        self.assertEqual(borrowed_book.pk, compact_id(self.borrowed_book.pk))
+        self.assertEqual(borrowed_book.member, member)
+        self.assertEqual(borrowed_book.book_id, compact_id(self.book.pk))
+        self.assertEqual(Transaction.objects.get().member, member)
+        self.assertEqual(Librarian.objects.get().pk, compact_id(self.user.pk))
+
+    @override_settings(PRIMARY_KEY_FORMAT="uuid7")
+    def test_legacy_ids_resolve_in_urls(self):
+        call_command("compact_primary_keys", stdout=StringIO())
+        self.client.force_login(Librarian.objects.get())
+
+        response = self.client.get(reverse("update-book", kwargs={"pk": self.book.pk}))
+
+        self.assertEqual(response.context["book"].pk, compact_id(self.book.pk))
+
+
+class TestUuidPrimaryKeyColumns(TestCase):
+    def setUp(self):
+        self.postgresql = SimpleNamespace(vendor="postgresql")
+
+    def converted(self, queryset, row):
+        """
+        The row as the queryset's compiler converts it when read from the database.
+        """
+        compiler = queryset.query.get_compiler(using="default")
+        compiler.pre_sql_setup()
+        converters = compiler.get_converters([column for column, _sql, _alias in compiler.select])
+        return list(compiler.apply_converters([row], converters))[0]
+
+    def test_varchar_columns_by_default(self):
+        self.assertFalse(Member._meta.pk.native_uuid(self.postgresql))
+        self.assertEqual(Member._meta.pk.to_python("member-1"), "member-1")
+
+    @override_settings(PRIMARY_KEY_COLUMN_TYPE="uuid")
+    def test_uuid_columns_on_postgresql(self):
+        self.assertEqual(Member._meta.pk.db_type(self.postgresql), "uuid")
+        self.assertEqual(BorrowedBook._meta.get_field("member").db_type(self.postgresql), "uuid")
+        self.assertFalse(LibraryStats._meta.pk.native_uuid(self.postgresql))
+        self.assertEqual(Member._meta.pk.db_type(connection), "varchar(255)")
+
+    def test_keys_and_foreign_keys_are_read_as_hex(self):
+        ids = [uuid7(), uuid7(), uuid7()]
+        hex_ids = [value.hex for value in ids]
+
+        self.assertEqual(self.converted(BorrowedBook.objects.values_list("id", "member_id", "book_id"), ids), hex_ids)
+        self.assertEqual(self.converted(Transaction.objects.values_list("id", "member_id"), ids[:2]), hex_ids[:2])
+
+    @override_settings(PRIMARY_KEY_FORMAT="uuid7", PRIMARY_KEY_COLUMN_TYPE="uuid")
+    def test_ids_that_arent_uuids_raise_validation_error(self):
+        value = uuid7()
+
+        self.assertEqual(Member._meta.pk.to_python(str(value)), value.hex)
+        with self.assertRaises(ValidationError):
+            Member.objects.filter(pk="member-1")
+        with self.assertRaises(ValidationError):
+            BorrowedBook.objects.filter(member_id="")
+
+    @override_settings(PRIMARY_KEY_FORMAT="uuid7", PRIMARY_KEY_COLUMN_TYPE="uuid")
+    def test_mistyped_ids_are_rejected(self):
+        member = Member.objects.create(name="John Doe", email="member@gmail.com")
+        book = Book.objects.create(title="Test Title", author="Test Author", category="fiction", quantity=10)
+        BorrowedBook.objects.create(member=member, book=book, return_date="2000-01-01", fine=5.00)
+        self.client.force_login(Librarian.objects.create_user(email="test@gmail.com", password="password"))
+
+        self.assertEqual(accrue_fines(), (1, 1))
+
+        response = self.client.get(reverse("update-member", kwargs={"pk": "librarystats"}))
+        self.assertEqual(response.status_code, 404)
+
+        response = self.client.post(reverse("return-books"), {"loans": "not-a-loan", "payment_method": "cash"})
+        self.assertContains(response, "Unknown loan(s): not-a-loan.")
+
+        response = self.client.get(
+            reverse("loans-table-data"), {"columns[0][data]": "member", "columns[0][search][value]": "not-a-member"}
+        )
+        self.assertEqual(response.status_code, 400)
+
+    def test_command_requires_the_settings(self):
+        with self.assertRaisesMessage(CommandError, "PRIMARY_KEY_COLUMN_TYPE"):
+            call_command("convert_primary_keys_to_uuid", stdout=StringIO())
+
+    def test_command_requires_compact_ids(self):
+        Member.objects.create(name="John Doe", email="member@gmail.com")
+        with self.settings(PRIMARY_KEY_FORMAT="uuid7", PRIMARY_KEY_COLUMN_TYPE="uuid"):
+            with self.assertRaisesMessage(CommandError, "run compact_primary_keys first"):
+                call_command("convert_primary_keys_to_uuid", stdout=StringIO())
+
+        call_command("compact_primary_keys", stdout=StringIO())
+        with self.settings(PRIMARY_KEY_FORMAT="uuid7", PRIMARY_KEY_COLUMN_TYPE="uuid"):
+            with self.assertRaisesMessage(CommandError, "only supported on PostgreSQL"):
+                call_command("convert_primary_keys_to_uuid", stdout=StringIO())
+
+
+class TestCachedSessionsAndUsers(TestCase):
+    def setUp(self):
+        self.user = Librarian.objects.create_user(email="test@gmail.com", password="password")
+        self.client.force_login(self.user)
+        cache.clear()
+
+    def test_authenticated_requests_skip_session_and_user_queries(self):
+        self.client.get(reverse("home"))
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse("home"))
+
+        self.assertEqual(response.status_code, 200)
+        tables = " ".join(query["sql"] for query in queries)
+        self.assertNotIn(Session._meta.db_table, tables)
+        self.assertNotIn(Librarian._meta.db_table, tables)
+
+    def test_saving_the_librarian_refreshes_the_cached_user(self):
+        self.client.get(reverse("home"))
+        self.user.is_active = False
+        self.user.save()
+
+        response = self.client.get(reverse("home"))
+
+        self.assertRedirects(response, f"{reverse('login')}?next={reverse('home')}")